@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import CustomUser, normalize_name
+from time_tables.cache import invalidate_all_grids
+
+
+class Command(BaseCommand):
+    help = "Trim and capitalise every user's first and last name in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Users read and updated per batch (default: 2000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many users would change without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        changed = []
+        updated = 0
+        rows = CustomUser.objects.order_by("id").values_list("id", "first_name", "last_name")
+
+        with transaction.atomic():
+            for user_id, first_name, last_name in rows.iterator(chunk_size=batch_size):
+                first, last = normalize_name(first_name), normalize_name(last_name)
+                if (first, last) == (first_name, last_name):
+                    continue
+                changed.append(CustomUser(id=user_id, first_name=first, last_name=last))
+                if len(changed) >= batch_size:
+                    updated += self.write(changed, options["dry_run"])
+                    changed = []
+            updated += self.write(changed, options["dry_run"])
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{updated} users would have their names normalised."))
+        else:
+            # Search tokens are lower-cased and split on punctuation, so they
+            # are unaffected. Timetable grids show teacher names as stored and
+            # bulk_update sends no signals, so drop them all.
+            if updated:
+                invalidate_all_grids()
+            self.stdout.write(self.style.SUCCESS(f"Normalised the names of {updated} users."))
+
+    def write(self, users, dry_run):
+        if users and not dry_run:
+            CustomUser.objects.bulk_update(users, ["first_name", "last_name"])
+        return len(users)
@@ -2,7 +2,15 @@ from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.db import models
 
 
+def normalize_name(value):
+    """How first and last names are stored: trimmed, first letter capitalised."""
+    return (value or "").strip().capitalize()
+
+
 class CustomUser(AbstractUser):
+    # Fields whose loaded values are remembered so saves can tell what changed.
+    TRACKED_NAME_FIELDS = ("first_name", "last_name", "username")
+
     ROLES = (
         ('admin', 'Admin'),
         ('teacher', 'Teacher'),
@@ -25,5 +33,44 @@ class CustomUser(AbstractUser):
         related_name='customuser_permissions_set'
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Keyset pagination of the student and teacher lists seeks on this.
+            models.Index(fields=["last_name", "first_name", "id"], name="user_name_order_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_names()
+        return instance
+
+    def _remember_names(self):
+        self._loaded_names = {
+            name: getattr(self, name)
+            for name in self.TRACKED_NAME_FIELDS
+            if name in self.__dict__
+        }
+
+    def changed_name_fields(self):
+        """
+        Tracked fields that differ from the database. For a user not loaded
+        from the database, every tracked field.
+        """
+        loaded = getattr(self, "_loaded_names", None)
+        if loaded is None:
+            return list(self.TRACKED_NAME_FIELDS)
+        return [name for name in self.TRACKED_NAME_FIELDS if name in loaded and getattr(self, name) != loaded[name]]
+
+    def normalize_names(self):
+        """Normalise first and last name in place; return the fields now needing a write."""
+        self.first_name = normalize_name(self.first_name)
+        self.last_name = normalize_name(self.last_name)
+        return self.changed_name_fields()
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._remember_names()
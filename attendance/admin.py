@@ -1,4 +1,18 @@
 from django.contrib import admin
-from .models import Attendance
+from .models import Attendance, AttendanceArchive, AttendanceDailySummary
 
 admin.site.register(Attendance)
+
+
+@admin.register(AttendanceDailySummary)
+class AttendanceDailySummaryAdmin(admin.ModelAdmin):
+    list_display = ("date", "class_assigned", "present_count", "absent_count", "updated_at")
+    list_filter = ("class_assigned",)
+    date_hierarchy = "date"
+
+
+@admin.register(AttendanceArchive)
+class AttendanceArchiveAdmin(admin.ModelAdmin):
+    list_display = ("date", "student", "class_assigned", "status", "archived_at")
+    list_filter = ("status", "class_assigned")
+    date_hierarchy = "date"
@@ -0,0 +1,194 @@
+# attendance/analytics.py
+"""
+Absence rates, absence streaks and week-over-week trends per student and
+per class.
+
+The attendance rows for a date range are read with one ``values_list`` query
+per table (live and archived) into a pandas DataFrame and every statistic is computed with vectorised
+groupby/cumsum operations. Results are cached in the bounded
+``ATTENDANCE_ANALYTICS_CACHE_ALIAS`` cache, keyed on the date range and
+filters; ``invalidate_analytics`` (called whenever the daily summary is
+refreshed) moves every entry to a new key version.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Attendance, AttendanceArchive
+
+VERSION_KEY = "attendance-analytics:version"
+
+COLUMNS = ["student_id", "first_name", "last_name", "username", "class_id", "class_name", "date", "status"]
+
+
+def _cache():
+    return caches[getattr(settings, "ATTENDANCE_ANALYTICS_CACHE_ALIAS", "default")]
+
+
+def _fresh_version():
+    # If the version key is culled, restart from a value no earlier version
+    # used, so results cached before an invalidation cannot come back.
+    return time.time_ns()
+
+
+def _version():
+    version = _cache().get(VERSION_KEY)
+    if version is None:
+        version = _fresh_version()
+        if not _cache().add(VERSION_KEY, version, timeout=None):
+            version = _cache().get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_analytics():
+    """Drop every cached analytics result by moving to a new key version."""
+    try:
+        _cache().incr(VERSION_KEY)
+    except ValueError:
+        _cache().set(VERSION_KEY, _fresh_version(), timeout=None)
+
+
+def load_attendance_frame(start_date, end_date, class_id=None, student_id=None):
+    """
+    Every attendance row in the range as a DataFrame: one query against the
+    live table and one against the archive.
+    """
+    rows = []
+    for model in (AttendanceArchive, Attendance):
+        queryset = model.objects.filter(date__range=[start_date, end_date])
+        if class_id:
+            queryset = queryset.filter(class_assigned_id=class_id)
+        if student_id:
+            queryset = queryset.filter(student_id=student_id)
+        rows.extend(queryset.order_by("student_id", "date").values_list(
+            "student_id",
+            "student__user__first_name",
+            "student__user__last_name",
+            "student__user__username",
+            "class_assigned_id",
+            "class_assigned__name",
+            "date",
+            "status",
+        ))
+    df = pd.DataFrame.from_records(rows, columns=COLUMNS)
+    df["date"] = pd.to_datetime(df["date"])
+    df["absent"] = (df["status"] == Attendance.ABSENT).astype(np.int64)
+    # Weeks start on Monday; week-over-week trends compare these buckets.
+    df["week"] = (df["date"] - pd.to_timedelta(df["date"].dt.weekday, unit="D")).dt.normalize()
+    return df
+
+
+def longest_absence_streaks(df):
+    """
+    Longest run of consecutive absent records per student, as a Series.
+
+    Records are ordered by date per student; a new run starts whenever the
+    student or the absent flag changes, so run ids are a single cumsum.
+    """
+    if df.empty:
+        return pd.Series(dtype=np.int64, name="longest_absence_streak")
+    ordered = df.sort_values(["student_id", "date"])
+    absent = ordered["absent"].to_numpy()
+    students = ordered["student_id"].to_numpy()
+    boundary = np.ones(len(ordered), dtype=bool)
+    boundary[1:] = (absent[1:] != absent[:-1]) | (students[1:] != students[:-1])
+    run_id = np.cumsum(boundary)
+    run_lengths = pd.Series(absent).groupby(run_id).transform("size").to_numpy() * absent
+    return (
+        pd.Series(run_lengths, index=students)
+        .groupby(level=0)
+        .max()
+        .rename("longest_absence_streak")
+    )
+
+
+def _weekly_trend(df, key):
+    """Absence rate of the last two weeks in the range per ``key`` value."""
+    if df.empty:
+        return pd.DataFrame(columns=["last_week_absence_rate", "previous_week_absence_rate", "week_over_week_change"])
+    weekly = df.groupby([key, "week"])["absent"].mean().mul(100).unstack("week").sort_index(axis=1)
+    last = weekly.iloc[:, -1]
+    previous = weekly.iloc[:, -2] if weekly.shape[1] > 1 else pd.Series(np.nan, index=weekly.index)
+    return pd.DataFrame({
+        "last_week_absence_rate": last.round(1),
+        "previous_week_absence_rate": previous.round(1),
+        "week_over_week_change": (last - previous).round(1),
+    })
+
+
+def student_stats(df):
+    """Per-student totals, absence rate, longest streak and weekly trend."""
+    if df.empty:
+        return pd.DataFrame()
+    grouped = df.groupby("student_id")
+    stats = grouped.agg(
+        first_name=("first_name", "first"),
+        last_name=("last_name", "first"),
+        username=("username", "first"),
+        class_name=("class_name", "last"),
+        records=("absent", "size"),
+        absences=("absent", "sum"),
+    )
+    stats["absence_rate"] = (100 * stats["absences"] / stats["records"]).round(1)
+    stats = stats.join(longest_absence_streaks(df)).join(_weekly_trend(df, "student_id"))
+    return stats.reset_index().sort_values(["absence_rate", "last_name", "first_name"], ascending=[False, True, True])
+
+
+def class_stats(df):
+    """Per-class totals, absence rate, worst student streak and weekly trend."""
+    df = df[df["class_id"].notna()]
+    if df.empty:
+        return pd.DataFrame()
+    grouped = df.groupby("class_id")
+    stats = grouped.agg(
+        class_name=("class_name", "first"),
+        students=("student_id", "nunique"),
+        records=("absent", "size"),
+        absences=("absent", "sum"),
+    )
+    stats["absence_rate"] = (100 * stats["absences"] / stats["records"]).round(1)
+    streaks = longest_absence_streaks(df)
+    student_class = df.drop_duplicates("student_id", keep="last").set_index("student_id")["class_id"]
+    stats["longest_absence_streak"] = streaks.groupby(student_class.reindex(streaks.index)).max()
+    stats = stats.join(_weekly_trend(df, "class_id"))
+    stats.index = stats.index.astype(np.int64)
+    return stats.reset_index().sort_values("class_name")
+
+
+def _records(frame):
+    # to_json turns numpy scalars and NaN into plain JSON values.
+    return json.loads(frame.to_json(orient="records")) if not frame.empty else []
+
+
+def attendance_analytics(start_date, end_date, class_id=None, student_id=None):
+    """
+    ``{"start_date", "end_date", "students": [...], "classes": [...]}`` for the
+    range, computed on a cache miss and cached under the range and filters.
+    """
+    key = f"attendance-analytics:{_version()}:{start_date}:{end_date}:{class_id or ''}:{student_id or ''}"
+    result = _cache().get(key)
+    if result is None:
+        df = load_attendance_frame(start_date, end_date, class_id=class_id, student_id=student_id)
+        result = {
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "records": int(len(df)),
+            "students": _records(student_stats(df)),
+            "classes": _records(class_stats(df)),
+        }
+        _cache().set(key, result, timeout=getattr(settings, "ATTENDANCE_ANALYTICS_CACHE_TIMEOUT", 900))
+    return result
+
+
+def write_csv(rows, output):
+    """Write analytics rows (dicts from ``attendance_analytics``) as CSV."""
+    if not rows:
+        return
+    writer = csv.DictWriter(output, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
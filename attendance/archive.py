@@ -0,0 +1,133 @@
+# attendance/archive.py
+"""
+Archival of past academic years from ``Attendance`` into ``AttendanceArchive``,
+and helpers for reports that read both tables.
+
+A student and date is recorded in at most one of the two tables; writers
+check ``archived_pairs`` (or ``recorded_pairs``) before inserting live rows.
+
+Academic years start on ``ATTENDANCE_ACADEMIC_YEAR_START`` (``"MM-DD"``) and
+the most recent ``ATTENDANCE_LIVE_ACADEMIC_YEARS`` years (including the
+current one) stay in the live table.
+"""
+import heapq
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Attendance, AttendanceArchive
+from .summary import defer_summary_refresh
+
+ARCHIVED_FIELDS = ["student_id", "teacher_id", "class_assigned_id", "date", "status", "comments"]
+
+
+def academic_year_start(day):
+    """First day of the academic year that ``day`` falls in."""
+    month, start_day = (int(part) for part in getattr(settings, "ATTENDANCE_ACADEMIC_YEAR_START", "06-01").split("-"))
+    start = date(day.year, month, start_day)
+    return start if day >= start else date(day.year - 1, month, start_day)
+
+
+def archive_cutoff(today=None, live_years=None):
+    """Rows dated before this day belong to archived academic years."""
+    if live_years is None:
+        live_years = getattr(settings, "ATTENDANCE_LIVE_ACADEMIC_YEARS", 2)
+    start = academic_year_start(today or date.today())
+    return start.replace(year=start.year - (live_years - 1))
+
+
+def archived_pairs(pairs):
+    """The ``(student_id, date)`` pairs of ``pairs`` that have an archived row."""
+    pairs = set(pairs)
+    if not pairs:
+        return set()
+    # The student/date filter is a superset of ``pairs``; extra pairs are dropped below.
+    found = AttendanceArchive.objects.filter(
+        student_id__in={student_id for student_id, _ in pairs},
+        date__in={day for _, day in pairs},
+    ).values_list("student_id", "date")
+    return pairs.intersection(found)
+
+
+def recorded_pairs(pairs):
+    """The ``(student_id, date)`` pairs of ``pairs`` that have a live or archived row."""
+    pairs = set(pairs)
+    if not pairs:
+        return set()
+    live = Attendance.objects.filter(
+        student_id__in={student_id for student_id, _ in pairs},
+        date__in={day for _, day in pairs},
+    ).values_list("student_id", "date")
+    return pairs.intersection(live) | archived_pairs(pairs)
+
+
+def archive_attendance(cutoff, batch_size=5000, dry_run=False):
+    """
+    Move ``Attendance`` rows dated before ``cutoff`` into ``AttendanceArchive``
+    ``batch_size`` rows at a time, each batch in its own transaction.
+
+    Rows whose student and date already have an archived row are left in the
+    live table for review rather than overwriting or dropping either row.
+    Counts in the daily summary do not change (it reads both tables); it is
+    refreshed once per batch rather than once per deleted row. Returns
+    ``(moved, conflicts)``.
+    """
+    queryset = Attendance.objects.filter(date__lt=cutoff)
+    if dry_run:
+        conflicting = queryset.filter(Exists(AttendanceArchive.objects.filter(
+            student_id=OuterRef("student_id"), date=OuterRef("date")
+        )))
+        conflicts = conflicting.count()
+        return queryset.count() - conflicts, conflicts
+
+    moved = conflicts = 0
+    last_id = 0
+    while True:
+        with transaction.atomic(), defer_summary_refresh():
+            rows = list(
+                queryset.filter(id__gt=last_id).order_by("id").values_list("id", *ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            records = [dict(zip(ARCHIVED_FIELDS, row[1:]), id=row[0]) for row in rows]
+            archived = archived_pairs((record["student_id"], record["date"]) for record in records)
+            records = [record for record in records if (record["student_id"], record["date"]) not in archived]
+            ids = [record.pop("id") for record in records]
+            # No ignore_conflicts: a row archived concurrently fails the batch
+            # instead of being deleted from the live table unarchived.
+            AttendanceArchive.objects.bulk_create([AttendanceArchive(**record) for record in records])
+            Attendance.objects.filter(id__in=ids).delete()
+        moved += len(ids)
+        conflicts += len(rows) - len(ids)
+    return moved, conflicts
+
+
+def filter_records(model, start_date, end_date, class_assigned=None, student=None):
+    """The same report filters applied to ``Attendance`` or ``AttendanceArchive``."""
+    queryset = model.objects.filter(date__range=[start_date, end_date])
+    if class_assigned:
+        queryset = queryset.filter(class_assigned=class_assigned)
+    if student:
+        queryset = queryset.filter(student=student)
+    return queryset
+
+
+def report_querysets(start_date, end_date, class_assigned=None, student=None):
+    """
+    Archived and live querysets for a report range. An indexed date-range
+    probe of the archive costs next to nothing when the range is all live.
+    """
+    return [
+        filter_records(model, start_date, end_date, class_assigned, student)
+        for model in (AttendanceArchive, Attendance)
+    ]
+
+
+def merge_by_date(iterables, key):
+    """Merge iterables that are each sorted by date into one date-ordered stream."""
+    if len(iterables) == 1:
+        return iter(iterables[0])
+    return heapq.merge(*iterables, key=key)
@@ -0,0 +1,42 @@
+# attendance/dedup.py
+"""
+Removal of duplicate ``Attendance`` rows for the same student and date.
+
+Used by the ``dedupe_attendance`` command; it takes the model class as an
+argument so ``AttendanceArchive`` can be cleaned the same way.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Count, Max, Q
+
+
+def duplicate_groups(model):
+    """``(student_id, date, keep_id, count)`` rows for every duplicated pair."""
+    return (
+        model.objects.values("student_id", "date")
+        .annotate(count=Count("id"), keep_id=Max("id"))
+        .filter(count__gt=1)
+        .order_by()
+        .values_list("student_id", "date", "keep_id", "count")
+    )
+
+
+def remove_duplicate_attendance(model, batch_size=500, dry_run=False):
+    """
+    Keep the most recently created row (highest id) for each student and date
+    and delete the rest, ``batch_size`` groups per ``DELETE``.
+
+    Returns ``(groups, removed)``.
+    """
+    groups = list(duplicate_groups(model))
+    removed = 0
+    for start in range(0, len(groups), batch_size):
+        batch = groups[start:start + batch_size]
+        if dry_run:
+            removed += sum(count - 1 for _, _, _, count in batch)
+            continue
+        match = reduce(or_, (Q(student_id=student_id, date=day) for student_id, day, _, _ in batch))
+        keep_ids = [keep_id for _, _, keep_id, _ in batch]
+        removed += model.objects.filter(match).exclude(id__in=keep_ids).delete()[0]
+    return len(groups), removed
@@ -1,4 +1,8 @@
 from django import forms
+from core.autocomplete import AutocompleteSelect
+from school_class.models import Class
+from students.models import Student
+from teachers.models import Teacher
 from .models import Attendance
 
 class AttendanceForm(forms.ModelForm):
@@ -6,6 +10,9 @@ class AttendanceForm(forms.ModelForm):
         model = Attendance
         fields = ["student", "teacher", "class_assigned", "date", "status", "comments"]
         widgets = {
+            "student": AutocompleteSelect("student_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
+            "teacher": AutocompleteSelect("teacher_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
+            "class_assigned": AutocompleteSelect("class_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
             "date": forms.DateInput(
                 attrs={"type": "date", "class": "border rounded px-3 py-2"}
             ),
@@ -28,3 +35,157 @@ class AttendanceReportForm(forms.Form):
         ),
         label="End Date",
     )
+    class_assigned = forms.ModelChoiceField(
+        queryset=Class.objects.order_by("name"),
+        required=False,
+        widget=forms.Select(attrs={"class": "border rounded px-3 py-2"}),
+        label="Class",
+        empty_label="All classes",
+    )
+    student = forms.ModelChoiceField(
+        queryset=Student.objects.select_related("user").order_by("user__last_name", "user__first_name"),
+        required=False,
+        widget=AutocompleteSelect("student_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
+        label="Student",
+        empty_label="All students",
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get("start_date")
+        end_date = cleaned_data.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise forms.ValidationError("Start date must be on or before end date.")
+        return cleaned_data
+
+class RollCallSelectForm(forms.Form):
+    class_assigned = forms.ModelChoiceField(
+        queryset=Class.objects.order_by("name"),
+        widget=forms.Select(attrs={"class": "border rounded px-3 py-2"}),
+        label="Class",
+    )
+    date = forms.DateField(
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "border rounded px-3 py-2"}
+        ),
+        label="Date",
+    )
+
+class RollCallForm(forms.Form):
+    """
+    One ``status_<pk>`` and ``comments_<pk>`` field per student.
+
+    Students without a stored record default to Present.
+    """
+    def __init__(self, *args, students=(), existing=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        existing = existing or {}
+        self.students = list(students)
+        for student in self.students:
+            record = existing.get(student.pk)
+            self.fields[f"status_{student.pk}"] = forms.ChoiceField(
+                choices=Attendance.STATUS_CHOICES,
+                initial=record.status if record else Attendance.PRESENT,
+                widget=forms.RadioSelect,
+                label=str(student),
+            )
+            self.fields[f"comments_{student.pk}"] = forms.CharField(
+                required=False,
+                initial=record.comments if record else "",
+                widget=forms.TextInput(attrs={"class": "border rounded px-3 py-2"}),
+                label="Comments",
+            )
+
+    def rows(self):
+        """``(student, status field, comments field)`` for the template."""
+        return [
+            (student, self[f"status_{student.pk}"], self[f"comments_{student.pk}"])
+            for student in self.students
+        ]
+
+    def marks(self):
+        """``{student_pk: (status, comments)}`` from the cleaned data."""
+        return {
+            student.pk: (
+                self.cleaned_data[f"status_{student.pk}"],
+                self.cleaned_data[f"comments_{student.pk}"] or None,
+            )
+            for student in self.students
+        }
+
+class AttendanceSummaryFilterForm(forms.Form):
+    start_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "border rounded px-3 py-2"}
+        ),
+        label="From",
+    )
+    end_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "border rounded px-3 py-2"}
+        ),
+        label="To",
+    )
+    class_assigned = forms.ModelChoiceField(
+        queryset=Class.objects.order_by("name"),
+        required=False,
+        widget=forms.Select(attrs={"class": "border rounded px-3 py-2"}),
+        label="Class",
+        empty_label="All classes",
+    )
+
+class AttendanceFilterForm(forms.Form):
+    class_assigned = forms.ModelChoiceField(
+        queryset=Class.objects.order_by("name"),
+        required=False,
+        widget=forms.Select(attrs={"class": "border rounded px-3 py-2"}),
+        label="Class",
+        empty_label="All classes",
+    )
+    student = forms.ModelChoiceField(
+        queryset=Student.objects.select_related("user").order_by("user__last_name", "user__first_name"),
+        required=False,
+        widget=AutocompleteSelect("student_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
+        label="Student",
+        empty_label="All students",
+    )
+    teacher = forms.ModelChoiceField(
+        queryset=Teacher.objects.select_related("user").order_by("user__last_name", "user__first_name"),
+        required=False,
+        widget=AutocompleteSelect("teacher_autocomplete", attrs={"class": "border rounded px-3 py-2"}),
+        label="Teacher",
+        empty_label="All teachers",
+    )
+    status = forms.ChoiceField(
+        choices=[("", "Any status")] + Attendance.STATUS_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={"class": "border rounded px-3 py-2"}),
+        label="Status",
+    )
+    start_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "border rounded px-3 py-2"}
+        ),
+        label="From",
+    )
+    end_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(
+            attrs={"type": "date", "class": "border rounded px-3 py-2"}
+        ),
+        label="To",
+    )
+
+class AttendanceImportForm(forms.Form):
+    file = forms.FileField(
+        label="CSV file",
+        help_text="Columns: date, username, status and optionally class, teacher, comments.",
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        label="Validate only",
+        help_text="Check the file without saving anything.",
+    )
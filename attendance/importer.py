@@ -0,0 +1,210 @@
+# attendance/importer.py
+"""
+Bulk import of attendance rows from CSV (e.g. biometric device exports).
+
+Students, classes and teachers are loaded once into dictionaries, every row
+is validated in memory and valid rows are written with ``bulk_create`` in
+batches. Rows for a student and date that already exist, live or archived,
+are left unchanged and counted separately from the rows inserted. Rejected rows are returned
+with their line number and reason. A file that is not UTF-8 text or not
+valid CSV raises ``AttendanceImportError`` and nothing is saved.
+
+Columns (case-insensitive, spaces or underscores): ``date``, ``username``
+(or ``student``), ``status`` and optionally ``class``, ``teacher`` and
+``comments``. The CSV written by the attendance export is accepted as is.
+"""
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from school_class.models import Class
+from students.models import Student
+from teachers.models import Teacher
+from .archive import recorded_pairs
+from .models import Attendance
+from .summary import rebuild_daily_summaries
+
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"]
+
+STATUS_ALIASES = {
+    "present": Attendance.PRESENT,
+    "p": Attendance.PRESENT,
+    "1": Attendance.PRESENT,
+    "absent": Attendance.ABSENT,
+    "a": Attendance.ABSENT,
+    "0": Attendance.ABSENT,
+}
+
+COLUMN_ALIASES = {"student": "username"}
+
+REQUIRED_COLUMNS = {"date", "username", "status"}
+
+
+class AttendanceImportError(Exception):
+    """The file could not be read as CSV text."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    valid: int = 0  # rows that passed validation
+    imported: int = 0  # valid rows inserted (or, in a dry run, that would be)
+    existing: int = 0  # valid rows skipped because the student and date were already recorded
+    rejected: list = field(default_factory=list)  # (line number, row dict, reason)
+    missing_columns: set = field(default_factory=set)
+
+    @property
+    def ok(self):
+        return not self.missing_columns
+
+
+def _normalise_header(name):
+    name = (name or "").strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _parse_date(value):
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _lookups():
+    """One query each: username -> (student id, class id), names -> ids."""
+    students = {
+        username.lower(): (student_id, class_id)
+        for username, student_id, class_id in Student.objects.values_list("user__username", "id", "class_obj_id")
+    }
+    classes = {name.lower(): class_id for name, class_id in Class.objects.values_list("name", "id")}
+    teachers = {username.lower(): teacher_id for username, teacher_id in Teacher.objects.values_list("user__username", "id")}
+    return students, classes, teachers
+
+
+def import_attendance(text_stream, batch_size=1000, dry_run=False):
+    """
+    Validate and import the CSV in ``text_stream`` (a text file object).
+
+    With ``dry_run`` rows are validated but nothing is written. The daily
+    summary is rebuilt for the imported classes and date range afterwards.
+    """
+    try:
+        return _import_rows(text_stream, batch_size, dry_run)
+    except UnicodeDecodeError as e:
+        raise AttendanceImportError(
+            f"The file is not UTF-8 text (invalid byte at position {e.start}). "
+            "Save it as CSV UTF-8 and try again."
+        ) from e
+    except csv.Error as e:
+        raise AttendanceImportError(f"The file is not valid CSV: {e}.") from e
+
+
+def _import_rows(text_stream, batch_size, dry_run):
+    result = ImportResult()
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    columns = [_normalise_header(name) for name in header or []]
+    result.missing_columns = REQUIRED_COLUMNS - set(columns)
+    if result.missing_columns:
+        return result
+
+    students, classes, teachers = _lookups()
+    today = timezone.localdate()
+    seen = set()
+    batch = []
+    class_ids = set()
+    first_date = last_date = None
+
+    def flush():
+        if not batch:
+            return
+        recorded = recorded_pairs((record.student_id, record.date) for record in batch)
+        new = [record for record in batch if (record.student_id, record.date) not in recorded]
+        if new and not dry_run:
+            # ignore_conflicts only covers rows written concurrently since the check.
+            Attendance.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+        result.valid += len(batch)
+        result.imported += len(new)
+        result.existing += len(batch) - len(new)
+        batch.clear()
+
+    with transaction.atomic():
+        for line, values in enumerate(reader, start=2):
+            if not any(value.strip() for value in values):
+                continue
+            result.rows += 1
+            row = dict(zip(columns, values))
+
+            username = row.get("username", "").strip().lower()
+            if username not in students:
+                result.rejected.append((line, row, f"Unknown student '{row.get('username', '')}'."))
+                continue
+            student_id, class_id = students[username]
+
+            day = _parse_date(row.get("date", ""))
+            if day is None:
+                result.rejected.append((line, row, f"Invalid date '{row.get('date', '')}'."))
+                continue
+            if day > today:
+                result.rejected.append((line, row, "Date is in the future."))
+                continue
+
+            status = STATUS_ALIASES.get(row.get("status", "").strip().lower())
+            if status is None:
+                result.rejected.append((line, row, f"Invalid status '{row.get('status', '')}'."))
+                continue
+
+            class_name = row.get("class", "").strip().lower()
+            if class_name:
+                if class_name not in classes:
+                    result.rejected.append((line, row, f"Unknown class '{row.get('class')}'."))
+                    continue
+                class_id = classes[class_name]
+
+            teacher_name = row.get("teacher", "").strip().lower()
+            if teacher_name and teacher_name not in teachers:
+                result.rejected.append((line, row, f"Unknown teacher '{row.get('teacher')}'."))
+                continue
+
+            if (student_id, day) in seen:
+                result.rejected.append((line, row, "Duplicate student and date in this file."))
+                continue
+            seen.add((student_id, day))
+
+            batch.append(Attendance(
+                student_id=student_id,
+                class_assigned_id=class_id,
+                teacher_id=teachers.get(teacher_name),
+                date=day,
+                status=status,
+                comments=row.get("comments", "").strip() or None,
+            ))
+            if class_id:
+                class_ids.add(class_id)
+            first_date = day if first_date is None else min(first_date, day)
+            last_date = day if last_date is None else max(last_date, day)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        if class_ids and not dry_run:
+            # bulk_create sends no signals; recount the affected summary rows.
+            rebuild_daily_summaries(first_date, last_date, class_ids=class_ids)
+    return result
+
+
+def write_rejected_csv(result, output):
+    """Write rejected rows with their line number and reason."""
+    writer = csv.writer(output)
+    writer.writerow(["line", "reason", "date", "username", "class", "teacher", "status", "comments"])
+    for line, row, reason in result.rejected:
+        writer.writerow([
+            line, reason, row.get("date", ""), row.get("username", ""), row.get("class", ""),
+            row.get("teacher", ""), row.get("status", ""), row.get("comments", ""),
+        ])
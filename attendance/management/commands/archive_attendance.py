@@ -0,0 +1,55 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from attendance.archive import archive_attendance, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move attendance rows from past academic years into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--live-years",
+            type=int,
+            default=None,
+            help="Academic years (including the current one) to keep live. "
+                 "Defaults to ATTENDANCE_LIVE_ACADEMIC_YEARS."
+        )
+        parser.add_argument(
+            "--before",
+            type=str,
+            default=None,
+            help="Archive rows dated before this YYYY-MM-DD instead of an academic-year boundary."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows moved per transaction (default: 5000)."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows would be archived without moving anything."
+        )
+
+    def handle(self, *args, **options):
+        if options["before"]:
+            cutoff = date.fromisoformat(options["before"])
+        else:
+            if options["live_years"] is not None and options["live_years"] < 1:
+                self.stdout.write(self.style.ERROR("--live-years must be at least 1."))
+                return
+            cutoff = archive_cutoff(live_years=options["live_years"])
+
+        moved, conflicts = archive_attendance(cutoff, batch_size=options["batch_size"], dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{moved} attendance rows dated before {cutoff} would be archived."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Archived {moved} attendance rows dated before {cutoff}."))
+        if conflicts:
+            self.stdout.write(self.style.ERROR(
+                f"{conflicts} rows were left in the live table because the archive already has a row "
+                "for the same student and date. Keep one of each pair and run the command again."
+            ))
@@ -0,0 +1,57 @@
+import json
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from attendance.analytics import attendance_analytics, write_csv
+
+
+class Command(BaseCommand):
+    help = "Print attendance analytics (absence rates, streaks, weekly trends) as JSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            default=None,
+            help="Start date in YYYY-MM-DD format. Defaults to 30 days ago."
+        )
+        parser.add_argument(
+            "--end-date",
+            type=str,
+            default=None,
+            help="End date in YYYY-MM-DD format. Defaults to today."
+        )
+        parser.add_argument(
+            "--class-id",
+            type=int,
+            default=None,
+            help="Only include this class."
+        )
+        parser.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            default="json",
+            help="Output format (default: json)."
+        )
+        parser.add_argument(
+            "--scope",
+            choices=["students", "classes"],
+            default="students",
+            help="Rows to print in CSV output (default: students)."
+        )
+
+    def handle(self, *args, **options):
+        end_date = date.fromisoformat(options["end_date"]) if options["end_date"] else date.today()
+        start_date = (
+            date.fromisoformat(options["start_date"]) if options["start_date"] else end_date - timedelta(days=30)
+        )
+        if start_date > end_date:
+            self.stdout.write(self.style.ERROR("Start date must be before end date."))
+            return
+
+        result = attendance_analytics(start_date, end_date, class_id=options["class_id"])
+        if options["format"] == "csv":
+            write_csv(result[options["scope"]], self.stdout)
+        else:
+            self.stdout.write(json.dumps(result, indent=2))
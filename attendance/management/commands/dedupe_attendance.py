@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.dedup import remove_duplicate_attendance
+from attendance.models import Attendance
+
+
+class Command(BaseCommand):
+    help = "Remove duplicate attendance rows, keeping the latest row for each student and date."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows would be removed without deleting anything.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Duplicate groups deleted per query (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            groups, removed = remove_duplicate_attendance(
+                Attendance, batch_size=options["batch_size"], dry_run=options["dry_run"]
+            )
+
+        if not groups:
+            self.stdout.write(self.style.SUCCESS("No duplicate attendance rows found."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(
+                f"{removed} duplicate rows in {groups} student/date pairs would be removed."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Removed {removed} duplicate rows from {groups} student/date pairs."
+            ))
@@ -1,10 +1,14 @@
 from django.core.management.base import BaseCommand
+from attendance.archive import archived_pairs, recorded_pairs
 from attendance.models import Attendance
+from attendance.summary import refresh_daily_summaries
 from students.models import Student
 from teachers.models import Teacher
 from school_class.models import Class
 from faker import Faker
 import random
+import time
+from collections import defaultdict
 from datetime import date, timedelta
 
 class Command(BaseCommand):
@@ -30,6 +34,29 @@ class Command(BaseCommand):
             default=None,
             help="End date in YYYY-MM-DD format. Defaults to today."
         )
+        parser.add_argument(
+            "--full-rolls",
+            action="store_true",
+            help="Ignore NUMBER and mark every student of every class on each school day in the range."
+        )
+        parser.add_argument(
+            "--absence-rate",
+            type=float,
+            default=0.08,
+            help="Share of students marked absent with --full-rolls (default: 0.08)."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk_create with --full-rolls (default: 5000)."
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Random seed for repeatable data."
+        )
 
     def handle(self, *args, **options):
         number = options["number"]
@@ -51,6 +78,10 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR("Start date must be before end date."))
             return
 
+        if options["full_rolls"]:
+            self.generate_full_rolls(start_date, end_date, options)
+            return
+
         students = list(Student.objects.all())
         if not students:
             self.stdout.write(self.style.ERROR("No students available."))
@@ -58,6 +89,7 @@ class Command(BaseCommand):
 
         fake = Faker()
         created_count = 0
+        teachers = list(Teacher.objects.all())
 
         for _ in range(number):
             student = random.choice(students)
@@ -65,13 +97,18 @@ class Command(BaseCommand):
             teacher = None
             if class_assigned:
                 # Use the class teacher if set; otherwise, choose a random teacher
-                teacher = class_assigned.class_teacher or random.choice(list(Teacher.objects.all()))
+                teacher = class_assigned.class_teacher or (random.choice(teachers) if teachers else None)
             # Random date between start_date and end_date
             random_days = random.randint(0, (end_date - start_date).days)
             attendance_date = start_date + timedelta(days=random_days)
             status = random.choice(['Present', 'Absent'])
             comments = fake.sentence() if status == 'Absent' else ''
 
+            if archived_pairs([(student.pk, attendance_date)]):
+                self.stdout.write(self.style.WARNING(
+                    f"Skipped {str(student)} on {attendance_date}: that date is archived."
+                ))
+                continue
             try:
                 Attendance.objects.create(
                     student=student,
@@ -90,3 +127,82 @@ class Command(BaseCommand):
                     f"Failed to create attendance for {str(student)}: {e}"
                 ))
         self.stdout.write(self.style.SUCCESS(f"Successfully created {created_count} attendance records."))
+
+    def generate_full_rolls(self, start_date, end_date, options):
+        """
+        Mark every student of every class on each school day (Monday to
+        Saturday) in the range, writing with ``bulk_create`` in batches.
+
+        Students, classes and teachers are read once with ``values_list`` and
+        rows are built as they are written, so memory stays flat however many
+        rows are generated. Existing rows for a student and date, live or
+        archived, are kept and not counted as written.
+        """
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        absence_rate = options["absence_rate"]
+
+        roll = defaultdict(list)
+        for student_id, class_id in Student.objects.filter(class_obj__isnull=False).values_list("id", "class_obj_id"):
+            roll[class_id].append(student_id)
+        if not roll:
+            self.stdout.write(self.style.ERROR("No students with a class available."))
+            return
+        teacher_ids = list(Teacher.objects.values_list("id", flat=True))
+        class_teachers = {
+            class_id: teacher_id or (rng.choice(teacher_ids) if teacher_ids else None)
+            for class_id, teacher_id in Class.objects.filter(id__in=roll).values_list("id", "class_teacher_id")
+        }
+        # Faker is slow per call; reuse a small pool of absence notes.
+        fake = Faker()
+        if options["seed"] is not None:
+            fake.seed_instance(options["seed"])
+        notes = [fake.sentence() for _ in range(50)]
+
+        school_days = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+            if (start_date + timedelta(days=offset)).weekday() < 6
+        ]
+
+        started = time.perf_counter()
+        written = 0
+        written_keys = set()  # (class_id, date) of inserted rows
+        batch = []
+
+        def flush():
+            recorded = recorded_pairs((record.student_id, record.date) for record in batch)
+            new = [record for record in batch if (record.student_id, record.date) not in recorded]
+            # ignore_conflicts only covers rows written concurrently since the check.
+            Attendance.objects.bulk_create(new, ignore_conflicts=True)
+            written_keys.update(record.summary_key for record in new)
+            return len(new)
+
+        for day in school_days:
+            for class_id, student_ids in roll.items():
+                teacher_id = class_teachers.get(class_id)
+                for student_id in student_ids:
+                    absent = rng.random() < absence_rate
+                    batch.append(Attendance(
+                        student_id=student_id,
+                        teacher_id=teacher_id,
+                        class_assigned_id=class_id,
+                        date=day,
+                        status=Attendance.ABSENT if absent else Attendance.PRESENT,
+                        comments=rng.choice(notes) if absent else "",
+                    ))
+                    if len(batch) >= batch_size:
+                        written += flush()
+                        batch = []
+            self.stdout.write(f"{day}: {written} rows so far", ending="\r")
+        if batch:
+            written += flush()
+
+        # bulk_create sends no signals; recount the summary where rows were written.
+        refresh_daily_summaries(written_keys)
+        elapsed = time.perf_counter() - started
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} attendance rows for {len(roll)} classes over "
+            f"{len(school_days)} school days in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.importer import AttendanceImportError, import_attendance, write_rejected_csv
+
+
+class Command(BaseCommand):
+    help = "Import attendance records from a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file with date, username, status and optional class, teacher, comments.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per bulk_create (default: 1000)."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without saving anything."
+        )
+        parser.add_argument(
+            "--rejects",
+            default=None,
+            help="Write rejected rows with their line number and reason to this CSV file."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as text_stream:
+                result = import_attendance(text_stream, batch_size=options["batch_size"], dry_run=options["dry_run"])
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+        except AttendanceImportError as e:
+            raise CommandError(str(e))
+
+        if not result.ok:
+            raise CommandError(f"Missing columns: {', '.join(sorted(result.missing_columns))}.")
+
+        if options["rejects"] and result.rejected:
+            with open(options["rejects"], "w", encoding="utf-8", newline="") as output:
+                write_rejected_csv(result, output)
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Validated {result.valid} of {result.rows} rows; {result.imported} would be imported."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result.imported} of {result.rows} rows."))
+        if result.existing:
+            self.stdout.write(self.style.WARNING(
+                f"{result.existing} rows were for a student and date already recorded and were left unchanged."
+            ))
+        if result.rejected:
+            self.stdout.write(self.style.WARNING(f"{len(result.rejected)} rows were rejected."))
+            for line, _, reason in result.rejected[:10]:
+                self.stdout.write(f"  line {line}: {reason}")
@@ -0,0 +1,55 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from attendance.models import Attendance, AttendanceArchive
+from attendance.summary import rebuild_daily_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily attendance summary table from attendance records."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            default=None,
+            help="Start date in YYYY-MM-DD format. Defaults to the earliest attendance date, archive included."
+        )
+        parser.add_argument(
+            "--end-date",
+            type=str,
+            default=None,
+            help="End date in YYYY-MM-DD format. Defaults to the latest attendance date."
+        )
+        parser.add_argument(
+            "--class-id",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Only rebuild these class ids (default: every class)."
+        )
+
+    def handle(self, *args, **options):
+        # Bounds over live and archived rows.
+        bounds = [
+            model.objects.aggregate(first=Min("date"), last=Max("date"))
+            for model in (AttendanceArchive, Attendance)
+        ]
+        firsts = [bound["first"] for bound in bounds if bound["first"]]
+        lasts = [bound["last"] for bound in bounds if bound["last"]]
+        start_date = date.fromisoformat(options["start_date"]) if options["start_date"] else min(firsts, default=None)
+        end_date = date.fromisoformat(options["end_date"]) if options["end_date"] else max(lasts, default=None)
+
+        if start_date is None or end_date is None:
+            self.stdout.write(self.style.WARNING("No attendance records found."))
+            return
+        if start_date > end_date:
+            self.stdout.write(self.style.ERROR("Start date must be before end date."))
+            return
+
+        written = rebuild_daily_summaries(start_date, end_date, class_ids=options["class_id"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} daily summary rows from {start_date} to {end_date}."
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:55
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicates(apps, schema_editor):
+    # The unique constraint below cannot be created while duplicates exist.
+    # Keep the most recently created row (highest id) for each student and date.
+    Attendance = apps.get_model("attendance", "Attendance")
+    groups = (
+        Attendance.objects.values("student_id", "date")
+        .annotate(count=Count("id"), keep_id=Max("id"))
+        .filter(count__gt=1)
+        .order_by()
+        .values_list("student_id", "date", "keep_id")
+    )
+    for student_id, day, keep_id in groups.iterator():
+        Attendance.objects.filter(student_id=student_id, date=day).exclude(id=keep_id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_initial'),
+        ('school_class', '0002_initial'),
+        ('students', '0004_remove_student_first_name_remove_student_last_name'),
+        ('teachers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date'], name='attendance_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['class_assigned', 'date'], name='attendance_class_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('student', 'date'), name='attendance_unique_student_date'),
+        ),
+    ]
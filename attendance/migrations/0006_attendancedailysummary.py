@@ -0,0 +1,32 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_attendance_indexes_unique_student_date'),
+        ('school_class', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('present_count', models.PositiveIntegerField(default=0)),
+                ('absent_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_assigned', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='school_class.class')),
+            ],
+            options={
+                'verbose_name_plural': 'Attendance daily summaries',
+                'ordering': ['-date', 'class_assigned'],
+                'indexes': [models.Index(fields=['date'], name='attendance_summary_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('class_assigned', 'date'), name='attendance_summary_unique_class_date')],
+            },
+        ),
+    ]
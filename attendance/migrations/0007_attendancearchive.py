@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0006_attendancedailysummary'),
+        ('school_class', '0002_initial'),
+        ('students', '0004_remove_student_first_name_remove_student_last_name'),
+        ('teachers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('Present', 'Present'), ('Absent', 'Absent')], max_length=10)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('class_assigned', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='school_class.class')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='students.student')),
+                ('teacher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='teachers.teacher')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='attendance_archive_date_idx'), models.Index(fields=['class_assigned', 'date'], name='attendance_archive_class_idx')],
+                'constraints': [models.UniqueConstraint(fields=('student', 'date'), name='attendance_archive_unique_student_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0007_attendancearchive'),
+        ('school_class', '0002_initial'),
+        ('students', '0005_studentsearchtoken'),
+        ('teachers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendance',
+            name='attendance_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+        ),
+    ]
@@ -1,16 +1,22 @@
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.db import models
 from students.models import Student
 from teachers.models import Teacher
 from school_class.models import Class
 
-class Attendance(models.Model):
+class AttendanceRecord(models.Model):
+    """Fields shared by live ``Attendance`` rows and ``AttendanceArchive`` rows."""
+    PRESENT = "Present"
+    ABSENT = "Absent"
+    STATUS_CHOICES = [(PRESENT, "Present"), (ABSENT, "Absent")]
+
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     teacher = models.ForeignKey(Teacher, on_delete=models.SET_NULL, null=True, blank=True)
     class_assigned = models.ForeignKey(Class, on_delete=models.SET_NULL, null=True, blank=True)
     date = models.DateField()
     status = models.CharField(
         max_length=10,
-        choices=[('Present', 'Present'), ('Absent', 'Absent')]
+        choices=STATUS_CHOICES
     )
     comments = models.TextField(blank=True, null=True)
 
@@ -18,8 +24,112 @@ class Attendance(models.Model):
         return f"{self.student} - {self.date} - {self.status}"
 
     class Meta:
+        abstract = True
+
+class Attendance(AttendanceRecord):
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the summary row this record was counted in, so a save that
+        # moves it to another class or date can fix both rows.
+        loaded = dict(zip(field_names, values))
+        if "class_assigned_id" in loaded and "date" in loaded:
+            instance._loaded_summary_key = (loaded["class_assigned_id"], loaded["date"])
+        return instance
+
+    @property
+    def summary_key(self):
+        return (self.class_assigned_id, self.date)
+
+    def validate_constraints(self, exclude=None):
+        # The unique constraint does not reach the archive; a live row for an
+        # archived student and date would be counted twice.
+        errors = {}
+        try:
+            super().validate_constraints(exclude)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        checked = not exclude or not {"student", "date"} & set(exclude)
+        if checked and self.student_id and self.date and AttendanceArchive.objects.filter(
+            student_id=self.student_id, date=self.date
+        ).exists():
+            errors.setdefault(NON_FIELD_ERRORS, []).append(ValidationError(
+                "Attendance for this student and date has been archived and can no longer be changed.",
+                code="archived",
+            ))
+        if errors:
+            raise ValidationError(errors)
+
+    class Meta:
+        constraints = [
+            # Its index also serves per-student date lookups.
+            models.UniqueConstraint(fields=["student", "date"], name="attendance_unique_student_date"),
+        ]
+        indexes = [
+            # Serves date-range filters and the list's ("-date", "-id") keyset
+            # pages with a backward range scan.
+            models.Index(fields=["date", "id"], name="attendance_date_id_idx"),
+            models.Index(fields=["class_assigned", "date"], name="attendance_class_date_idx"),
+        ]
         permissions = [
             ('can_mark_attendance', 'Can mark attendance'),
             ('can_view_attendance', 'Can view attendance'),
             ('can_edit_attendance', 'Can edit attendance'),
         ]
+
+
+class AttendanceArchive(AttendanceRecord):
+    """
+    Attendance rows from past academic years, moved out of ``Attendance`` by
+    the ``archive_attendance`` command so the live table and its indexes stay
+    small. Reports and the daily summary read both tables.
+    """
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "date"], name="attendance_archive_unique_student_date"),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="attendance_archive_date_idx"),
+            models.Index(fields=["class_assigned", "date"], name="attendance_archive_class_idx"),
+        ]
+
+
+class AttendanceDailySummary(models.Model):
+    """
+    Present/absent counts per class and date.
+
+    Maintained by ``attendance.summary``; reports read these rows instead of
+    scanning ``Attendance``.
+    """
+    class_assigned = models.ForeignKey(Class, on_delete=models.CASCADE, related_name="attendance_summaries")
+    date = models.DateField()
+    present_count = models.PositiveIntegerField(default=0)
+    absent_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.class_assigned} - {self.date}: {self.present_count}/{self.total_count} present"
+
+    @property
+    def total_count(self):
+        return self.present_count + self.absent_count
+
+    @property
+    def present_rate(self):
+        """Percentage of marked students who were present."""
+        if not self.total_count:
+            return None
+        return round(100 * self.present_count / self.total_count, 1)
+
+    class Meta:
+        ordering = ["-date", "class_assigned"]
+        constraints = [
+            models.UniqueConstraint(fields=["class_assigned", "date"], name="attendance_summary_unique_class_date"),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="attendance_summary_date_idx"),
+        ]
+        verbose_name_plural = "Attendance daily summaries"
@@ -0,0 +1,24 @@
+# attendance/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Attendance
+from .summary import refresh_daily_summaries
+
+
+@receiver(post_save, sender=Attendance)
+def refresh_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    keys = {instance.summary_key}
+    loaded_key = getattr(instance, "_loaded_summary_key", None)
+    if loaded_key:
+        # The record may have moved to another class or date.
+        keys.add(loaded_key)
+    refresh_daily_summaries(keys)
+    instance._loaded_summary_key = instance.summary_key
+
+
+@receiver(post_delete, sender=Attendance)
+def refresh_summary_on_delete(sender, instance, **kwargs):
+    refresh_daily_summaries({getattr(instance, "_loaded_summary_key", instance.summary_key)})
@@ -0,0 +1,161 @@
+# attendance/summary.py
+"""
+Maintenance of ``AttendanceDailySummary``, the per-class, per-day rollup.
+
+Counts are always recomputed from ``Attendance`` for the affected
+``(class_id, date)`` keys rather than adjusted by +1/-1, so a missed update
+is repaired by the next write to the same key (or by
+``rebuild_daily_summaries``). ``attendance.signals`` refreshes keys on
+single-row saves and deletes; bulk writers call ``refresh_daily_summaries``
+with the keys they touched. Both also invalidate the cached analytics.
+Counts include archived rows (``AttendanceArchive``), so archiving does not
+change them.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import connections, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .analytics import invalidate_analytics
+from .models import Attendance, AttendanceArchive, AttendanceDailySummary
+
+_deferred = threading.local()
+
+
+def _count_rows(**filters):
+    """
+    ``{(class_id, date): (present, absent)}`` over live and archived rows
+    matching ``filters``.
+    """
+    counts = {}
+    for model in (Attendance, AttendanceArchive):
+        rows = (
+            model.objects.filter(class_assigned__isnull=False, **filters)
+            .values("class_assigned_id", "date")
+            .annotate(
+                present=Count("id", filter=Q(status=Attendance.PRESENT)),
+                absent=Count("id", filter=Q(status=Attendance.ABSENT)),
+            )
+            .order_by()
+        )
+        for row in rows:
+            key = (row["class_assigned_id"], row["date"])
+            present, absent = counts.get(key, (0, 0))
+            counts[key] = (present + row["present"], absent + row["absent"])
+    return counts
+
+
+def _upsert_summaries(summaries, batch_size=None):
+    """
+    Insert summary rows, overwriting the counts of any row another writer
+    created for the same ``(class, date)`` in the meantime instead of failing
+    on the unique constraint.
+    """
+    if not summaries:
+        return
+    options = {}
+    if connections[AttendanceDailySummary.objects.db].features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["class_assigned", "date"]  # MySQL infers it from the unique key.
+    AttendanceDailySummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        update_fields=["present_count", "absent_count", "updated_at"],
+        **options,
+    )
+
+
+@contextmanager
+def defer_summary_refresh():
+    """
+    Collect the keys passed to ``refresh_daily_summaries`` inside the block
+    and refresh them once on exit, e.g. around a batch delete that sends one
+    ``post_delete`` signal per row.
+    """
+    outer = getattr(_deferred, "keys", None)
+    _deferred.keys = set() if outer is None else outer
+    try:
+        yield
+    finally:
+        keys = _deferred.keys
+        if outer is None:
+            _deferred.keys = None
+            refresh_daily_summaries(keys)
+
+
+def refresh_daily_summaries(keys):
+    """Recompute the summary rows for an iterable of ``(class_id, date)`` keys."""
+    keys = {key for key in keys if key[0] is not None and key[1] is not None}
+    if not keys:
+        return
+    if getattr(_deferred, "keys", None) is not None:
+        _deferred.keys.update(keys)
+        return
+    class_ids = {class_id for class_id, _ in keys}
+    dates = {day for _, day in keys}
+
+    with transaction.atomic():
+        # The class/date filter is a superset of ``keys``; extra keys are dropped below.
+        counts = _count_rows(class_assigned_id__in=class_ids, date__in=dates)
+        existing = {
+            (summary.class_assigned_id, summary.date): summary
+            for summary in AttendanceDailySummary.objects.select_for_update().filter(
+                class_assigned_id__in=class_ids, date__in=dates
+            )
+            if (summary.class_assigned_id, summary.date) in keys
+        }
+
+        now = timezone.now()
+        to_create, to_update, to_delete = [], [], []
+        for key in keys:
+            present, absent = counts.get(key, (0, 0))
+            summary = existing.get(key)
+            if not present and not absent:
+                if summary:
+                    to_delete.append(summary.pk)
+            elif summary is None:
+                to_create.append(AttendanceDailySummary(
+                    class_assigned_id=key[0], date=key[1], present_count=present, absent_count=absent,
+                    updated_at=now,
+                ))
+            elif (summary.present_count, summary.absent_count) != (present, absent):
+                summary.present_count, summary.absent_count = present, absent
+                summary.updated_at = now  # bulk_update skips auto_now.
+                to_update.append(summary)
+
+        AttendanceDailySummary.objects.filter(pk__in=to_delete).delete()
+        AttendanceDailySummary.objects.bulk_update(to_update, ["present_count", "absent_count", "updated_at"])
+        # A concurrent first write for the same key may have inserted it since
+        # the select_for_update above found nothing to lock.
+        _upsert_summaries(to_create)
+        # Any change to the counts also changes the analytics.
+        transaction.on_commit(invalidate_analytics)
+
+
+def rebuild_daily_summaries(start_date, end_date, class_ids=None, batch_size=1000):
+    """
+    Replace every summary row between ``start_date`` and ``end_date``
+    (optionally only for ``class_ids``) with counts from one grouped query
+    per table.
+
+    Returns the number of summary rows written.
+    """
+    filters = {"date__range": [start_date, end_date]}
+    if class_ids:
+        filters["class_assigned_id__in"] = class_ids
+    summary_qs = AttendanceDailySummary.objects.filter(**filters)
+
+    now = timezone.now()
+    summaries = [
+        AttendanceDailySummary(
+            class_assigned_id=class_id, date=day, present_count=present, absent_count=absent, updated_at=now
+        )
+        for (class_id, day), (present, absent) in _count_rows(**filters).items()
+    ]
+    with transaction.atomic():
+        summary_qs.delete()
+        _upsert_summaries(summaries, batch_size=batch_size)
+        transaction.on_commit(invalidate_analytics)
+    return len(summaries)
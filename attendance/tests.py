@@ -1,3 +1,447 @@
-from django.test import TestCase
+import csv
+import io
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from reportlab.pdfgen import canvas
+
+from accounts.models import CustomUser
+from core.pagination import encode_cursor
+from school_class.models import Class
+from students.models import Student
+from .analytics import _cache as analytics_cache, attendance_analytics
+from .archive import archive_attendance
+from .forms import AttendanceForm
+from .importer import AttendanceImportError, import_attendance
+from .models import Attendance, AttendanceArchive, AttendanceDailySummary
+from .views import AttendanceCSVExportView, AttendanceRollCallView
+from .summary import _upsert_summaries, rebuild_daily_summaries, refresh_daily_summaries
+
+# A roll-call submission's queries do not depend on the class size: session,
+# user, class, students, archive probe, teacher, locked rows, one upsert or
+# bulk_update each, the summary refresh and the message, plus savepoints.
+ROLL_CALL_MAX_QUERIES = 20
+
+
+class AttendanceTestData(TestCase):
+    """A class of four students; shared by the attendance test cases."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school_class = Class.objects.create(name="Class 1")
+        cls.students = []
+        for index in range(4):
+            user = CustomUser.objects.create(
+                username=f"student{index}", first_name=f"first{index}", last_name="last", role="student"
+            )
+            cls.students.append(Student.objects.create(user=user, age=15, address="Address", class_obj=cls.school_class))
+
+    def mark(self, student, day, status=Attendance.PRESENT):
+        return Attendance.objects.create(student=student, class_assigned=self.school_class, date=day, status=status)
+
+    def archive(self, student, day, status=Attendance.PRESENT):
+        return AttendanceArchive.objects.create(student=student, class_assigned=self.school_class, date=day,
+                                                status=status)
+
+    def summary_counts(self, day):
+        summary = AttendanceDailySummary.objects.get(class_assigned=self.school_class, date=day)
+        return summary.present_count, summary.absent_count
+
+
+class DailySummaryTests(AttendanceTestData):
+    day = date(2024, 9, 2)
+
+    def test_saves_and_deletes_keep_counts_current(self):
+        records = [self.mark(student, self.day) for student in self.students[:3]]
+        self.assertEqual(self.summary_counts(self.day), (3, 0))
+        records[0].status = Attendance.ABSENT
+        records[0].save()
+        self.assertEqual(self.summary_counts(self.day), (2, 1))
+        for record in records:
+            record.delete()
+        self.assertFalse(AttendanceDailySummary.objects.filter(date=self.day).exists())
+
+    def test_moving_a_record_updates_both_days(self):
+        record = self.mark(self.students[0], self.day)
+        self.mark(self.students[1], self.day)
+        record = Attendance.objects.get(pk=record.pk)
+        record.date = date(2024, 9, 3)
+        record.save()
+        self.assertEqual(self.summary_counts(self.day), (1, 0))
+        self.assertEqual(self.summary_counts(date(2024, 9, 3)), (1, 0))
+
+    def test_first_write_overwrites_a_concurrently_created_row(self):
+        # Another writer inserted the row after this one found none to lock.
+        AttendanceDailySummary.objects.create(
+            class_assigned=self.school_class, date=self.day, present_count=9, absent_count=9
+        )
+        _upsert_summaries([AttendanceDailySummary(
+            class_assigned=self.school_class, date=self.day, present_count=1, absent_count=0
+        )])
+        self.assertEqual(self.summary_counts(self.day), (1, 0))
+        self.assertEqual(AttendanceDailySummary.objects.filter(date=self.day).count(), 1)
+
+    def test_rebuild_matches_incremental_counts(self):
+        self.mark(self.students[0], self.day)
+        self.mark(self.students[1], self.day, Attendance.ABSENT)
+        Attendance.objects.bulk_create([
+            Attendance(student=self.students[2], class_assigned=self.school_class, date=self.day,
+                       status=Attendance.ABSENT),
+        ])
+        refresh_daily_summaries({(self.school_class.pk, self.day)})
+        expected = self.summary_counts(self.day)
+        AttendanceDailySummary.objects.all().delete()
+        self.assertEqual(rebuild_daily_summaries(self.day, self.day), 1)
+        self.assertEqual(self.summary_counts(self.day), expected)
+        self.assertEqual(expected, (1, 2))
+
+
+class AttendanceListPaginationTests(AttendanceTestData):
+    def setUp(self):
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+        # 60 rows over 15 days, so pages split dates and the id tie-break matters.
+        for offset in range(15):
+            for student in self.students:
+                self.mark(student, date(2024, 9, 1) + timedelta(days=offset))
+        self.expected = list(Attendance.objects.order_by("-date", "-id").values_list("pk", flat=True))
+
+    def test_older_pages_cover_every_row_once_in_order(self):
+        url = reverse("attendance-list")
+        seen = []
+        response = self.client.get(url)
+        while True:
+            seen.extend(record.pk for record in response.context["attendances"])
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"after": page.next_cursor})
+        self.assertEqual(seen, self.expected)
+
+    def test_newer_link_returns_the_previous_page(self):
+        url = reverse("attendance-list")
+        first = self.client.get(url)
+        second = self.client.get(url, {"after": first.context["page_obj"].next_cursor})
+        back = self.client.get(url, {"before": second.context["page_obj"].previous_cursor})
+        self.assertEqual(
+            [record.pk for record in back.context["attendances"]],
+            [record.pk for record in first.context["attendances"]],
+        )
+
+    def test_filters_apply_to_every_page(self):
+        response = self.client.get(reverse("attendance-list"), {"student": self.students[0].pk})
+        self.assertTrue(all(record.student_id == self.students[0].pk for record in response.context["attendances"]))
+        self.assertEqual(len(response.context["attendances"]), 15)
+    def test_cursors_with_wrong_value_types_fall_back_to_the_first_page(self):
+        url = reverse("attendance-list")
+        first = [record.pk for record in self.client.get(url).context["attendances"]]
+        for values in (["x", "y"], [None, 1], [[1], {}], ["2024-09-01", "1.5"]):
+            cursor = encode_cursor(values)
+            for direction in ("after", "before"):
+                response = self.client.get(url, {direction: cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([record.pk for record in response.context["attendances"]], first)
+
+
+class AttendanceImportTests(AttendanceTestData):
+    def import_csv(self, text, **kwargs):
+        return import_attendance(io.StringIO(text), **kwargs)
+
+    def test_counts_rows_already_recorded_separately(self):
+        self.mark(self.students[0], date(2024, 9, 2))
+        result = self.import_csv(
+            "date,username,status\n"
+            "2024-09-02,student0,absent\n"
+            "2024-09-02,student1,present\n"
+            "2024-09-02,student1,absent\n"
+            "2024-09-02,nobody,present\n"
+        )
+        self.assertEqual((result.rows, result.valid, result.imported, result.existing), (4, 2, 1, 1))
+        self.assertEqual([reason for _, _, reason in result.rejected], [
+            "Duplicate student and date in this file.", "Unknown student 'nobody'.",
+        ])
+        self.assertEqual(Attendance.objects.get(student=self.students[0]).status, Attendance.PRESENT)
+        self.assertEqual(self.summary_counts(date(2024, 9, 2)), (2, 0))
+
+    def test_reimport_imports_nothing(self):
+        text = "date,username,status\n2024-09-02,student0,present\n2024-09-02,student1,absent\n"
+        self.assertEqual(self.import_csv(text).imported, 2)
+        result = self.import_csv(text)
+        self.assertEqual((result.valid, result.imported, result.existing), (2, 0, 2))
+        self.assertEqual(Attendance.objects.count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        result = self.import_csv("date,username,status\n2024-09-02,student0,present\n", dry_run=True)
+        self.assertEqual(result.imported, 1)
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_invalid_csv_raises_and_saves_nothing(self):
+        with self.assertRaises(AttendanceImportError):
+            # e.g. a binary file uploaded by mistake: one "field" over the csv module's size limit.
+            self.import_csv("date,username,status\n2024-09-02,student0,present\n" + "x" * 200_000 + "\n")
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_non_utf8_upload_is_a_form_error(self):
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+        upload = SimpleUploadedFile(
+            "attendance.csv", "date,username,status,comments\n2024-09-02,student0,present,Café\n".encode("latin-1")
+        )
+        response = self.client.post(reverse("attendance-import"), {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("not UTF-8", response.context["form"].errors["file"][0])
+        self.assertFalse(Attendance.objects.exists())
+
+
+class AttendanceArchiveTests(AttendanceTestData):
+    day = date(2021, 9, 1)
+
+    def test_archives_rows_and_keeps_counts(self):
+        for student in self.students:
+            self.mark(student, self.day)
+        self.assertEqual(archive_attendance(date(2022, 1, 1), batch_size=3), (4, 0))
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(AttendanceArchive.objects.count(), 4)
+        self.assertEqual(self.summary_counts(self.day), (4, 0))
+
+    def test_pairs_already_archived_stay_live_and_are_reported(self):
+        self.archive(self.students[0], self.day, Attendance.ABSENT)
+        live = self.mark(self.students[0], self.day)
+        self.mark(self.students[1], self.day)
+        self.assertEqual(archive_attendance(date(2022, 1, 1), dry_run=True), (1, 1))
+        self.assertEqual(archive_attendance(date(2022, 1, 1)), (1, 1))
+        self.assertEqual(list(Attendance.objects.values_list("pk", flat=True)), [live.pk])
+        self.assertEqual(AttendanceArchive.objects.get(student=self.students[0]).status, Attendance.ABSENT)
+
+    def test_form_rejects_an_archived_student_and_date(self):
+        self.archive(self.students[0], self.day)
+        form = AttendanceForm(data={
+            "student": self.students[0].pk, "class_assigned": self.school_class.pk,
+            "date": self.day.isoformat(), "status": Attendance.PRESENT,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn("archived", form.non_field_errors()[0])
+
+    def test_roll_call_rejects_an_archived_date(self):
+        self.archive(self.students[0], self.day)
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+        data = {f"status_{student.pk}": Attendance.PRESENT for student in self.students}
+        query = f"?class_assigned={self.school_class.pk}&date={self.day.isoformat()}"
+        response = self.client.post(reverse("attendance-roll-call") + query, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("archived", response.context["form"].non_field_errors()[0])
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_import_skips_archived_pairs(self):
+        self.archive(self.students[0], self.day)
+        result = import_attendance(io.StringIO(
+            "date,username,status\n2021-09-01,student0,absent\n2021-09-01,student1,absent\n"
+        ))
+        self.assertEqual((result.imported, result.existing), (1, 1))
+        self.assertFalse(Attendance.objects.filter(student=self.students[0]).exists())
+        self.assertEqual(self.summary_counts(self.day), (1, 1))
+
+
+class RollCallTests(AttendanceTestData):
+    day = date(2024, 9, 2)
+
+    def setUp(self):
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+        self.url = (
+            f"{reverse('attendance-roll-call')}?class_assigned={self.school_class.pk}&date={self.day.isoformat()}"
+        )
+
+    def submit(self, absent=()):
+        data = {}
+        for student in self.students:
+            data[f"status_{student.pk}"] = Attendance.ABSENT if student in absent else Attendance.PRESENT
+            data[f"comments_{student.pk}"] = ""
+        return self.client.post(self.url, data)
+
+    def test_creates_then_updates_rows_and_the_summary(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.submit(absent=[self.students[0]])
+        self.assertLessEqual(len(queries), ROLL_CALL_MAX_QUERIES)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Attendance.objects.filter(date=self.day).count(), 4)
+        self.assertEqual(self.summary_counts(self.day), (3, 1))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.submit(absent=self.students[:2])
+        self.assertLessEqual(len(queries), ROLL_CALL_MAX_QUERIES)
+        self.assertEqual(Attendance.objects.filter(date=self.day).count(), 4)
+        self.assertEqual(self.summary_counts(self.day), (2, 2))
+
+    def test_rows_created_concurrently_are_overwritten(self):
+        # Another submission inserted a row after this one read the existing rows.
+        self.mark(self.students[0], self.day, Attendance.ABSENT)
+        with mock.patch.object(AttendanceRollCallView, "get_existing", return_value={}):
+            response = self.submit()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Attendance.objects.filter(date=self.day).count(), 4)
+        self.assertEqual(Attendance.objects.get(student=self.students[0]).status, Attendance.PRESENT)
+        self.assertEqual(self.summary_counts(self.day), (4, 0))
+
+
+class RemoveDuplicatesMigrationTests(TransactionTestCase):
+    """0005 keeps the newest row of each duplicated student and date before adding the constraint."""
+    migrate_from = [("attendance", "0004_initial")]
+    migrate_to = [("attendance", "0005_attendance_indexes_unique_student_date")]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.migrate_from)
+        self.apps = self.state_apps(self.migrate_from)
+
+    def state_apps(self, targets):
+        # The other apps stay fully migrated.
+        others = [node for node in self.executor.loader.graph.leaf_nodes() if node[0] != "attendance"]
+        return self.executor.loader.project_state(others + targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_keeps_the_newest_row_and_enforces_uniqueness(self):
+        User = self.apps.get_model("accounts", "CustomUser")
+        Student = self.apps.get_model("students", "Student")
+        Attendance = self.apps.get_model("attendance", "Attendance")
+        students = [
+            Student.objects.create(user=User.objects.create(username=f"student{index}"), age=15, address="Address")
+            for index in range(2)
+        ]
+        day = date(2024, 9, 2)
+        for status in ("Absent", "Absent", "Present"):
+            newest = Attendance.objects.create(student=students[0], date=day, status=status)
+        single = Attendance.objects.create(student=students[1], date=day, status="Absent")
+
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.migrate_to)
+        Attendance = self.state_apps(self.migrate_to).get_model("attendance", "Attendance")
+
+        self.assertEqual(
+            sorted(Attendance.objects.values_list("id", "status")),
+            sorted([(newest.id, "Present"), (single.id, "Absent")]),
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Attendance.objects.create(student_id=students[0].id, date=day, status="Absent")
+
+
+class AttendanceReportTests(AttendanceTestData):
+    def setUp(self):
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+        self.archive(self.students[0], date(2022, 9, 1), Attendance.ABSENT)
+        self.mark(self.students[0], date(2024, 9, 2))
+        self.mark(self.students[1], date(2024, 9, 2), Attendance.ABSENT)
+        self.period = {"start_date": "2022-01-01", "end_date": "2024-12-31"}
+
+    def test_pdf_lists_live_and_archived_rows_once_in_date_order(self):
+        drawn = []
+        draw_string = canvas.Canvas.drawString
+
+        def record(pdf, x, y, text, *args, **kwargs):
+            drawn.append((x, text))
+            return draw_string(pdf, x, y, text, *args, **kwargs)
+
+        with mock.patch.object(canvas.Canvas, "drawString", autospec=True, side_effect=record):
+            response = self.client.post(reverse("attendance-report"), self.period)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        dates = [text for x, text in drawn if x == 250][1:]  # After the "Date" header.
+        self.assertEqual(dates, ["2022-09-01", "2024-09-02", "2024-09-02"])
+
+    def test_csv_export_streams_the_header_and_every_row(self):
+        response = self.client.get(reverse("attendance-export"), self.period)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], AttendanceCSVExportView.header)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([(row[0], row[1], row[6]) for row in rows[1:]], [
+            ("2022-09-01", "student0", Attendance.ABSENT),
+            ("2024-09-02", "student0", Attendance.PRESENT),
+            ("2024-09-02", "student1", Attendance.ABSENT),
+        ])
+
+
+class AttendanceAnalyticsTests(AttendanceTestData):
+    start, end = date(2024, 8, 26), date(2024, 9, 15)
+
+    def setUp(self):
+        analytics_cache().clear()
+        # student0 over two school weeks; Saturday and Sunday are not recorded.
+        statuses = {
+            date(2024, 9, 2): Attendance.PRESENT,
+            date(2024, 9, 6): Attendance.ABSENT,
+            date(2024, 9, 9): Attendance.ABSENT,
+            date(2024, 9, 10): Attendance.ABSENT,
+            date(2024, 9, 11): Attendance.PRESENT,
+            date(2024, 9, 12): Attendance.ABSENT,
+        }
+        for day, status in statuses.items():
+            self.mark(self.students[0], day, status)
+        self.mark(self.students[1], date(2024, 9, 2))
+        self.archive(self.students[1], date(2024, 8, 30), Attendance.ABSENT)
+
+    def student(self, result, student):
+        return next(row for row in result["students"] if row["student_id"] == student.pk)
+
+    def test_streaks_run_across_weeks_and_trend_compares_the_last_two(self):
+        result = attendance_analytics(self.start, self.end)
+        stats = self.student(result, self.students[0])
+        self.assertEqual(stats["longest_absence_streak"], 3)
+        self.assertEqual(stats["previous_week_absence_rate"], 50.0)
+        self.assertEqual(stats["last_week_absence_rate"], 75.0)
+        self.assertEqual(stats["week_over_week_change"], 25.0)
+        self.assertEqual(stats["absence_rate"], 66.7)
+
+    def test_archived_rows_are_included(self):
+        result = attendance_analytics(self.start, self.end)
+        self.assertEqual(result["records"], 8)
+        stats = self.student(result, self.students[1])
+        self.assertEqual((stats["records"], stats["absences"], stats["longest_absence_streak"]), (2, 1, 1))
+        (class_row,) = result["classes"]
+        self.assertEqual((class_row["students"], class_row["records"], class_row["longest_absence_streak"]), (2, 8, 3))
+
+    def test_attendance_writes_invalidate_cached_results(self):
+        attendance_analytics(self.start, self.end)
+        with self.assertNumQueries(0):
+            attendance_analytics(self.start, self.end)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mark(self.students[2], date(2024, 9, 13), Attendance.ABSENT)
+        result = attendance_analytics(self.start, self.end)
+        self.assertEqual(result["records"], 9)
+        self.assertEqual(self.student(result, self.students[2])["absences"], 1)
+
+
+class GenerateAttendanceTests(AttendanceTestData):
+    def generate(self):
+        out = io.StringIO()
+        call_command("generate_attendance", "--full-rolls", "--start-date", "2024-09-02",
+                     "--end-date", "2024-09-08", "--seed", "1", "--batch-size", "5", stdout=out)
+        return out.getvalue()
+
+    def test_full_rolls_skip_recorded_and_archived_pairs(self):
+        self.archive(self.students[0], date(2024, 9, 2), Attendance.ABSENT)
+        self.mark(self.students[1], date(2024, 9, 3), Attendance.ABSENT)
+        # Six school days for four students, less the two pairs already recorded.
+        self.assertIn("Wrote 22 attendance rows", self.generate())
+        self.assertFalse(Attendance.objects.filter(student=self.students[0], date=date(2024, 9, 2)).exists())
+        self.assertEqual(Attendance.objects.get(student=self.students[1], date=date(2024, 9, 3)).status,
+                         Attendance.ABSENT)
+        self.assertEqual(sum(self.summary_counts(date(2024, 9, 2))), 4)
+        self.assertFalse(AttendanceDailySummary.objects.filter(date=date(2024, 9, 8)).exists())
+
+        self.assertIn("Wrote 0 attendance rows", self.generate())
+        self.assertEqual(Attendance.objects.count(), 23)
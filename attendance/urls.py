@@ -4,11 +4,21 @@ from .views import (
     AttendanceCreateView,
     AttendanceReportPDFView,
     AttendanceUpdateView,
+    AttendanceRollCallView,
+    AttendanceSummaryView,
+    AttendanceAnalyticsView,
+    AttendanceCSVExportView,
+    AttendanceImportView,
 )
 
 urlpatterns = [
     path("", AttendanceListView.as_view(), name="attendance-list"),
     path("create/", AttendanceCreateView.as_view(), name="attendance-create"),
+    path("roll-call/", AttendanceRollCallView.as_view(), name="attendance-roll-call"),
     path("update/<int:pk>/", AttendanceUpdateView.as_view(), name="attendance-update"),
     path("report/", AttendanceReportPDFView.as_view(), name="attendance-report"),
+    path("export/", AttendanceCSVExportView.as_view(), name="attendance-export"),
+    path("import/", AttendanceImportView.as_view(), name="attendance-import"),
+    path("summary/", AttendanceSummaryView.as_view(), name="attendance-summary"),
+    path("analytics/", AttendanceAnalyticsView.as_view(), name="attendance-analytics"),
 ]
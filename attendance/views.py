@@ -1,18 +1,74 @@
+import csv
+import io
+import itertools
+import tempfile
+
 from core.mixins import RoleRequiredMixin
-from django.views.generic import ListView, CreateView, UpdateView, FormView
-from django.urls import reverse_lazy
-from django.http import HttpResponse
+from core.pagination import KeysetPaginationMixin
+from django.contrib import messages
+from django.db import connections, transaction
+from django.db.models import Sum
+from django.shortcuts import redirect, render
+from django.views.generic import ListView, CreateView, UpdateView, FormView, View
+from django.urls import reverse, reverse_lazy
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.http import urlencode
 from reportlab.pdfgen import canvas
-from .models import Attendance
-from .forms import AttendanceForm, AttendanceReportForm
+from .models import Attendance, AttendanceDailySummary
+from .forms import AttendanceFilterForm, AttendanceForm, AttendanceImportForm, AttendanceReportForm, AttendanceSummaryFilterForm, RollCallForm, RollCallSelectForm
+from .summary import refresh_daily_summaries
+from .analytics import attendance_analytics, write_csv
+from .importer import AttendanceImportError, import_attendance
+from .archive import archived_pairs, merge_by_date, report_querysets
+
+class AttendanceListView(RoleRequiredMixin, KeysetPaginationMixin, ListView):
+    """
+    Filterable attendance list with keyset pagination on ``(-date, -id)``.
 
-class AttendanceListView(RoleRequiredMixin, ListView):
+    Student, teacher and class are joined into the page query, and pages are
+    fetched by seeking past the last row shown rather than with ``OFFSET``, so
+    deep pages cost the same as the first.
+    """
     model = Attendance
     template_name = "attendance/attendance_list.html"
     context_object_name = "attendances"
-    ordering = ["-date"]
+    # One direction throughout, so the ordering and the seek follow the
+    # (date, id) index backwards instead of needing a filesort.
+    ordering = ["-date", "-id"]
+    paginate_by = 50
     permission_required = "attendance.can_view_attendance"
 
+    def get_filter_form(self):
+        if not hasattr(self, "_filter_form"):
+            self._filter_form = AttendanceFilterForm(self.request.GET or None)
+        return self._filter_form
+
+    def get_queryset(self):
+        queryset = Attendance.objects.select_related(
+            "student__user", "teacher__user", "class_assigned"
+        )
+        form = self.get_filter_form()
+        if form.is_valid():
+            data = form.cleaned_data
+            if data["class_assigned"]:
+                queryset = queryset.filter(class_assigned=data["class_assigned"])
+            if data["student"]:
+                queryset = queryset.filter(student=data["student"])
+            if data["teacher"]:
+                queryset = queryset.filter(teacher=data["teacher"])
+            if data["status"]:
+                queryset = queryset.filter(status=data["status"])
+            if data["start_date"]:
+                queryset = queryset.filter(date__gte=data["start_date"])
+            if data["end_date"]:
+                queryset = queryset.filter(date__lte=data["end_date"])
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["filter_form"] = self.get_filter_form()
+        return context
+
 class AttendanceCreateView(RoleRequiredMixin, CreateView):
     model = Attendance
     form_class = AttendanceForm
@@ -38,21 +94,36 @@ class AttendanceReportPDFView(RoleRequiredMixin, FormView):
     form_class = AttendanceReportForm
     permission_required = "attendance.can_view_attendance"
 
+    # Reports up to this size stay in memory; larger ones spill to disk.
+    spool_max_size = 5 * 1024 * 1024
+    chunk_size = 2000
+
     def form_valid(self, form):
         start_date = form.cleaned_data["start_date"]
         end_date = form.cleaned_data["end_date"]
+        class_assigned = form.cleaned_data.get("class_assigned")
+        student = form.cleaned_data.get("student")
 
-        # Filter attendance records within the date range.
-        attendances = Attendance.objects.filter(date__range=[start_date, end_date]).order_by("date")
-
-        response = HttpResponse(content_type="application/pdf")
-        response["Content-Disposition"] = 'attachment; filename="attendance_report.pdf"'
+        # Attendance records within the date range, live and archived, in date order.
+        attendances = merge_by_date(
+            [
+                queryset.select_related("student__user").order_by("date", "id").iterator(chunk_size=self.chunk_size)
+                for queryset in report_querysets(start_date, end_date, class_assigned, student)
+            ],
+            key=lambda attendance: attendance.date,
+        )
 
-        p = canvas.Canvas(response)
+        output = tempfile.SpooledTemporaryFile(max_size=self.spool_max_size)
+        p = canvas.Canvas(output)
         p.setFont("Helvetica", 14)
         p.drawString(100, 800, "Attendance Report")
         p.setFont("Helvetica", 10)
-        p.drawString(100, 780, f"From: {start_date} To: {end_date}")
+        subtitle = f"From: {start_date} To: {end_date}"
+        if class_assigned:
+            subtitle += f"  Class: {class_assigned}"
+        if student:
+            subtitle += f"  Student: {student}"
+        p.drawString(100, 780, subtitle)
 
         # Draw table header.
         y = 750
@@ -64,6 +135,7 @@ class AttendanceReportPDFView(RoleRequiredMixin, FormView):
         for attendance in attendances:
             if y < 50:
                 p.showPage()
+                p.setFont("Helvetica", 10)
                 y = 800
             p.drawString(50, y, str(attendance.student))
             p.drawString(250, y, str(attendance.date))
@@ -72,4 +144,282 @@ class AttendanceReportPDFView(RoleRequiredMixin, FormView):
 
         p.showPage()
         p.save()
+        output.seek(0)
+        return FileResponse(
+            output, as_attachment=True, filename="attendance_report.pdf", content_type="application/pdf"
+        )
+
+class AttendanceRollCallView(RoleRequiredMixin, View):
+    """
+    Mark a whole class for one date.
+
+    Every student in the class is listed, defaulting to Present (or their
+    stored status). A submission creates the missing rows with one
+    ``bulk_create`` and rewrites changed rows with one ``bulk_update``, all
+    inside a single transaction. ``select_for_update`` cannot lock rows that
+    do not exist yet, so the insert is an upsert: a concurrent first
+    submission for the same class and date is overwritten instead of failing
+    on the unique constraint.
+    """
+    template_name = "attendance/attendance_roll_call.html"
+    allowed_roles = ["admin", "teacher"]
+    permission_required = "attendance.can_mark_attendance"
+
+    def get_selection(self):
+        select_form = RollCallSelectForm(self.request.GET or None)
+        if select_form.is_valid():
+            return select_form, select_form.cleaned_data["class_assigned"], select_form.cleaned_data["date"]
+        return select_form, None, None
+
+    def get_students(self, class_assigned):
+        return list(class_assigned.students.select_related("user").order_by("user__last_name", "user__first_name"))
+
+    def get_existing(self, class_assigned, date, students, for_update=False):
+        records = Attendance.objects.filter(date=date, student__in=[s.pk for s in students])
+        if for_update:
+            records = records.select_for_update()
+        return {record.student_id: record for record in records}
+
+    def upsert(self, records, teacher):
+        if not records:
+            return
+        options = {}
+        if connections[Attendance.objects.db].features.supports_update_conflicts_with_target:
+            options["unique_fields"] = ["student", "date"]  # MySQL infers it from the unique key.
+        update_fields = ["status", "comments", "class_assigned"] + (["teacher"] if teacher else [])
+        Attendance.objects.bulk_create(records, update_conflicts=True, update_fields=update_fields, **options)
+
+    def render_page(self, select_form, form=None, class_assigned=None, date=None):
+        return render(self.request, self.template_name, {
+            "select_form": select_form,
+            "form": form,
+            "class_assigned": class_assigned,
+            "date": date,
+        })
+
+    def get(self, request, *args, **kwargs):
+        select_form, class_assigned, date = self.get_selection()
+        form = None
+        if class_assigned:
+            students = self.get_students(class_assigned)
+            form = RollCallForm(students=students, existing=self.get_existing(class_assigned, date, students))
+        return self.render_page(select_form, form, class_assigned, date)
+
+    def post(self, request, *args, **kwargs):
+        select_form, class_assigned, date = self.get_selection()
+        if not class_assigned:
+            return self.render_page(select_form)
+
+        students = self.get_students(class_assigned)
+        form = RollCallForm(request.POST, students=students)
+        if not form.is_valid():
+            return self.render_page(select_form, form, class_assigned, date)
+
+        if archived_pairs((student.pk, date) for student in students):
+            form.add_error(None, f"Attendance for {date} has been archived and can no longer be changed.")
+            return self.render_page(select_form, form, class_assigned, date)
+
+        teacher = getattr(request.user, "teacher_profile", None)
+        marks = form.marks()
+        with transaction.atomic():
+            existing = self.get_existing(class_assigned, date, students, for_update=True)
+            to_create, to_update = [], []
+            for student in students:
+                status, comments = marks[student.pk]
+                record = existing.get(student.pk)
+                if record is None:
+                    to_create.append(Attendance(
+                        student=student,
+                        teacher=teacher,
+                        class_assigned=class_assigned,
+                        date=date,
+                        status=status,
+                        comments=comments,
+                    ))
+                elif (record.status, record.comments, record.class_assigned_id) != (
+                    status, comments, class_assigned.pk
+                ):
+                    record.status = status
+                    record.comments = comments
+                    record.class_assigned = class_assigned
+                    if teacher:
+                        record.teacher = teacher
+                    to_update.append(record)
+            self.upsert(to_create, teacher)
+            Attendance.objects.bulk_update(to_update, ["status", "comments", "class_assigned", "teacher"])
+            # Bulk writes send no signals, so refresh the daily summary here.
+            touched = {(class_assigned.pk, date)}
+            touched.update(record._loaded_summary_key for record in to_update)
+            refresh_daily_summaries(touched)
+
+        messages.success(
+            request,
+            f"Attendance saved for {class_assigned} on {date}: "
+            f"{len(to_create)} marked, {len(to_update)} updated.",
+        )
+        query = urlencode({"class_assigned": class_assigned.pk, "date": date.isoformat()})
+        return redirect(f"{reverse('attendance-roll-call')}?{query}")
+
+
+class AttendanceSummaryView(RoleRequiredMixin, ListView):
+    """Daily present/absent counts per class, read from the summary table."""
+    model = AttendanceDailySummary
+    template_name = "attendance/attendance_summary.html"
+    context_object_name = "summaries"
+    paginate_by = 50
+    allowed_roles = ["admin", "teacher"]
+    permission_required = "attendance.can_view_attendance"
+
+    def get_filter_form(self):
+        if not hasattr(self, "_filter_form"):
+            self._filter_form = AttendanceSummaryFilterForm(self.request.GET or None)
+        return self._filter_form
+
+    def get_queryset(self):
+        queryset = AttendanceDailySummary.objects.select_related("class_assigned")
+        form = self.get_filter_form()
+        if form.is_valid():
+            if form.cleaned_data["start_date"]:
+                queryset = queryset.filter(date__gte=form.cleaned_data["start_date"])
+            if form.cleaned_data["end_date"]:
+                queryset = queryset.filter(date__lte=form.cleaned_data["end_date"])
+            if form.cleaned_data["class_assigned"]:
+                queryset = queryset.filter(class_assigned=form.cleaned_data["class_assigned"])
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["filter_form"] = self.get_filter_form()
+        context["totals"] = self.object_list.aggregate(present=Sum("present_count"), absent=Sum("absent_count"))
+        query = self.request.GET.copy()
+        query.pop("page", None)
+        context["query_string"] = query.urlencode()
+        return context
+
+
+class AttendanceAnalyticsView(RoleRequiredMixin, View):
+    """
+    Absence rates, streaks and weekly trends as JSON (default) or CSV.
+
+    Takes the report form's fields as query parameters; ``scope=classes``
+    selects the per-class rows for CSV output.
+    """
+    allowed_roles = ["admin", "teacher"]
+    permission_required = "attendance.can_view_attendance"
+
+    def get(self, request, *args, **kwargs):
+        form = AttendanceReportForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        class_assigned = form.cleaned_data.get("class_assigned")
+        student = form.cleaned_data.get("student")
+        result = attendance_analytics(
+            form.cleaned_data["start_date"],
+            form.cleaned_data["end_date"],
+            class_id=class_assigned.pk if class_assigned else None,
+            student_id=student.pk if student else None,
+        )
+
+        if request.GET.get("format") == "csv":
+            scope = "classes" if request.GET.get("scope") == "classes" else "students"
+            response = HttpResponse(content_type="text/csv")
+            response["Content-Disposition"] = (
+                f'attachment; filename="attendance_analytics_{scope}_'
+                f'{result["start_date"]}_{result["end_date"]}.csv"'
+            )
+            write_csv(result[scope], response)
+            return response
+        return JsonResponse(result)
+
+
+class Echo:
+    """A file-like object that returns what it is asked to write, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+class AttendanceCSVExportView(RoleRequiredMixin, View):
+    """
+    Stream the report's attendance rows as CSV.
+
+    Rows come from ``values_list(...).iterator()`` and are written one at a
+    time into a ``StreamingHttpResponse``, so the download starts at once and
+    memory stays flat however long the range is.
+    """
+    permission_required = "attendance.can_view_attendance"
+    chunk_size = 2000
+    header = ["Date", "Username", "First Name", "Last Name", "Class", "Teacher", "Status", "Comments"]
+
+    def get(self, request, *args, **kwargs):
+        form = AttendanceReportForm(request.GET)
+        if not form.is_valid():
+            return HttpResponse(form.errors.as_text(), status=400, content_type="text/plain")
+
+        start_date = form.cleaned_data["start_date"]
+        end_date = form.cleaned_data["end_date"]
+        querysets = report_querysets(
+            start_date, end_date, form.cleaned_data.get("class_assigned"), form.cleaned_data.get("student")
+        )
+        rows = merge_by_date(
+            [
+                queryset.order_by("date", "id").values_list(
+                    "date",
+                    "student__user__username",
+                    "student__user__first_name",
+                    "student__user__last_name",
+                    "class_assigned__name",
+                    "teacher__user__username",
+                    "status",
+                    "comments",
+                ).iterator(chunk_size=self.chunk_size)
+                for queryset in querysets
+            ],
+            key=lambda row: row[0],
+        )
+
+        writer = csv.writer(Echo())
+        lines = itertools.chain([self.header], rows)
+        response = StreamingHttpResponse((writer.writerow(row) for row in lines), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="attendance_{start_date}_{end_date}.csv"'
         return response
+
+
+class AttendanceImportView(RoleRequiredMixin, FormView):
+    """Upload an attendance CSV; shows the import summary and rejected rows."""
+    template_name = "attendance/attendance_import.html"
+    form_class = AttendanceImportForm
+    permission_required = "attendance.can_mark_attendance"
+    max_rejected_shown = 200
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["file"]
+        text_stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            result = import_attendance(text_stream, dry_run=form.cleaned_data["dry_run"])
+        except AttendanceImportError as e:
+            form.add_error("file", str(e))
+            return self.form_invalid(form)
+
+        if not result.ok:
+            form.add_error("file", f"Missing columns: {', '.join(sorted(result.missing_columns))}.")
+            return self.form_invalid(form)
+
+        existing = (
+            f" {result.existing} rows were for a student and date already recorded and are left unchanged."
+            if result.existing else ""
+        )
+        if form.cleaned_data["dry_run"]:
+            messages.info(
+                self.request,
+                f"{result.valid} of {result.rows} rows are valid; {result.imported} would be imported."
+                f"{existing} Nothing was saved.",
+            )
+        else:
+            messages.success(self.request, f"Imported {result.imported} of {result.rows} rows.{existing}")
+        return self.render_to_response(self.get_context_data(
+            form=self.form_class(),
+            result=result,
+            rejected=result.rejected[:self.max_rejected_shown],
+        ))
@@ -0,0 +1,103 @@
+# core/autocomplete.py
+"""
+Typeahead JSON endpoints and the form widgets that use them.
+
+``AutocompleteView`` answers ``GET ?q=<term>`` with at most ``limit``
+``{"id": ..., "text": ...}`` pairs, cached for ``AUTOCOMPLETE_CACHE_TIMEOUT``
+seconds per term. ``AutocompleteSelect`` and ``AutocompleteSelectMultiple``
+render only the currently selected options; ``static/js/autocomplete.js``
+fills in the rest from the endpoint as the user types. Page size therefore
+no longer grows with the size of the table behind a field.
+"""
+import hashlib
+
+from django import forms
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views import View
+
+from .mixins import RoleRequiredMixin
+
+
+def autocomplete_cache():
+    return caches[getattr(settings, "AUTOCOMPLETE_CACHE_ALIAS", "default")]
+
+
+class AutocompleteView(RoleRequiredMixin, View):
+    """
+    Base typeahead endpoint. Subclasses set ``model`` and override
+    ``search(term)`` to return matching objects best first, and ``label(obj)``
+    for the text shown.
+    """
+    model = None
+    limit = 20
+    allowed_roles = ["admin", "teacher"]
+
+    def search(self, term):
+        raise NotImplementedError
+
+    def label(self, obj):
+        return str(obj)
+
+    def results(self, term):
+        return [{"id": obj.pk, "text": self.label(obj)} for obj in self.search(term)[:self.limit]]
+
+    def cache_key(self, term):
+        digest = hashlib.md5(term.encode()).hexdigest()
+        return f"autocomplete:{self.model._meta.label_lower}:{self.limit}:{digest}"
+
+    def get(self, request, *args, **kwargs):
+        term = " ".join(request.GET.get("q", "").split()).lower()
+        cache = autocomplete_cache()
+        key = self.cache_key(term)
+        results = cache.get(key)
+        if results is None:
+            results = self.results(term)
+            cache.set(key, results, getattr(settings, "AUTOCOMPLETE_CACHE_TIMEOUT", 60))
+        return JsonResponse({"results": results})
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    A ``<select>`` for a ``ModelChoiceField`` that renders only the selected
+    option (plus the empty label) and loads the others from ``url_name``.
+    """
+
+    def __init__(self, url_name, attrs=None):
+        self.url_name = url_name
+        super().__init__(attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(self.url_name)
+        return attrs
+
+    def selected_choices(self, value):
+        iterator = self.choices
+        field = getattr(iterator, "field", None)
+        if field is None:
+            return list(iterator)
+        selected = [item for item in value if item not in (None, "")]
+        choices = [("", field.empty_label)] if field.empty_label is not None and not self.allow_multiple_selected else []
+        if selected:
+            try:
+                queryset = iterator.queryset.filter(pk__in=selected)
+                choices.extend(iterator.choice(obj) for obj in queryset)
+            except (ValueError, TypeError, ValidationError):
+                pass
+        return choices
+
+    def optgroups(self, name, value, attrs=None):
+        all_choices = self.choices
+        self.choices = self.selected_choices(value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
+
+
+class AutocompleteSelectMultiple(AutocompleteSelect, forms.SelectMultiple):
+    """``AutocompleteSelect`` for a ``ModelMultipleChoiceField``."""
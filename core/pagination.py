@@ -0,0 +1,265 @@
+# core/pagination.py
+"""
+Keyset (seek) pagination for large, append-mostly tables.
+
+``Paginator`` counts the whole queryset and pages with ``OFFSET``, both of
+which grow with the table. ``KeysetPaginator`` instead remembers the sort key
+of the last row shown (the cursor) and fetches the next page with a
+``WHERE (key) > (cursor)`` predicate, which an index on the ordering columns
+answers in constant time at any depth. It does not know the total number of
+pages, only whether there is a next or previous one.
+
+The ordering must be total (end with a unique column such as ``id``) and its
+columns must not be NULL. Columns may follow relations (``user__last_name``)
+and mix directions (``("-date", "id")``).
+
+A total for "Page X of Y" is optional. With ``count_mode="approximate"`` an
+unfiltered table larger than ``exact_count_limit`` rows is sized from the
+database's table statistics instead of a ``COUNT(*)``.
+"""
+import base64
+import binascii
+import json
+import math
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = 10000
+
+
+def encode_cursor(values):
+    data = json.dumps(list(values), cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, fields):
+    """
+    Return the cursor's values converted with each of the model ``fields``'
+    ``to_python()``, or ``None`` if it is malformed or a value does not fit
+    its field.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, ValueError, TypeError):
+        return None
+    # Ordering columns are never NULL, and None is not a valid seek value.
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+def resolve_field(model, path):
+    """The model field at the end of a lookup path such as ``user__last_name``."""
+    *relations, name = path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def estimated_row_count(model, using="default"):
+    """
+    The row count of ``model``'s table from the database's statistics
+    (``information_schema`` on MySQL, ``pg_class.reltuples`` on PostgreSQL),
+    or ``None`` where there is no cheap estimate.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    # reltuples is -1 for a table that has never been analysed.
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous, number=1):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        # Carried in the links rather than derived, so only a display hint.
+        self.number = number
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return max(self.number - 1, 1)
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return encode_cursor(self.paginator.key_values(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return encode_cursor(self.paginator.key_values(self.object_list[0]))
+
+
+class KeysetPaginator:
+    """
+    Pages ``queryset`` ordered by ``ordering`` ``per_page`` rows at a time.
+
+    ``page(after=cursor)`` returns the rows following a page's
+    ``next_cursor``; ``page(before=cursor)`` the rows preceding a page's
+    ``previous_cursor``; neither returns the first page.
+
+    ``count`` and ``num_pages`` are only computed when read: exactly with
+    ``count_mode="exact"``, or from table statistics when ``"approximate"``
+    and the queryset is unfiltered and large (``count_is_estimate`` is then
+    true).
+    """
+
+    def __init__(self, queryset, ordering, per_page, count_mode="exact", exact_count_limit=EXACT_COUNT_LIMIT):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count_mode = count_mode
+        self.exact_count_limit = exact_count_limit
+        self._estimated = False
+        self.fields = [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    @cached_property
+    def count(self):
+        if self.count_mode == "approximate" and not self.queryset.query.has_filters():
+            estimate = estimated_row_count(self.queryset.model, self.queryset.db)
+            if estimate is not None and estimate >= self.exact_count_limit:
+                self._estimated = True
+                return estimate
+        return self.queryset.count()
+
+    @property
+    def count_is_estimate(self):
+        return self.count is not None and self._estimated
+
+    @property
+    def num_pages(self):
+        return max(math.ceil(self.count / self.per_page), 1)
+
+    @cached_property
+    def model_fields(self):
+        return [resolve_field(self.queryset.model, field) for field, _ in self.fields]
+
+    def key_values(self, obj):
+        values = []
+        for field, _ in self.fields:
+            value = obj
+            for part in field.split("__"):
+                value = getattr(value, part)
+            values.append(value)
+        return values
+
+    def _seek(self, values, forward):
+        """
+        Rows strictly after (or before) ``values`` in the ordering, as the
+        expanded form of a row comparison so mixed directions work:
+        ``a >= x AND (a > x OR (a = x AND b > y) OR ...)``. The redundant
+        leading bound gives the database an index range to scan.
+        """
+        condition = Q()
+        for index, (field, descending) in enumerate(self.fields):
+            lookup = "lt" if descending == forward else "gt"
+            term = Q(**{f"{field}__{lookup}": values[index]})
+            for prior, (prior_field, _) in enumerate(self.fields[:index]):
+                term &= Q(**{prior_field: values[prior]})
+            condition |= term
+        field, descending = self.fields[0]
+        lookup = "lte" if descending == forward else "gte"
+        return Q(**{f"{field}__{lookup}": values[0]}) & condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+
+    def page(self, after=None, before=None, number=1):
+        after_values = decode_cursor(after, self.model_fields) if after else None
+        before_values = decode_cursor(before, self.model_fields) if before else None
+
+        if before_values is not None:
+            rows = list(
+                self.queryset.filter(self._seek(before_values, forward=False))
+                .order_by(*self._reversed_ordering())[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return KeysetPage(rows, self, has_next=True, has_previous=has_previous,
+                              number=number if has_previous else 1)
+
+        queryset = self.queryset.order_by(*self.ordering)
+        if after_values is not None:
+            queryset = queryset.filter(self._seek(after_values, forward=True))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        has_previous = after_values is not None
+        return KeysetPage(rows[:self.per_page], self, has_next=has_next, has_previous=has_previous,
+                          number=number if has_previous else 1)
+
+
+class KeysetPaginationMixin:
+    """
+    ``ListView`` mixin paging with ``KeysetPaginator`` on ``get_ordering()``.
+
+    Reads ``after``/``before`` cursors and a ``page`` number hint from the
+    query string and adds ``query_string`` (the other GET parameters) to the
+    context for building the previous/next links.
+    """
+    count_mode = "exact"
+    exact_count_limit = EXACT_COUNT_LIMIT
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, self.get_ordering(), page_size,
+            count_mode=self.count_mode, exact_count_limit=self.exact_count_limit,
+        )
+        try:
+            number = max(int(self.request.GET.get("page", 1)), 1)
+        except ValueError:
+            number = 1
+        page = paginator.page(after=self.request.GET.get("after"), before=self.request.GET.get("before"), number=number)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        for name in ("after", "before", "page"):
+            query.pop(name, None)
+        context["query_string"] = query.urlencode()
+        return context
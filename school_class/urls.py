@@ -7,4 +7,5 @@ urlpatterns = [
     path("<int:pk>/", views.ClassDetailView.as_view(), name="class_detail"),
     path("<int:pk>/update/", views.ClassUpdateView.as_view(), name="class_update"),
     path("<int:pk>/delete/", views.ClassDeleteView.as_view(), name="class_delete"),
+    path("autocomplete/", views.ClassAutocompleteView.as_view(), name="class_autocomplete"),
 ]
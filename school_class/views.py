@@ -1,3 +1,4 @@
+from core.autocomplete import AutocompleteView
 from core.mixins import RoleRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import (
@@ -37,3 +38,10 @@ class ClassDeleteView(RoleRequiredMixin, DeleteView):
     model = Class
     template_name = "class/class_confirm_delete.html"
     success_url = reverse_lazy("class_list")
+
+
+class ClassAutocompleteView(AutocompleteView):
+    model = Class
+
+    def search(self, term):
+        return Class.objects.filter(name__icontains=term).order_by("name")
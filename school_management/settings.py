@@ -146,6 +146,71 @@ USE_TZ = True
 STATIC_URL = "static/"
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
 
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Timetable grids and attendance analytics use file-based caches so every
+# worker process on the host sees the same entries and the same
+# signal-driven invalidations.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "timetables": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, ".cache", "timetables"),
+        "TIMEOUT": None,
+    },
+    # Attendance analytics results, keyed on date range and filters.
+    "analytics": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, ".cache", "analytics"),
+        "TIMEOUT": 900,
+        "OPTIONS": {"MAX_ENTRIES": 200},
+    },
+    # Typeahead results (core/autocomplete.py), keyed on endpoint and term.
+    "autocomplete": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "autocomplete",
+        "TIMEOUT": 60,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+}
+TIMETABLE_CACHE_ALIAS = "timetables"
+AUTOCOMPLETE_CACHE_ALIAS = "autocomplete"
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+ATTENDANCE_ANALYTICS_CACHE_ALIAS = "analytics"
+ATTENDANCE_ANALYTICS_CACHE_TIMEOUT = 900
+
+# Attendance archival (attendance/archive.py, `manage.py archive_attendance`).
+# Academic years start on this "MM-DD"; the latest ATTENDANCE_LIVE_ACADEMIC_YEARS
+# years (including the current one) stay in the live Attendance table.
+ATTENDANCE_ACADEMIC_YEAR_START = "06-01"
+ATTENDANCE_LIVE_ACADEMIC_YEARS = 2
+
+# Seconds without a heartbeat before a running generation job counts as
+# abandoned by a crashed worker. The worker beats every quarter of this while
+# the solver runs, so it need not exceed MAX_TIME_IN_SECONDS.
+TIMETABLE_JOB_STALE_AFTER = 600
+
+# Timetable solver (time_tables/scheduler.py)
+# ENGINE is "boolean" (boolean assignment variables) or "element" (the original
+# integer formulation). Compare them with `manage.py benchmark_timetable_solver`.
+# The boolean engine minimises the weighted soft constraints until it proves
+# optimality or hits MAX_TIME_IN_SECONDS; set a weight to 0 to ignore a term.
+# MAX_DAILY_LESSONS_PER_ASSIGNMENT > 1 lets a subject move between days (still
+# once per school day on average), which gives the objective room to balance.
+TIMETABLE_SOLVER = {
+    "ENGINE": "boolean",
+    "MAX_TIME_IN_SECONDS": 60,
+    "NUM_SEARCH_WORKERS": 8,
+    "MAX_DAILY_LESSONS_PER_ASSIGNMENT": 1,
+    "OBJECTIVE_WEIGHTS": {
+        "TEACHER_GAPS": 2,
+        "SUBJECT_REPEATS": 5,
+        "TEACHER_LOAD_SPREAD": 1,
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
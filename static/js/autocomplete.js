@@ -0,0 +1,77 @@
+// Typeahead for <select data-autocomplete-url> (core/autocomplete.py).
+// The server renders only the selected options; the rest are fetched as
+// the user types in the search box placed above the select.
+(function () {
+    const DELAY = 250;
+
+    function setup(select) {
+        const url = select.dataset.autocompleteUrl;
+        const input = document.createElement('input');
+        input.type = 'search';
+        input.className = select.className + ' mb-1';
+        input.placeholder = 'Type to search...';
+        input.setAttribute('autocomplete', 'off');
+        input.setAttribute('aria-label', 'Search ' + (select.name || ''));
+        select.parentNode.insertBefore(input, select);
+        if (select.multiple && !select.size) {
+            select.size = 8;
+        }
+
+        let timer = null;
+        let controller = null;
+        let loaded = false;
+
+        function render(results) {
+            // Keep the selected options and the empty choice, replace the rest.
+            Array.from(select.options).forEach(option => {
+                if (!option.selected && option.value !== '') {
+                    option.remove();
+                }
+            });
+            const present = new Set(Array.from(select.options).map(option => option.value));
+            results.forEach(result => {
+                const value = String(result.id);
+                if (!present.has(value)) {
+                    select.add(new Option(result.text, value));
+                }
+            });
+        }
+
+        function load(term) {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            fetch(url + '?q=' + encodeURIComponent(term), {
+                signal: controller.signal,
+                credentials: 'same-origin',
+                headers: {'X-Requested-With': 'XMLHttpRequest'},
+            })
+                .then(response => response.ok ? response.json() : {results: []})
+                .then(data => render(data.results))
+                .catch(() => {});
+        }
+
+        input.addEventListener('input', () => {
+            loaded = true;
+            clearTimeout(timer);
+            timer = setTimeout(() => load(input.value.trim()), DELAY);
+        });
+        select.addEventListener('focus', () => {
+            if (!loaded) {
+                loaded = true;
+                load(input.value.trim());
+            }
+        });
+    }
+
+    function init() {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(setup);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
@@ -1,9 +1,11 @@
 from django import forms
+from django.db.models import Q
 from .models import Student
 from django.forms import ModelForm
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Fieldset, Div, ButtonHolder, Submit
 from accounts.models import CustomUser
+from core.autocomplete import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class StudentForm(ModelForm):
@@ -11,12 +13,12 @@ class StudentForm(ModelForm):
         model = Student
         fields = ['user', 'age', 'phone', 'address', 'class_obj', 'subjects']
         widgets = {
-            'user': forms.Select(attrs={'class': 'form-control'}),
+            'user': AutocompleteSelect('student_user_autocomplete', attrs={'class': 'form-control'}),
             'age': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Enter Age'}),
             'phone': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Enter Phone Number'}),
             'address': forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Enter Address'}),
-            'class_obj': forms.Select(attrs={'class': 'form-control'}),
-            'subjects': forms.CheckboxSelectMultiple(attrs={'class': 'form-control'}),
+            'class_obj': AutocompleteSelect('class_autocomplete', attrs={'class': 'form-control'}),
+            'subjects': AutocompleteSelectMultiple('subject_autocomplete', attrs={'class': 'form-control'}),
         }
         labels = {
             'user': 'Student (User)',
@@ -29,9 +31,9 @@ class StudentForm(ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Only show users not already linked to a student
+        # Only accept users not already linked to a student (or this one's own user)
         self.fields['user'].queryset = CustomUser.objects.filter(
-            student_profile__isnull=True
+            Q(student_profile__isnull=True) | Q(pk=self.instance.user_id)
         )
         self.helper = FormHelper()
         self.helper.form_class = 'form-horizontal'
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from students.search import rebuild_search_tokens
+
+
+class Command(BaseCommand):
+    help = "Rebuild the student search tokens from the current names and usernames."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Students read and tokens written per batch (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            written = rebuild_search_tokens(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} student search tokens."))
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:03
+
+import django.db.models.deletion
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalise(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def populate_search_tokens(apps, schema_editor):
+    # A frozen copy of students.search tokenisation at the time of this
+    # migration; `manage.py rebuild_student_search` applies later changes.
+    Student = apps.get_model("students", "Student")
+    StudentSearchToken = apps.get_model("students", "StudentSearchToken")
+    batch = []
+    rows = Student.objects.order_by("id").values_list("id", "user__first_name", "user__last_name", "user__username")
+    for student_id, first_name, last_name, username in rows.iterator(chunk_size=2000):
+        tokens = {
+            word[:64]
+            for text in (first_name, last_name, username)
+            for word in re.split(r"[\W_]+", _normalise(text))
+            if word
+        }
+        if username:
+            tokens.add(_normalise(username)[:64])
+        batch.extend(StudentSearchToken(student_id=student_id, token=token) for token in tokens)
+        if len(batch) >= 2000:
+            StudentSearchToken.objects.bulk_create(batch)
+            batch = []
+    StudentSearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_remove_student_first_name_remove_student_last_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=64)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='students.student')),
+            ],
+            options={
+                'unique_together': {('student', 'token')},
+            },
+        ),
+        migrations.RunPython(populate_search_tokens, migrations.RunPython.noop),
+    ]
@@ -46,11 +46,21 @@ class Student(models.Model):
         return self.user.get_full_name() or self.user.username
 
     def save(self, *args, **kwargs):
-        # Capitalize and save user names
-        self.user.first_name = self.user.first_name.strip().capitalize()
-        self.user.last_name = self.user.last_name.strip().capitalize()
-        self.user.save()  # Save user changes first
+        # Capitalize user names, writing the user only if that changed them
+        changed = self.user.normalize_names()
+        if self.user._state.adding:
+            self.user.save()
+        elif changed:
+            self.user.save(update_fields=changed)
         super().save(*args, **kwargs)
+        self._loaded_user_id = self.user_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the search-token signal skip saves that keep the same user.
+        instance._loaded_user_id = instance.__dict__.get("user_id")
+        return instance
 
     class Meta:
         verbose_name = "Student"
@@ -60,3 +70,20 @@ class Student(models.Model):
             ("can_view_student", "Can view student"),
             ("can_edit_student", "Can edit student"),
         ]
+
+
+class StudentSearchToken(models.Model):
+    """
+    Normalised name/username tokens for prefix search (``students.search``).
+
+    ``token LIKE 'abc%'`` is an index range scan, unlike ``icontains`` over
+    the user columns. Rows are kept in sync by ``students.signals``.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="search_tokens")
+    token = models.CharField(max_length=64, db_index=True)
+
+    class Meta:
+        unique_together = ("student", "token")
+
+    def __str__(self):
+        return f"{self.token} -> {self.student_id}"
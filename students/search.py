@@ -0,0 +1,154 @@
+# students/search.py
+"""
+Prefix search over student names and usernames.
+
+Each student has one ``StudentSearchToken`` row per normalised word of their
+first name, last name and username (lower-cased, accents stripped). A query
+is split the same way; a student matches when every query term is a prefix of
+one of their tokens, and students whose tokens equal the terms exactly rank
+first. Matching is a single grouped query over the ``token`` index.
+"""
+import re
+import unicodedata
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Max, Q, Value, When
+
+from .models import Student, StudentSearchToken
+
+TOKEN_MAX_LENGTH = 64
+MIN_TERM_LENGTH = 2
+# Ranked matches beyond this are not shown; refine the query instead.
+MAX_RESULTS = 1000
+
+_SPLIT = re.compile(r"[\W_]+")
+
+
+def normalise(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def tokenize(*texts):
+    """Distinct normalised words of ``texts``."""
+    tokens = set()
+    for text in texts:
+        for word in _SPLIT.split(normalise(text)):
+            if word:
+                tokens.add(word[:TOKEN_MAX_LENGTH])
+    return tokens
+
+
+def student_tokens(first_name, last_name, username):
+    tokens = tokenize(first_name, last_name, username)
+    # The username as typed also matches as one token (e.g. "john.smith").
+    if username:
+        tokens.add(normalise(username)[:TOKEN_MAX_LENGTH])
+    return tokens
+
+
+def refresh_search_tokens(student_ids):
+    """
+    Bring the tokens of ``student_ids`` in line with their current names,
+    inserting and deleting only the tokens that changed.
+    """
+    student_ids = list(student_ids)
+    if not student_ids:
+        return
+    wanted = {
+        student_id: student_tokens(first_name, last_name, username)
+        for student_id, first_name, last_name, username in Student.objects.filter(id__in=student_ids).values_list(
+            "id", "user__first_name", "user__last_name", "user__username"
+        )
+    }
+    existing = {}
+    for token_id, student_id, token in StudentSearchToken.objects.filter(student_id__in=student_ids).values_list(
+        "id", "student_id", "token"
+    ):
+        existing.setdefault(student_id, {})[token] = token_id
+
+    stale = [
+        token_id
+        for student_id, tokens in existing.items()
+        for token, token_id in tokens.items()
+        if token not in wanted.get(student_id, ())
+    ]
+    missing = [
+        StudentSearchToken(student_id=student_id, token=token)
+        for student_id, tokens in wanted.items()
+        for token in tokens
+        if token not in existing.get(student_id, {})
+    ]
+    with transaction.atomic():
+        if stale:
+            StudentSearchToken.objects.filter(id__in=stale).delete()
+        StudentSearchToken.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+def rebuild_search_tokens(batch_size=2000):
+    """
+    Recreate every student's tokens from scratch, ``batch_size`` students at
+    a time. Returns the number of tokens written.
+    """
+    written = 0
+    StudentSearchToken.objects.all().delete()
+    rows = Student.objects.order_by("id").values_list(
+        "id", "user__first_name", "user__last_name", "user__username"
+    )
+    batch = []
+    for student_id, first_name, last_name, username in rows.iterator(chunk_size=batch_size):
+        batch.extend(
+            StudentSearchToken(student_id=student_id, token=token)
+            for token in student_tokens(first_name, last_name, username)
+        )
+        if len(batch) >= batch_size:
+            StudentSearchToken.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    StudentSearchToken.objects.bulk_create(batch)
+    return written + len(batch)
+
+
+def search_terms(query):
+    terms = sorted(tokenize(query))
+    long_terms = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    # Single letters match too much of the table unless they are all there is.
+    return long_terms or terms
+
+
+def ranked_student_ids(query, limit=MAX_RESULTS):
+    """
+    Ids of students matching every term of ``query``, best match first:
+    most exact token matches, then id.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    per_term = {
+        f"term_{index}": Max(Case(When(token__startswith=term, then=Value(1)), default=Value(0),
+                                  output_field=IntegerField()))
+        for index, term in enumerate(terms)
+    }
+    rows = (
+        StudentSearchToken.objects.filter(reduce(or_, (Q(token__startswith=term) for term in terms)))
+        .values("student_id")
+        .annotate(exact=Count("id", filter=Q(token__in=terms)), **per_term)
+        .filter(**{name: 1 for name in per_term})
+        .order_by("-exact", "student_id")
+        .values_list("student_id", flat=True)[:limit]
+    )
+    return list(rows)
+
+
+def search_students(query, queryset=None, limit=MAX_RESULTS):
+    """``queryset`` (default: all students) narrowed to ``query``'s matches, in rank order."""
+    queryset = Student.objects.all() if queryset is None else queryset
+    ids = ranked_student_ids(query, limit=limit)
+    if not ids:
+        # Still annotated, so callers may order by ``search_rank``.
+        return queryset.annotate(search_rank=Value(0, output_field=IntegerField())).none()
+    rank = Case(*(When(pk=student_id, then=Value(position)) for position, student_id in enumerate(ids)),
+                output_field=IntegerField())
+    return queryset.filter(pk__in=ids).annotate(search_rank=rank).order_by("search_rank")
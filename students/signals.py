@@ -1,7 +1,9 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
+from accounts.models import CustomUser
 from .models import Student
+from .search import refresh_search_tokens
 from subjects.models import Subject
 
 @receiver(post_save, sender=Student)
@@ -17,3 +19,26 @@ def assign_subjects_to_student(sender, instance, created, **kwargs):
             subjects = Subject.objects.filter(name__in=subject_names)
             if subjects.exists():
                 instance.subjects.set(subjects)
+
+
+@receiver(post_save, sender=Student)
+def refresh_student_search_tokens(sender, instance, created, raw=False, **kwargs):
+    # Later saves only matter if they point the student at another user.
+    if raw or not (created or instance.user_id != getattr(instance, "_loaded_user_id", None)):
+        return
+    refresh_search_tokens([instance.pk])
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_user_search_tokens(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Names live on the user; a student's tokens follow their user's edits.
+    # post_save runs before the user re-snapshots its names, so unchanged
+    # names (e.g. a last_login update) skip the token queries entirely.
+    if raw or created:
+        return
+    if update_fields is not None and not set(update_fields) & set(CustomUser.TRACKED_NAME_FIELDS):
+        return
+    if not instance.changed_name_fields():
+        return
+    student_ids = list(Student.objects.filter(user_id=instance.pk).values_list("id", flat=True))
+    refresh_search_tokens(student_ids)
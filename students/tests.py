@@ -1,3 +1,149 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import CustomUser
+from attendance.forms import AttendanceForm
+from attendance.models import Attendance
+from core.autocomplete import autocomplete_cache
+from core.pagination import encode_cursor
+from school_class.models import Class
+from .forms import StudentForm
+from .models import Student
+from .views import StudentAutocompleteView
+
+# Session, user, COUNT for "Page X of Y" and the page itself.
+LIST_QUERIES = 4
+# Plus the ranked token match.
+SEARCH_QUERIES = 5
+
+
+class StudentListViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        school_class = Class.objects.create(name="Class 1")
+        for index in range(25):
+            user = CustomUser.objects.create(
+                username=f"student{index}", first_name=f"first{index}", last_name="last", role="student"
+            )
+            Student.objects.create(user=user, age=15, address="Address", class_obj=school_class)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_query_count_is_constant_per_page(self):
+        url = reverse("student_list")
+        with self.assertNumQueries(LIST_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["students"]), 10)
+        for number in (2, 3):
+            cursor = response.context["page_obj"].next_cursor
+            with self.assertNumQueries(LIST_QUERIES):
+                response = self.client.get(url, {"after": cursor, "page": number})
+        self.assertEqual(len(response.context["students"]), 5)
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_search_query_count_is_constant(self):
+        with self.assertNumQueries(SEARCH_QUERIES):
+            response = self.client.get(reverse("student_list"), {"name": "last"})
+        self.assertEqual(len(response.context["students"]), 10)
+
+    def test_rows_render_names_classes_and_total(self):
+        response = self.client.get(reverse("student_list"))
+        self.assertContains(response, "First0 Last")
+        self.assertContains(response, "Class 1")
+        self.assertEqual(response.context["page_obj"].paginator.count, 25)
+
+    def test_pages_follow_name_order(self):
+        url = reverse("student_list")
+        seen = []
+        response = self.client.get(url)
+        while True:
+            seen.extend(student.pk for student in response.context["students"])
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"after": page.next_cursor})
+        expected = Student.objects.order_by("user__last_name", "user__first_name", "user__id")
+        self.assertEqual(seen, list(expected.values_list("pk", flat=True)))
+
+    def test_cursor_with_a_non_integer_id_falls_back_to_the_first_page(self):
+        response = self.client.get(reverse("student_list"), {"after": encode_cursor(["last", "first0", "x"])})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["page_obj"].has_previous())
+
+
+class StudentSaveTests(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(username="pupil", first_name="ada", last_name="lovelace", role="student")
+        self.student = Student.objects.create(user=user, age=15, address="Address")
+
+    def test_unchanged_names_skip_the_user_update(self):
+        student = Student.objects.select_related("user").get(pk=self.student.pk)
+        student.age = 16
+        with self.assertNumQueries(1):
+            student.save()
+
+    def test_changed_names_are_normalised_and_saved(self):
+        student = Student.objects.select_related("user").get(pk=self.student.pk)
+        student.user.first_name = "  grace "
+        student.save()
+        self.assertEqual(CustomUser.objects.get(pk=student.user_id).first_name, "Grace")
+
+
+class StudentUserAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        cls.linked = CustomUser.objects.create(username="linked", first_name="Ann", last_name="Lee", role="student")
+        cls.free = CustomUser.objects.create(username="free", first_name="Ann", last_name="Low", role="student")
+        cls.student = Student.objects.create(user=cls.linked, age=15, address="Address")
+
+    def test_lists_only_users_without_a_student(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("student_user_autocomplete"), {"q": "ann"})
+        self.assertEqual(response.json()["results"], [{"id": self.free.pk, "text": "Ann Low (free)"}])
+
+    def test_form_renders_only_the_selected_user(self):
+        html = str(StudentForm(instance=self.student)["user"])
+        self.assertIn(f'value="{self.linked.pk}" selected', html)
+        self.assertNotIn(f'value="{self.free.pk}"', html)
+
+
+class StudentAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        cls.school_class = Class.objects.create(name="Class 1")
+        cls.students = [
+            Student.objects.create(
+                user=CustomUser.objects.create(username=f"pupil{index:02d}", first_name="Ada",
+                                               last_name=f"Byron{index:02d}", role="student"),
+                age=15, address="Address", class_obj=cls.school_class,
+            )
+            for index in range(25)
+        ]
+
+    def setUp(self):
+        autocomplete_cache().clear()
+
+    def test_students_may_not_search(self):
+        self.client.force_login(self.students[0].user)
+        self.assertEqual(self.client.get(reverse("student_autocomplete"), {"q": "ada"}).status_code, 403)
+
+    def test_ranked_results_are_capped_at_the_limit(self):
+        self.client.force_login(self.admin)
+        results = self.client.get(reverse("student_autocomplete"), {"q": "ada"}).json()["results"]
+        self.assertEqual(len(results), StudentAutocompleteView.limit)
+        results = self.client.get(reverse("student_autocomplete"), {"q": "byron07"}).json()["results"]
+        self.assertEqual(results, [{"id": self.students[7].pk, "text": "Ada Byron07 (pupil07)"}])
+
+    def test_widget_renders_only_the_selected_student(self):
+        record = Attendance.objects.create(student=self.students[3], class_assigned=self.school_class,
+                                           date="2024-09-02", status=Attendance.PRESENT)
+        # The selected student and its user for the label, not the whole table.
+        with self.assertNumQueries(2):
+            html = str(AttendanceForm(instance=record)["student"])
+        self.assertIn(f'data-autocomplete-url="{reverse("student_autocomplete")}"', html)
+        self.assertIn(f'<option value="{self.students[3].pk}" selected>Ada Byron03</option>', html)
+        self.assertEqual(html.count("<option"), 2)  # Plus the empty choice.
@@ -5,6 +5,8 @@ from .views import (
     StudentCreateView,
     StudentUpdateView,
     StudentDeleteView,
+    StudentAutocompleteView,
+    StudentUserAutocompleteView,
 )
 from .views import home
 urlpatterns = [
@@ -14,4 +16,6 @@ urlpatterns = [
     path("create/", StudentCreateView.as_view(), name="student_create"),
     path("<int:pk>/update/", StudentUpdateView.as_view(), name="student_update"),
     path("<int:pk>/delete/", StudentDeleteView.as_view(), name="student_delete"),
+    path("autocomplete/", StudentAutocompleteView.as_view(), name="student_autocomplete"),
+    path("autocomplete/users/", StudentUserAutocompleteView.as_view(), name="student_user_autocomplete"),
 ]
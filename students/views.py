@@ -1,8 +1,13 @@
+from core.autocomplete import AutocompleteView
 from core.mixins import RoleRequiredMixin
+from core.pagination import KeysetPaginationMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.db.models import Q
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from django.urls import reverse_lazy
+from accounts.models import CustomUser
 from .models import Student
+from .search import search_students
 from .forms import StudentForm
 
 from django.shortcuts import render
@@ -10,22 +15,35 @@ from django.shortcuts import render
 def home(request):
     return render(request, 'home.html')
 
-class StudentListView(RoleRequiredMixin, ListView):
+class StudentListView(RoleRequiredMixin, KeysetPaginationMixin, ListView):
     model = Student
     template_name = "students/student_list.html"
     context_object_name = "students"
     paginate_by = 10
+    # Pages seek on the accounts_user name index; see core/pagination.py.
+    ordering = ["user__last_name", "user__first_name", "user__id"]
+    count_mode = "approximate"
     allowed_roles = ['admin', 'teacher', 'student']  # Add appropriate roles
 
     def get_queryset(self):
-        search_query = self.request.GET.get('name', '')
-        if search_query:
-            return Student.objects.filter(
-                Q(user__first_name__icontains=search_query) |
-                Q(user__last_name__icontains=search_query) |
-                Q(user__username__icontains=search_query)
+        # One query per page: user and class are joined and the display name
+        # is built in SQL, so rendering a row touches no relation lazily.
+        queryset = Student.objects.select_related("user", "class_obj").annotate(
+            display_name=Coalesce(
+                NullIf(Trim(Concat("user__first_name", Value(" "), "user__last_name")), Value("")),
+                "user__username",
             )
-        return Student.objects.all()
+        )
+        search_query = self.request.GET.get('name', '').strip()
+        if search_query:
+            # Ranked prefix match on the token index (see students/search.py).
+            return search_students(search_query, queryset=queryset)
+        return queryset
+
+    def get_ordering(self):
+        if self.request.GET.get('name', '').strip():
+            return ["search_rank", "id"]
+        return super().get_ordering()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -70,3 +88,34 @@ class StudentDeleteView(RoleRequiredMixin, DeleteView):
     template_name = "students/student_confirm_delete.html"
     success_url = reverse_lazy("student_list")
     allowed_roles = ['admin']
+
+
+class StudentAutocompleteView(AutocompleteView):
+    """Typeahead over the search tokens, best match first."""
+    model = Student
+
+    def search(self, term):
+        queryset = Student.objects.select_related("user")
+        if term:
+            return search_students(term, queryset=queryset, limit=self.limit)
+        return queryset.order_by("user__last_name", "user__first_name", "user__id")
+
+    def label(self, student):
+        return f"{student} ({student.user.username})"
+
+
+class StudentUserAutocompleteView(AutocompleteView):
+    """Typeahead over users not yet linked to a student, for ``StudentForm.user``."""
+    model = CustomUser
+
+    def search(self, term):
+        queryset = CustomUser.objects.filter(student_profile__isnull=True).order_by("last_name", "first_name", "id")
+        for word in term.split():
+            queryset = queryset.filter(
+                Q(first_name__istartswith=word) | Q(last_name__istartswith=word) | Q(username__istartswith=word)
+            )
+        return queryset
+
+    def label(self, user):
+        name = user.get_full_name()
+        return f"{name} ({user.username})" if name else user.username
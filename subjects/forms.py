@@ -2,21 +2,22 @@ from django import forms
 from .models import Subject
 from school_class.models import Class
 from teachers.models import Teacher
+from core.autocomplete import AutocompleteSelectMultiple
 
 class SubjectForm(forms.ModelForm):
     classes = forms.ModelMultipleChoiceField(
         queryset=Class.objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple("class_autocomplete"),
         required=False,
         label="Classes",
-        help_text="Select classes for this subject.",
+        help_text="Type to search for classes to teach this subject in.",
     )
     teachers = forms.ModelMultipleChoiceField(
         queryset=Teacher.objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=AutocompleteSelectMultiple("teacher_autocomplete"),
         required=False,
         label="Teachers",
-        help_text="Select teachers for this subject.",
+        help_text="Type to search for teachers of this subject.",
     )
 
     class Meta:
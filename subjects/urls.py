@@ -8,4 +8,5 @@ urlpatterns = [
     path("create/", views.SubjectCreateView.as_view(), name="subject_create"),
     path("<int:pk>/update/", views.SubjectUpdateView.as_view(), name="subject_update"),
     path("<int:pk>/delete/", views.SubjectDeleteView.as_view(), name="subject_delete"),
+    path("autocomplete/", views.SubjectAutocompleteView.as_view(), name="subject_autocomplete"),
 ]
@@ -1,3 +1,4 @@
+from core.autocomplete import AutocompleteView
 from core.mixins import RoleRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
@@ -84,3 +85,10 @@ class SubjectDeleteView(RoleRequiredMixin, DeleteView):
     template_name = "subjects/subject_confirm_delete.html"
     context_object_name = "subject"
     success_url = reverse_lazy("subject_list")
+
+
+class SubjectAutocompleteView(AutocompleteView):
+    model = Subject
+
+    def search(self, term):
+        return Subject.objects.filter(name__icontains=term).order_by("name")
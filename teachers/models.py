@@ -46,8 +46,12 @@ class Teacher(models.Model):
         return self.user.get_full_name() or self.user.username
 
     def save(self, *args, **kwargs):
-        self.user.first_name = self.user.first_name.capitalize()
-        self.user.last_name = self.user.last_name.capitalize()
+        # Capitalize user names, writing the user only if that changed them
+        changed = self.user.normalize_names()
+        if self.user._state.adding:
+            self.user.save()
+        elif changed:
+            self.user.save(update_fields=changed)
         super().save(*args, **kwargs)
 
     class Meta:
@@ -1,3 +1,115 @@
+import hashlib
+
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from attendance.forms import AttendanceForm
+from attendance.models import Attendance
+from core.autocomplete import autocomplete_cache
+from school_class.models import Class
+from students.models import Student
+from .models import Teacher
+from .views import TeacherAutocompleteView
+
+# Session, user, COUNT for "Page X of Y" and the page itself.
+LIST_QUERIES = 4
+
+
+class TeacherListViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        for index in range(45):
+            user = CustomUser.objects.create(
+                username=f"teacher{index}", first_name=f"First{index}", last_name=f"Last{index % 3}", role="teacher"
+            )
+            Teacher.objects.create(user=user, age=30, address="Address")
+        cls.expected = list(
+            Teacher.objects.order_by("user__last_name", "user__first_name", "user__id").values_list("pk", flat=True)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def ids(self, response):
+        return [teacher.pk for teacher in response.context["teachers"]]
+
+    def test_query_count_is_constant_per_page(self):
+        url = reverse("teacher_list")
+        with self.assertNumQueries(LIST_QUERIES):
+            response = self.client.get(url)
+        for number in (2, 3):
+            cursor = response.context["page_obj"].next_cursor
+            with self.assertNumQueries(LIST_QUERIES):
+                response = self.client.get(url, {"after": cursor, "page": number})
+        self.assertEqual(len(response.context["teachers"]), 5)
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_next_and_previous_cursors_walk_the_name_order(self):
+        url = reverse("teacher_list")
+        first = self.client.get(url)
+        second = self.client.get(url, {"after": first.context["page_obj"].next_cursor})
+        third = self.client.get(url, {"after": second.context["page_obj"].next_cursor})
+        self.assertEqual(self.ids(first) + self.ids(second) + self.ids(third), self.expected)
+
+        back = self.client.get(url, {"before": third.context["page_obj"].previous_cursor})
+        self.assertEqual(self.ids(back), self.ids(second))
+        self.assertTrue(back.context["page_obj"].has_previous())
+        back = self.client.get(url, {"before": back.context["page_obj"].previous_cursor})
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertFalse(back.context["page_obj"].has_previous())
+
+
+class TeacherAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teachers = [
+            Teacher.objects.create(
+                user=CustomUser.objects.create(username=f"teacher{index:02d}", first_name="Ann",
+                                               last_name=f"Last{index:02d}", role="teacher"),
+                age=30, address="Address",
+            )
+            for index in range(25)
+        ]
+        cls.pupil = CustomUser.objects.create(username="pupil", role="student")
+
+    def setUp(self):
+        autocomplete_cache().clear()
+
+    def test_only_admins_and_teachers_may_search(self):
+        url = reverse("teacher_autocomplete")
+        self.assertRedirects(self.client.get(url), reverse("login"), fetch_redirect_response=False)
+        self.client.force_login(self.pupil)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.teachers[0].user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_results_are_capped_at_the_limit(self):
+        self.client.force_login(self.teachers[0].user)
+        results = self.client.get(reverse("teacher_autocomplete"), {"q": "ann"}).json()["results"]
+        self.assertEqual(len(results), TeacherAutocompleteView.limit)
+        self.assertEqual(results[0], {"id": self.teachers[0].pk, "text": "Ann Last00"})
+
+    def test_results_are_cached_per_normalised_term(self):
+        self.client.force_login(self.teachers[0].user)
+        url = reverse("teacher_autocomplete")
+        first = self.client.get(url, {"q": "Ann  last01"}).json()
+        key = f"autocomplete:teachers.teacher:20:{hashlib.md5(b'ann last01').hexdigest()}"
+        self.assertEqual(autocomplete_cache().get(key), first["results"])
+        # Only the session and user lookups; the results come from the cache.
+        with self.assertNumQueries(2):
+            again = self.client.get(url, {"q": " ann LAST01 "}).json()
+        self.assertEqual(again, first)
 
-# Create your tests here.
+    def test_widget_renders_only_the_selected_teacher(self):
+        student = Student.objects.create(user=self.pupil, age=15, address="Address")
+        record = Attendance.objects.create(student=student, teacher=self.teachers[3],
+                                           class_assigned=Class.objects.create(name="Class 1"),
+                                           date="2024-09-02", status=Attendance.PRESENT)
+        # The selected teacher and its user for the label, not the whole table.
+        with self.assertNumQueries(2):
+            html = str(AttendanceForm(instance=record)["teacher"])
+        self.assertIn(f'data-autocomplete-url="{reverse("teacher_autocomplete")}"', html)
+        self.assertIn(f'<option value="{self.teachers[3].pk}" selected>Ann Last03</option>', html)
+        self.assertEqual(html.count("<option"), 2)  # Plus the empty choice.
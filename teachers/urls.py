@@ -5,6 +5,7 @@ from .views import (
     TeacherDetailView,
     TeacherUpdateView,
     TeacherDeleteView,
+    TeacherAutocompleteView,
 )
 
 urlpatterns = [
@@ -13,4 +14,5 @@ urlpatterns = [
     path("create/", TeacherCreateView.as_view(), name="teacher_create"),
     path("<int:pk>/update/", TeacherUpdateView.as_view(), name="teacher_update"),
     path("<int:pk>/delete/", TeacherDeleteView.as_view(), name="teacher_delete"),
+    path("autocomplete/", TeacherAutocompleteView.as_view(), name="teacher_autocomplete"),
 ]
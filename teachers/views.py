@@ -1,17 +1,26 @@
+from core.autocomplete import AutocompleteView
 from core.mixins import RoleRequiredMixin
+from core.pagination import KeysetPaginationMixin
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.db.models import Q
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, DeleteView, DetailView, UpdateView
 from .models import Teacher
 from .forms import TeacherForm
 
-class TeacherListView(RoleRequiredMixin, PermissionRequiredMixin, ListView):
+class TeacherListView(RoleRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     model = Teacher
     template_name = "teachers/teacher_list.html"
     context_object_name = "teachers"
-    ordering = ["user__first_name"]
+    paginate_by = 20
+    # Pages seek on the accounts_user name index; see core/pagination.py.
+    ordering = ["user__last_name", "user__first_name", "user__id"]
+    count_mode = "approximate"
     permission_required = "teachers.can_view_teacher"
 
+    def get_queryset(self):
+        return Teacher.objects.select_related("user")
+
 class TeacherCreateView(RoleRequiredMixin, PermissionRequiredMixin, CreateView):
     model = Teacher
     form_class = TeacherForm
@@ -40,3 +49,18 @@ class TeacherDetailView(RoleRequiredMixin, PermissionRequiredMixin, DetailView):
     template_name = "teachers/teacher_detail.html"
     context_object_name = "teacher"
     permission_required = "teachers.can_view_teacher"
+
+
+class TeacherAutocompleteView(AutocompleteView):
+    """Typeahead on name and username prefixes (every word must match)."""
+    model = Teacher
+
+    def search(self, term):
+        queryset = Teacher.objects.select_related("user").order_by("user__last_name", "user__first_name", "user__id")
+        for word in term.split():
+            queryset = queryset.filter(
+                Q(user__first_name__istartswith=word)
+                | Q(user__last_name__istartswith=word)
+                | Q(user__username__istartswith=word)
+            )
+        return queryset
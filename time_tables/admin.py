@@ -1,5 +1,5 @@
 from django.contrib import admin
-from time_tables.models import TimeSlot, Timetable
+from time_tables.models import TimeSlot, Timetable, TimetableGenerationJob
 
 @admin.register(TimeSlot)
 class TimeSlotAdmin(admin.ModelAdmin):
@@ -12,3 +12,9 @@ class TimetableAdmin(admin.ModelAdmin):
     list_display = ('class_model', 'subject', 'teacher', 'time_slot', 'day_of_week')
     list_filter = ('day_of_week', 'class_model')
     ordering = ('day_of_week', 'time_slot__start_time')
+
+@admin.register(TimetableGenerationJob)
+class TimetableGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ('class_model', 'mode', 'status', 'progress', 'created_at', 'finished_at')
+    list_filter = ('status', 'mode')
+    ordering = ('-created_at',)
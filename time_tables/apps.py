@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TimeTablesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "time_tables"
+
+    def ready(self):
+        import time_tables.signals
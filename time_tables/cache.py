@@ -0,0 +1,90 @@
+# time_tables/cache.py
+"""
+Per-class cache of the weekly timetable grid (day -> time slot id -> cell).
+
+Timetables change a few times a term but are viewed constantly, so the grid is
+built from a single query and cached. ``time_tables.signals`` invalidates a
+class's grid when its ``Timetable`` rows change and every grid when a
+``TimeSlot``, ``Subject`` or ``Teacher`` changes or a teacher's user is
+renamed; bulk writes that bypass signals call ``invalidate_class_grids`` or
+``invalidate_all_grids`` directly.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import DAYS, Timetable
+
+VERSION_KEY = "timetable-grid:version"
+
+
+def _cache():
+    return caches[getattr(settings, "TIMETABLE_CACHE_ALIAS", "default")]
+
+
+def _version():
+    version = _cache().get(VERSION_KEY)
+    if version is None:
+        version = 1
+        _cache().add(VERSION_KEY, version, timeout=None)
+    return version
+
+
+def _grid_key(class_id):
+    return f"timetable-grid:{_version()}:{class_id}"
+
+
+def _break_display(ts):
+    return f"Break ({ts.start_time.strftime('%I:%M %p')} - {ts.end_time.strftime('%I:%M %p')})"
+
+
+def build_class_grid(class_id, all_timeslots, days=DAYS):
+    """Build ``{day: {timeslot_id: cell}}`` for a class from one query."""
+    entries = Timetable.objects.filter(class_model_id=class_id).select_related(
+        "subject", "teacher__user"
+    )
+    stored = {(entry.day_of_week, entry.time_slot_id): entry for entry in entries}
+
+    grid = {day: {} for day in days}
+    for ts in all_timeslots:
+        for day in days:
+            if ts.is_break:
+                grid[day][ts.id] = {"is_break": True, "display": _break_display(ts)}
+                continue
+            entry = stored.get((day, ts.id))
+            if entry is None:
+                continue
+            subject = entry.subject.name if entry.subject else ""
+            teacher = str(entry.teacher) if entry.teacher else ""
+            grid[day][ts.id] = {
+                "is_break": False,
+                "id": entry.id,
+                "subject_id": entry.subject_id,
+                "teacher_id": entry.teacher_id,
+                "subject": subject,
+                "teacher": teacher,
+                "display": f"{subject}<br/>{teacher}" if subject else "Free Period",
+            }
+    return grid
+
+
+def get_class_grid(class_id, all_timeslots):
+    """Return the cached grid for a class, building it on a miss."""
+    key = _grid_key(class_id)
+    grid = _cache().get(key)
+    if grid is None:
+        grid = build_class_grid(class_id, all_timeslots)
+        _cache().set(key, grid, timeout=getattr(settings, "TIMETABLE_CACHE_TIMEOUT", None))
+    return grid
+
+
+def invalidate_class_grids(class_ids):
+    """Drop the cached grids of the given classes."""
+    _cache().delete_many([_grid_key(class_id) for class_id in class_ids])
+
+
+def invalidate_all_grids():
+    """Drop every cached grid by moving to a new key version."""
+    try:
+        _cache().incr(VERSION_KEY)
+    except ValueError:
+        _cache().set(VERSION_KEY, 2, timeout=None)
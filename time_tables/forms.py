@@ -3,6 +3,7 @@ from .models import TimeSlot, Timetable
 from school_class.models import Class
 from subjects.models import Subject, ClassTeacherSubject
 from teachers.models import Teacher
+from core.autocomplete import AutocompleteSelect
 
 class TimeSlotForm(forms.ModelForm):
     class Meta:
@@ -23,12 +24,16 @@ class TimeSlotForm(forms.ModelForm):
         return cleaned_data
 
 class TimetableForm(forms.ModelForm):
-    class_model = forms.ModelChoiceField(queryset=Class.objects.all(), label="Class")
+    class_model = forms.ModelChoiceField(
+        queryset=Class.objects.all(), label="Class", widget=AutocompleteSelect("class_autocomplete")
+    )
     subject = forms.ModelChoiceField(
-        queryset=Subject.objects.all(), required=False, label="Subject"
+        queryset=Subject.objects.all(), required=False, label="Subject",
+        widget=AutocompleteSelect("subject_autocomplete"),
     )
     teacher = forms.ModelChoiceField(
-        queryset=Teacher.objects.all(), required=False, label="Teacher"
+        queryset=Teacher.objects.all(), required=False, label="Teacher",
+        widget=AutocompleteSelect("teacher_autocomplete"),
     )
     time_slot = forms.ModelChoiceField(queryset=TimeSlot.objects.all(), label="Time Slot")
     day_of_week = forms.ChoiceField(
@@ -59,13 +64,13 @@ class TimetableForm(forms.ModelForm):
                 raise forms.ValidationError(f"Teacher {teacher} is not assigned to teach {subject} in this class.")
             if Timetable.objects.filter(
                 class_model=class_model, time_slot=time_slot, day_of_week=day_of_week
-            ).exists():
+            ).exclude(pk=self.instance.pk).exists():
                 raise forms.ValidationError(
                     f"Class {class_model} already has a timetable entry at this time on {day_of_week}."
                 )
             if Timetable.objects.filter(
-                teacher=teacher, time_slot=time_slot, day_of_week=day_of_week
-            ).exists():
+                teacher=teacher, day_of_week=day_of_week, time_slot=time_slot
+            ).exclude(pk=self.instance.pk).exists():
                 raise forms.ValidationError(
                     f"Teacher {teacher} is already assigned to another class at this time."
                 )
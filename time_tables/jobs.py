@@ -0,0 +1,147 @@
+# time_tables/jobs.py
+"""
+Database-backed queue for timetable generation.
+
+Views enqueue a ``TimetableGenerationJob`` and return immediately; the
+``run_timetable_worker`` management command claims pending jobs and runs the
+solver in its own process, recording progress on the job row so the generate
+page can poll it.
+
+Every progress update is also a heartbeat, and a background thread keeps
+beating while the solver runs. A running job whose worker has been silent for
+``TIMETABLE_JOB_STALE_AFTER`` seconds (the worker crashed or was killed) is
+marked failed, so its target can be queued again.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import ngettext
+
+from .models import TimetableGenerationJob
+from .scheduler import generate_timetable
+
+logger = logging.getLogger(__name__)
+
+
+def _stale_after():
+    return getattr(settings, "TIMETABLE_JOB_STALE_AFTER", 600)
+
+
+def fail_stale_jobs():
+    """Fail running jobs without a recent heartbeat; returns how many."""
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=_stale_after())
+    return TimetableGenerationJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+        status=TimetableGenerationJob.STATUS_RUNNING,
+    ).update(
+        status=TimetableGenerationJob.STATUS_FAILED,
+        error="The worker running this job stopped responding.",
+        finished_at=now,
+    )
+
+
+def enqueue_generation(selected_class=None, user=None, mode=TimetableGenerationJob.MODE_FULL):
+    """
+    Queue a generation job for ``selected_class`` (or every class when it is
+    ``None``), reusing an unfinished job for the same target and mode.
+    """
+    fail_stale_jobs()
+    job = TimetableGenerationJob.objects.filter(
+        class_model=selected_class,
+        mode=mode,
+        status__in=[TimetableGenerationJob.STATUS_PENDING, TimetableGenerationJob.STATUS_RUNNING],
+    ).first()
+    if job:
+        return job
+    return TimetableGenerationJob.objects.create(
+        class_model=selected_class,
+        mode=mode,
+        requested_by=user if user and user.is_authenticated else None,
+        message="Waiting for a worker",
+    )
+
+
+def claim_next_job():
+    """
+    Atomically mark the oldest pending job as running and return it.
+
+    ``skip_locked`` lets several workers poll the same table without picking up
+    the same job.
+    """
+    fail_stale_jobs()
+    with transaction.atomic():
+        job = (
+            TimetableGenerationJob.objects.select_for_update(skip_locked=True)
+            .filter(status=TimetableGenerationJob.STATUS_PENDING)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = TimetableGenerationJob.STATUS_RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.message = "Starting"
+        job.save(update_fields=["status", "started_at", "heartbeat_at", "message"])
+    return job
+
+
+@contextmanager
+def heartbeat(job, interval=None):
+    """
+    Refresh ``job.heartbeat_at`` every ``interval`` seconds (a quarter of
+    ``TIMETABLE_JOB_STALE_AFTER`` by default) until the block exits, so a long
+    solve with no progress updates is not taken for a dead worker.
+    """
+    interval = interval or _stale_after() / 4
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                TimetableGenerationJob.objects.filter(
+                    pk=job.pk, status=TimetableGenerationJob.STATUS_RUNNING
+                ).update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"timetable-job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job):
+    """Run the solver for a claimed job and record the outcome on the job row."""
+    try:
+        with heartbeat(job):
+            result = generate_timetable(
+                job.class_model,
+                progress=job.set_progress,
+                incremental=job.mode == TimetableGenerationJob.MODE_INCREMENTAL,
+            )
+    except Exception as e:
+        logger.exception("Timetable job %s failed", job.pk)
+        job.mark_failed(e)
+    else:
+        saved = len(result["classes"])
+        if not saved:
+            job.mark_succeeded("All timetables are already up to date.", result)
+        elif job.class_model and saved == 1:
+            job.mark_succeeded("Timetable generated and saved successfully.", result)
+        else:
+            job.mark_succeeded(ngettext(
+                "Timetables generated and saved for %(count)d class.",
+                "Timetables generated and saved for %(count)d classes.",
+                saved,
+            ) % {"count": saved}, result)
+    return job
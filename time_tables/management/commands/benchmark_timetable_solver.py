@@ -0,0 +1,148 @@
+import math
+import random
+
+from django.core.management.base import BaseCommand
+
+from time_tables.scheduler import (
+    DAYS, DEFAULT_OBJECTIVE_WEIGHTS, SOLVER_ENGINES, free_period_teacher_id, solve_timetable,
+)
+
+
+def synthetic_school(n_classes, n_slots, lessons_per_class, rng):
+    """
+    Build ``{class_id: [assignment, ...]}`` for a made-up school.
+
+    Each class gets ``lessons_per_class`` teachers (padded with free periods up
+    to ``n_slots``) and no teacher has more than ``n_slots - 1`` classes, so
+    every generated school has a feasible timetable.
+    """
+    capacity = max(n_slots - 1, 1)
+    n_teachers = math.ceil(n_classes * lessons_per_class / capacity)
+    load = {teacher_id: 0 for teacher_id in range(1, n_teachers + 1)}
+
+    class_assignments = {}
+    for class_id in range(1, n_classes + 1):
+        available = [teacher_id for teacher_id, count in load.items() if count < capacity]
+        if len(available) < lessons_per_class:
+            # Top up the staff room rather than over-booking anyone.
+            for _ in range(lessons_per_class - len(available)):
+                teacher_id = len(load) + 1
+                load[teacher_id] = 0
+                available.append(teacher_id)
+        assignments = []
+        for subject_index, teacher_id in enumerate(rng.sample(available, lessons_per_class)):
+            load[teacher_id] += 1
+            assignments.append({
+                "subject_id": subject_index + 1,
+                "teacher_id": teacher_id,
+                "subject_name": f"Subject {subject_index + 1}",
+                "teacher_name": f"teacher{teacher_id}",
+                "is_free": False,
+            })
+        for i in range(n_slots - lessons_per_class):
+            assignments.append({
+                "subject_id": 0,
+                "teacher_id": free_period_teacher_id(class_id, i, n_slots),
+                "subject_name": "Free Period",
+                "teacher_name": "N/A",
+                "is_free": True,
+            })
+        class_assignments[class_id] = assignments
+    return class_assignments
+
+
+def _fmt(value):
+    if value is None:
+        return "--"
+    return f"{value:g}"
+
+
+class Command(BaseCommand):
+    help = "Compare timetable solver engines on synthetic schools of different sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--classes",
+            type=int,
+            nargs="+",
+            default=[10, 50, 200],
+            help="School sizes (number of classes) to benchmark (default: 10 50 200).",
+        )
+        parser.add_argument(
+            "--engines",
+            nargs="+",
+            choices=sorted(SOLVER_ENGINES),
+            default=["element", "boolean"],
+            help="Solver engines to compare (default: element boolean).",
+        )
+        parser.add_argument(
+            "--slots",
+            type=int,
+            default=6,
+            help="Lesson slots per day (default: 6).",
+        )
+        parser.add_argument(
+            "--lessons",
+            type=int,
+            default=5,
+            help="Teacher/subject assignments per class; the rest are free periods (default: 5).",
+        )
+        parser.add_argument(
+            "--time-limit",
+            type=float,
+            default=60.0,
+            help="max_time_in_seconds for each solve (default: 60).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="num_search_workers for each solve (default: 8).",
+        )
+        parser.add_argument(
+            "--objective",
+            action="store_true",
+            help="Let the boolean engine optimise the soft constraints until the time limit. "
+                 "The element engine has no objective, so this is no longer a like-for-like "
+                 "comparison (default: pure feasibility solves for every engine).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the synthetic schools (default: 0).",
+        )
+
+    def handle(self, *args, **options):
+        if options["lessons"] > options["slots"]:
+            self.stdout.write(self.style.ERROR("--lessons cannot be greater than --slots."))
+            return
+
+        objective_weights = None
+        if not options["objective"]:
+            objective_weights = {name: 0 for name in DEFAULT_OBJECTIVE_WEIGHTS}
+
+        self.stdout.write(
+            f"{'Classes':>8}  {'Engine':<8}  {'Status':<10}  {'Wall time (s)':>13}  "
+            f"{'Objective':>10}  {'Bound':>10}  {'Gaps':>6}  {'Repeats':>7}"
+        )
+        for n_classes in options["classes"]:
+            rng = random.Random(options["seed"])
+            class_assignments = synthetic_school(n_classes, options["slots"], options["lessons"], rng)
+            for engine in options["engines"]:
+                result = solve_timetable(
+                    class_assignments,
+                    options["slots"],
+                    days=DAYS,
+                    engine=engine,
+                    max_time_in_seconds=options["time_limit"],
+                    num_search_workers=options["workers"],
+                    objective_weights=objective_weights,
+                )
+                style = self.style.SUCCESS if result["values"] is not None else self.style.WARNING
+                metrics = result["metrics"]
+                self.stdout.write(style(
+                    f"{n_classes:>8}  {engine:<8}  {result['status']:<10}  {result['wall_time']:>13.3f}  "
+                    f"{_fmt(result['objective']):>10}  {_fmt(result['best_bound']):>10}  "
+                    f"{_fmt(metrics.get('teacher_gaps')):>6}  {_fmt(metrics.get('subject_repeats')):>7}"
+                ))
@@ -1,20 +1,36 @@
+import random
+import time as timer
+from collections import defaultdict
+from datetime import time
+
 from django.core.management.base import BaseCommand
-from time_tables.models import Timetable, TimeSlot
+
 from school_class.models import Class
-from subjects.models import Subject, ClassTeacherSubject
-from teachers.models import Teacher
-from datetime import time
-from django.db import transaction, IntegrityError
-from django.core.exceptions import ValidationError
-import random
+from subjects.models import ClassTeacherSubject
+from time_tables.models import DAYS, TimeSlot
+from time_tables.scheduler import save_timetables
+
 
 class Command(BaseCommand):
     help = "Generate timetables and time slots based on existing classes, subjects, and teachers."
 
-    def handle(self, *args, **kwargs):
-        self.create_time_slots()
-        self.generate_timetables()
-        self.stdout.write(self.style.SUCCESS("Successfully generated timetables and time slots."))
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; the same seed and data always give the same timetable (default: 0).",
+        )
+        parser.add_argument(
+            "--skip-time-slots",
+            action="store_true",
+            help="Use the existing time slots instead of creating the predefined ones.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["skip_time_slots"]:
+            self.create_time_slots()
+        self.generate_timetables(random.Random(options["seed"]))
 
     def create_time_slots(self):
         """
@@ -38,140 +54,79 @@ class Command(BaseCommand):
                 is_break=slot["is_break"]
             )
 
-    def generate_timetables(self):
-        """
-        Generate timetable entries ensuring unique constraints and proper assignments.
+    def generate_timetables(self, rng):
         """
-        days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-
-        # Define class and subject mappings
-        class_subject_mapping = {
-            "12th Science A Groups": [
-                "Mathematics",
-                "Chemistry",
-                "English",
-                "Physics",
-                "Computer",
-            ],
-            "12th Science B Groups": [
-                "Biology",
-                "Chemistry",
-                "English",
-                "Physics",
-                "Computer",
-            ],
-        }
-
-        # Fetch classes and their subjects
-        classes = {}
-        for class_name, subject_names in class_subject_mapping.items():
-            class_obj = Class.objects.filter(name=class_name).first()
-            if not class_obj:
-                self.stdout.write(self.style.ERROR(f'Class "{class_name}" does not exist. Please create it first.'))
-                continue
-            subjects = Subject.objects.filter(name__in=subject_names)
-            if subjects.count() != len(subject_names):
-                missing_subjects = set(subject_names) - set(subjects.values_list('name', flat=True))
-                self.stdout.write(self.style.ERROR(f'Missing subjects for class "{class_name}": {", ".join(missing_subjects)}. Please create them first.'))
-                continue
-            classes[class_obj] = list(subjects)
+        Greedily fill every lesson slot of every class that has teacher/subject
+        assignments, then replace their timetables with one ``bulk_create``.
 
-        if not classes:
-            self.stdout.write(self.style.ERROR('No valid classes found.'))
+        Teacher availability lives in an in-memory set, so the only queries are
+        the initial loads and the final write. Within a slot the most
+        constrained class picks first, and each class prefers the subject it has
+        had least often that day, then that week.
+        """
+        started = timer.perf_counter()
+        all_timeslots = list(TimeSlot.objects.all().order_by("start_time"))
+        lesson_timeslots = [ts for ts in all_timeslots if not ts.is_break]
+        if not lesson_timeslots:
+            self.stdout.write(self.style.ERROR("No lesson time slots found. Please create time slots first."))
             return
 
-        # Fetch time slots
-        time_slots = TimeSlot.objects.all().order_by('start_time')
-        break_time_slots = time_slots.filter(is_break=True)
-        teaching_time_slots = time_slots.filter(is_break=False)
-
-        # Fetch teachers and their qualifications
-        teachers = Teacher.objects.all()
-        if not teachers.exists():
-            self.stdout.write(self.style.ERROR('No teachers found. Please create teachers first.'))
+        assignments = defaultdict(list)
+        for class_id, subject_id, teacher_id in ClassTeacherSubject.objects.order_by(
+            "class_obj_id", "id"
+        ).values_list("class_obj_id", "subject_id", "teacher_id"):
+            assignments[class_id].append({"subject_id": subject_id, "teacher_id": teacher_id})
+        classes = list(Class.objects.filter(id__in=assignments).order_by("name"))
+        if not classes:
+            self.stdout.write(self.style.ERROR("No classes have teacher/subject assignments."))
             return
 
-        # Build a mapping of subjects to their qualified teachers
-        subject_teacher_map = {}
-        for subject in Subject.objects.all():
-            qualified_teachers = Teacher.objects.filter(
-                teacher_class_subjects__subject=subject
-            ).distinct()
-            subject_teacher_map[subject] = list(qualified_teachers)
-
-        # Generate timetables for each class
-        for class_obj, class_subjects in classes.items():
-            self.stdout.write(self.style.SUCCESS(f'Generating timetable for class "{class_obj.name}"'))
-            for day in days_of_week:
-                # Shuffle subjects to vary the schedule
-                subjects_cycle = class_subjects.copy()
-                random.shuffle(subjects_cycle)
-                subject_index = 0
-
-                for time_slot in time_slots:
-                    # Handle break time slots
-                    if time_slot.is_break:
-                        # Create break entry
-                        try:
-                            Timetable.objects.create(
-                                class_model=class_obj,
-                                subject=None,
-                                teacher=None,
-                                time_slot=time_slot,
-                                day_of_week=day
-                            )
-                            self.stdout.write(
-                                self.style.SUCCESS(
-                                    f'Added break for "{class_obj.name}" at {time_slot} on {day}.'
-                                )
-                            )
-                        except Exception as e:
-                            self.stderr.write(self.style.ERROR(f"Error creating break entry: {e}"))
+        busy = set()  # (teacher_id, day, timeslot_id)
+        weekly = defaultdict(int)  # (class_id, subject_id) -> lessons this week
+        solution = {cls.id: {day: {} for day in DAYS} for cls in classes}
+        placed = holes = 0
+
+        for day in DAYS:
+            daily = defaultdict(int)  # (class_id, subject_id) -> lessons today
+            for ts in all_timeslots:
+                if ts.is_break:
+                    for cls in classes:
+                        solution[cls.id][day][ts.id] = {"is_break": True, "subject_id": None, "teacher_id": None}
+                    continue
+
+                candidates = {
+                    cls.id: [a for a in assignments[cls.id] if (a["teacher_id"], day, ts.id) not in busy]
+                    for cls in classes
+                }
+                order = sorted(classes, key=lambda cls: (len(candidates[cls.id]), rng.random()))
+                for cls in order:
+                    available = [a for a in candidates[cls.id] if (a["teacher_id"], day, ts.id) not in busy]
+                    if not available:
+                        holes += 1
+                        solution[cls.id][day][ts.id] = {"is_break": False, "subject_id": None, "teacher_id": None}
                         continue
-
-                    # Get the next subject in the cycle
-                    subject = subjects_cycle[subject_index % len(subjects_cycle)]
-                    subject_index += 1
-
-                    # Get teachers qualified to teach this subject in this class
-                    qualified_teachers = Teacher.objects.filter(
-                        teacher_class_subjects__class_obj=class_obj,
-                        teacher_class_subjects__subject=subject
-                    ).distinct()
-
-                    # Exclude teachers already scheduled at this time slot
-                    available_teachers = qualified_teachers.exclude(
-                        timetables__day_of_week=day,
-                        timetables__time_slot=time_slot
-                    )
-
-                    if not available_teachers.exists():
-                        self.stdout.write(self.style.WARNING(
-                            f'No available teachers for subject "{subject.name}" in class "{class_obj.name}" at {time_slot} on {day}.'
-                        ))
-                        continue
-
-                    # Select a teacher
-                    teacher = random.choice(list(available_teachers))
-
-                    # Create the timetable entry
-                    try:
-                        with transaction.atomic():
-                            tt_entry = Timetable.objects.create(
-                                class_model=class_obj,
-                                subject=subject,
-                                teacher=teacher,
-                                time_slot=time_slot,
-                                day_of_week=day
-                            )
-                            self.stdout.write(self.style.SUCCESS(
-                                f'Assigned "{subject.name}" to "{class_obj.name}" with teacher "{teacher.name}" at {time_slot} on {day}.'
-                            ))
-                    except ValidationError as ve:
-                        self.stderr.write(self.style.ERROR(f"Validation error: {ve.messages}"))
-                    except IntegrityError as ie:
-                        self.stderr.write(self.style.ERROR(f"Integrity error: {ie}"))
-                    except Exception as e:
-                        self.stderr.write(self.style.ERROR(f"Error creating timetable entry: {e}"))
-
-        self.stdout.write(self.style.SUCCESS("Timetable generation complete."))
+                    choice = min(available, key=lambda a: (
+                        daily[cls.id, a["subject_id"]], weekly[cls.id, a["subject_id"]], rng.random()
+                    ))
+                    busy.add((choice["teacher_id"], day, ts.id))
+                    daily[cls.id, choice["subject_id"]] += 1
+                    weekly[cls.id, choice["subject_id"]] += 1
+                    placed += 1
+                    solution[cls.id][day][ts.id] = {
+                        "is_break": False,
+                        "subject_id": choice["subject_id"],
+                        "teacher_id": choice["teacher_id"],
+                    }
+
+        save_timetables(classes, solution, all_timeslots)
+
+        elapsed = timer.perf_counter() - started
+        total = len(classes) * len(lesson_timeslots) * len(DAYS)
+        self.stdout.write(self.style.SUCCESS(
+            f"Scheduled {placed} of {total} lessons for {len(classes)} classes "
+            f"across {len(DAYS)} days in {elapsed:.2f}s."
+        ))
+        if holes:
+            self.stdout.write(self.style.WARNING(
+                f"{holes} slots were left as free periods because every qualified teacher was busy."
+            ))
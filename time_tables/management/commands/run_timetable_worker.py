@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from time_tables.jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued timetable generation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the pending jobs and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty (default: 2).",
+        )
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        poll_interval = options["poll_interval"]
+
+        self.stdout.write(self.style.SUCCESS("Timetable worker started."))
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"Running job #{job.pk} for {job.target_name}...")
+            run_job(job)
+            if job.status == job.STATUS_SUCCEEDED:
+                self.stdout.write(self.style.SUCCESS(f"Job #{job.pk} finished."))
+            else:
+                self.stdout.write(self.style.ERROR(f"Job #{job.pk} failed: {job.error}"))
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_class', '0002_initial'),
+        ('time_tables', '0002_timetablegenerationjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timetablegenerationjob',
+            name='class_model',
+            field=models.ForeignKey(blank=True, help_text='Class to regenerate; empty means every class.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timetable_jobs', to='school_class.class'),
+        ),
+    ]
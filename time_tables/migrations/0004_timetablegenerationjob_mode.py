@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('time_tables', '0003_alter_timetablegenerationjob_class_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='mode',
+            field=models.CharField(choices=[('full', 'Full re-solve'), ('incremental', 'Re-solve changed classes only')], default='full', max_length=20),
+        ),
+    ]
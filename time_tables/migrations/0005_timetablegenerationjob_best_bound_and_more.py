@@ -0,0 +1,38 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('time_tables', '0004_timetablegenerationjob_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='best_bound',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='metrics',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='objective_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='solve_time',
+            field=models.FloatField(blank=True, help_text='Solver wall time in seconds.', null=True),
+        ),
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='solver_status',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
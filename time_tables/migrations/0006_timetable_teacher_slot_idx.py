@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school_class', '0002_initial'),
+        ('subjects', '0002_initial'),
+        ('teachers', '0001_initial'),
+        ('time_tables', '0005_timetablegenerationjob_best_bound_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['teacher', 'day_of_week', 'time_slot'], name='timetable_teacher_slot_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('time_tables', '0006_timetable_teacher_slot_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timetablegenerationjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last sign of life from the worker running the job.', null=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from school_class.models import Class
 from subjects.models import Subject, ClassTeacherSubject
 from teachers.models import Teacher
@@ -55,6 +57,10 @@ class Timetable(models.Model):
     class Meta:
         unique_together = ("class_model", "time_slot", "day_of_week")
         ordering = ["day_of_week", "time_slot__start_time"]
+        indexes = [
+            # Serves teacher timetables and the teacher-overlap check in clean().
+            models.Index(fields=["teacher", "day_of_week", "time_slot"], name="timetable_teacher_slot_idx"),
+        ]
         permissions = [
             ("can_view_timetable", "Can view timetable"),
             ("can_edit_timetable", "Can edit timetable"),
@@ -64,8 +70,8 @@ class Timetable(models.Model):
         if not self.time_slot.is_break:
             overlapping_teachers = Timetable.objects.filter(
                 teacher=self.teacher,
-                time_slot=self.time_slot,
                 day_of_week=self.day_of_week,
+                time_slot=self.time_slot,
             ).exclude(pk=self.pk)
             if overlapping_teachers.exists():
                 raise ValidationError(
@@ -107,3 +113,115 @@ class Timetable(models.Model):
         if self.time_slot.is_break:
             return f"{self.day_of_week} - {self.time_slot} (Break)"
         return f"{self.class_model.name} - {self.subject.name} by {self.teacher.user.get_full_name()} on {self.day_of_week} at {self.time_slot}"
+
+
+DAYS = [day for day, _ in Timetable.DAYS_OF_WEEK_CHOICES]
+
+
+class TimetableGenerationJob(models.Model):
+    """
+    A queued timetable generation request.
+
+    The table doubles as the work queue: ``run_timetable_worker`` claims pending
+    rows and runs the CP-SAT solver outside the HTTP request.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    MODE_FULL = "full"
+    MODE_INCREMENTAL = "incremental"
+    MODE_CHOICES = [
+        (MODE_FULL, "Full re-solve"),
+        (MODE_INCREMENTAL, "Re-solve changed classes only"),
+    ]
+
+    class_model = models.ForeignKey(
+        Class,
+        on_delete=models.CASCADE,
+        related_name="timetable_jobs",
+        null=True,
+        blank=True,
+        help_text="Class to regenerate; empty means every class.",
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="timetable_jobs",
+    )
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default=MODE_FULL)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    progress = models.PositiveSmallIntegerField(default=0)
+    message = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    solver_status = models.CharField(max_length=20, blank=True)
+    objective_value = models.FloatField(null=True, blank=True)
+    best_bound = models.FloatField(null=True, blank=True)
+    solve_time = models.FloatField(null=True, blank=True, help_text="Solver wall time in seconds.")
+    metrics = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last sign of life from the worker running the job."
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def set_progress(self, progress, message=""):
+        self.progress = progress
+        self.message = message
+        self.heartbeat_at = timezone.now()
+        self.save(update_fields=["progress", "message", "heartbeat_at"])
+
+    def _finish(self, **fields):
+        """
+        Record the outcome only if the job is still running, so a job already
+        failed as stale is not flipped back. Returns whether it was recorded;
+        otherwise the instance is reloaded with the stored outcome.
+        """
+        fields["finished_at"] = timezone.now()
+        updated = type(self).objects.filter(pk=self.pk, status=self.STATUS_RUNNING).update(**fields)
+        if updated:
+            for name, value in fields.items():
+                setattr(self, name, value)
+        else:
+            self.refresh_from_db()
+        return bool(updated)
+
+    def mark_succeeded(self, message="", result=None):
+        fields = {"status": self.STATUS_SUCCEEDED, "progress": 100, "message": message}
+        if result:
+            fields.update(
+                solver_status=result["status"],
+                objective_value=result["objective"],
+                best_bound=result["best_bound"],
+                solve_time=result["wall_time"],
+                metrics=result["metrics"],
+            )
+        return self._finish(**fields)
+
+    def mark_failed(self, error):
+        return self._finish(status=self.STATUS_FAILED, error=str(error))
+
+    @property
+    def target_name(self):
+        return self.class_model.name if self.class_model else "all classes"
+
+    def __str__(self):
+        return f"Timetable job #{self.pk} for {self.target_name} ({self.status})"
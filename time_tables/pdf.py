@@ -0,0 +1,119 @@
+# time_tables/pdf.py
+"""
+ReportLab building blocks shared by the timetable PDF downloads.
+
+Schedules are plain ``{timeslot_id: {day: cell_html}}`` dicts so callers can
+build them from a single query without keeping model instances around.
+"""
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from .models import DAYS
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9F9F9')),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F8FF')]),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+
+def add_page_number(canvas_obj, doc):
+    """
+    Adds the page number at the bottom-right of each page.
+    """
+    page_num = canvas_obj.getPageNumber()
+    text = f"Page {page_num}"
+    canvas_obj.setFont("Helvetica", 9)
+    canvas_obj.drawRightString(doc.pagesize[0] - 40, 20, text)
+
+
+def timetable_document(output):
+    """A landscape letter document writing to ``output`` (a response or file)."""
+    return SimpleDocTemplate(
+        output,
+        pagesize=landscape(letter),
+        rightMargin=30, leftMargin=30,
+        topMargin=30, bottomMargin=40
+    )
+
+
+def timetable_styles():
+    """Custom styles for a professional look."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CellText',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=12,
+        alignment=1,  # Center aligned
+        textColor=colors.HexColor('#2C3E50'),
+    ))
+    styles.add(ParagraphStyle(
+        name='TimetableTitle',
+        fontSize=26,
+        leading=32,
+        spaceAfter=20,
+        alignment=1,
+        fontName='Helvetica-Bold',
+        textColor=colors.HexColor('#2980B9')
+    ))
+    return styles
+
+
+class LazyFlowables(list):
+    """
+    Flowable list for ``doc.build`` that is refilled from ``chunks`` (an
+    iterable of flowable lists, e.g. one per page) only when the build has
+    consumed everything before it, so a long document never holds more than
+    one chunk of flowables at a time.
+    """
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        # ``build`` checks ``len(flowables)`` before taking the next one.
+        while not super().__len__():
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.extend(chunk)
+        return super().__len__()
+
+
+def slot_label(ts):
+    return f"{ts.start_time.strftime('%I:%M %p')} - {ts.end_time.strftime('%I:%M %p')}"
+
+
+def timetable_flowables(title, schedule, timeslots, doc, styles):
+    """Title and grid table for one class or teacher."""
+    data = [[Paragraph(f"<b>{cell}</b>", styles['Heading4']) for cell in ["Time Slot"] + DAYS]]
+    for ts in timeslots:
+        row = [Paragraph(slot_label(ts), styles['CellText'])]
+        for day in DAYS:
+            if ts.is_break:
+                cell = "<i>Break</i>"
+            else:
+                cell = schedule.get(ts.id, {}).get(day, "--")
+            row.append(Paragraph(cell, styles['CellText']))
+        data.append(row)
+
+    # Define column widths for the table.
+    col_widths = [doc.width * 0.15] + [doc.width * 0.14] * 6
+    table = Table(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    return [Paragraph(title, styles['TimetableTitle']), Spacer(1, 12), table]
@@ -0,0 +1,607 @@
+# time_tables/scheduler.py
+"""
+Timetable scheduling with OR-Tools CP-SAT.
+
+The solver used to run inline in ``TimetableGenerateView``; it now lives here so
+it can be driven from the background worker (see ``time_tables.jobs``).
+"""
+from django.conf import settings
+from django.db import transaction
+from ortools.sat.python import cp_model
+
+from school_class.models import Class
+from subjects.models import ClassTeacherSubject
+from .cache import invalidate_class_grids
+from .models import DAYS, Timetable, TimeSlot
+
+
+class TimetableGenerationError(Exception):
+    """Raised when a timetable cannot be generated or saved."""
+
+
+def _noop_progress(progress, message):
+    pass
+
+
+def free_period_teacher_id(class_id, index, n_slots):
+    """Fake teacher id for a class's ``index``-th free period."""
+    return -(class_id * n_slots + index + 1)
+
+
+def load_class_assignments(classes, lesson_timeslots):
+    """
+    Build the list of teacher/subject assignments for every class, padded with
+    dummy "Free Period" assignments (or trimmed) to match the lesson slot count.
+    """
+    class_assignments = {cls.id: [] for cls in classes}
+    assignments_qs = (
+        ClassTeacherSubject.objects.filter(class_obj__in=classes)
+        .select_related("subject", "teacher__user")
+        .order_by("class_obj_id", "id")
+    )
+    for cts in assignments_qs:
+        class_assignments[cts.class_obj_id].append({
+            "subject_id": cts.subject_id,
+            "teacher_id": cts.teacher_id,
+            "subject_name": cts.subject.name,
+            "teacher_name": cts.teacher.user.username,
+            # assuming teacher's display name comes from the related user
+            "is_free": False,
+        })
+
+    for cls in classes:
+        assignments = class_assignments[cls.id]
+        # If assignments are fewer than lesson slots, append dummy assignments.
+        if len(assignments) < len(lesson_timeslots):
+            dummy_count = len(lesson_timeslots) - len(assignments)
+            for i in range(dummy_count):
+                assignments.append({
+                    "subject_id": 0,  # Dummy subject id
+                    # Negative and unique per class, so dummy ids never clash with
+                    # real teachers or with other classes' free periods in the
+                    # element engine's AddAllDifferent.
+                    "teacher_id": free_period_teacher_id(cls.id, i, len(lesson_timeslots)),
+                    "subject_name": "Free Period",
+                    "teacher_name": "N/A",
+                    "is_free": True,
+                })
+        # If there are extra assignments, slice them to match lesson slot count.
+        elif len(assignments) > len(lesson_timeslots):
+            class_assignments[cls.id] = assignments[:len(lesson_timeslots)]
+    return class_assignments
+
+
+# Soft-constraint weights for the boolean engine's objective.
+DEFAULT_OBJECTIVE_WEIGHTS = {
+    # Idle slots between a teacher's first and last lesson of a day.
+    "TEACHER_GAPS": 2,
+    # Lessons beyond the first of the same subject for a class on one day.
+    "SUBJECT_REPEATS": 5,
+    # Difference between a teacher's busiest and quietest day.
+    "TEACHER_LOAD_SPREAD": 1,
+}
+
+
+def solver_settings(**overrides):
+    """
+    Solver options from ``settings.TIMETABLE_SOLVER`` with per-call overrides.
+
+    ``ENGINE`` is ``"boolean"`` (one boolean per class/day/slot/assignment) or
+    ``"element"`` (the original integer + ``AddElement`` formulation).
+
+    The remaining options only apply to the boolean engine:
+    ``MAX_DAILY_LESSONS_PER_ASSIGNMENT`` of 1 keeps every assignment taught
+    exactly once a day; a higher value only requires one lesson per school day
+    over the week, with at most that many on a single day.
+    ``OBJECTIVE_WEIGHTS`` weight the soft constraints (0 disables a term).
+    """
+    options = {
+        "ENGINE": "boolean",
+        "MAX_TIME_IN_SECONDS": 60.0,
+        "NUM_SEARCH_WORKERS": 8,
+        "MAX_DAILY_LESSONS_PER_ASSIGNMENT": 1,
+        "OBJECTIVE_WEIGHTS": {},
+    }
+    options.update(getattr(settings, "TIMETABLE_SOLVER", {}))
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    options["OBJECTIVE_WEIGHTS"] = {**DEFAULT_OBJECTIVE_WEIGHTS, **options["OBJECTIVE_WEIGHTS"]}
+    if options["ENGINE"] not in SOLVER_ENGINES:
+        raise TimetableGenerationError(f"Unknown timetable solver engine '{options['ENGINE']}'.")
+    return options
+
+
+def _build_element_model(model, class_assignments, n_slots, days, options):
+    """
+    Integer formulation: one assignment-index variable per class/day/slot,
+    linked to a teacher-id variable with ``AddElement``. Teacher clashes are
+    ``AddAllDifferent`` over the teacher-id variables of each day/slot, which
+    is why dummy assignments need unique fake teacher ids. Pure feasibility:
+    the soft constraints are only modelled by the boolean engine.
+    """
+    decision_vars = {}
+    teacher_vars = {}
+
+    for class_id, assignments in class_assignments.items():
+        n_assignments = len(assignments)
+        teacher_ids_list = [assignment["teacher_id"] for assignment in assignments]
+        for day in days:
+            day_vars = []
+            for slot_index in range(n_assignments):
+                var = model.NewIntVar(0, n_assignments - 1, f"cls{class_id}_{day}_slot{slot_index}")
+                decision_vars[(class_id, day, slot_index)] = var
+                day_vars.append(var)
+                t_var = model.NewIntVar(min(teacher_ids_list), max(teacher_ids_list),
+                                        f"cls{class_id}_{day}_slot{slot_index}_teacher")
+                teacher_vars[(class_id, day, slot_index)] = t_var
+                # Link the decision variable with the teacher ID from the assignment.
+                model.AddElement(var, teacher_ids_list, t_var)
+            # Each lesson slot in a day gets a unique assignment.
+            model.AddAllDifferent(day_vars)
+
+    # Ensure that for each day and each lesson slot (across classes), teachers are not double-booked.
+    for day in days:
+        for slot_index in range(n_slots):
+            teacher_vars_this_slot = []
+            for class_id in class_assignments:
+                teacher_vars_this_slot.append(teacher_vars[(class_id, day, slot_index)])
+            model.AddAllDifferent(teacher_vars_this_slot)
+
+    def extract(solver):
+        return {key: solver.Value(var) for key, var in decision_vars.items()}
+
+    def pin(key, assign_index, fixed):
+        if fixed:
+            model.Add(decision_vars[key] == assign_index)
+        else:
+            model.AddHint(decision_vars[key], assign_index)
+
+    return extract, pin
+
+
+def _build_boolean_model(model, class_assignments, n_slots, days, options):
+    """
+    Boolean formulation: ``x[class, day, slot, assignment]`` is true when the
+    assignment is taught in that slot. Every slot takes exactly one assignment,
+    every assignment is taught once per school day (see
+    ``MAX_DAILY_LESSONS_PER_ASSIGNMENT``), and each real teacher is in at most
+    one class per day/slot. Dummy "free" assignments have no teacher and take
+    no part in the clash constraints.
+    """
+    max_daily = int(options["MAX_DAILY_LESSONS_PER_ASSIGNMENT"])
+    x = {}
+    teacher_slots = {}
+
+    for class_id, assignments in class_assignments.items():
+        n_assignments = len(assignments)
+        for day in days:
+            for slot_index in range(n_assignments):
+                for assign_index in range(n_assignments):
+                    x[(class_id, day, slot_index, assign_index)] = model.NewBoolVar(
+                        f"x_cls{class_id}_{day}_slot{slot_index}_a{assign_index}"
+                    )
+                model.AddExactlyOne(
+                    x[(class_id, day, slot_index, a)] for a in range(n_assignments)
+                )
+            for assign_index, assignment in enumerate(assignments):
+                day_literals = [x[(class_id, day, s, assign_index)] for s in range(n_assignments)]
+                if max_daily == 1:
+                    model.AddExactlyOne(day_literals)
+                else:
+                    model.Add(sum(day_literals) <= max_daily)
+                if assignment["is_free"]:
+                    continue
+                for slot_index in range(n_assignments):
+                    teacher_slots.setdefault(
+                        (assignment["teacher_id"], day, slot_index), []
+                    ).append(x[(class_id, day, slot_index, assign_index)])
+        if max_daily != 1:
+            # Weekly quota: one lesson per school day for every assignment.
+            for assign_index in range(n_assignments):
+                model.Add(
+                    sum(x[(class_id, day, s, assign_index)] for day in days for s in range(n_assignments))
+                    == len(days)
+                )
+
+    # A teacher can be in at most one class per day and slot.
+    for literals in teacher_slots.values():
+        if len(literals) > 1:
+            model.AddAtMostOne(literals)
+
+    _add_objective(model, class_assignments, n_slots, days, options, x, teacher_slots)
+
+    def extract(solver):
+        values = {}
+        for (class_id, day, slot_index, assign_index), var in x.items():
+            if solver.BooleanValue(var):
+                values[(class_id, day, slot_index)] = assign_index
+        return values
+
+    def pin(key, assign_index, fixed):
+        class_id, day, slot_index = key
+        n_assignments = len(class_assignments[class_id])
+        for a in range(n_assignments):
+            literal = x[(class_id, day, slot_index, a)]
+            if fixed:
+                model.Add(literal == int(a == assign_index))
+            else:
+                model.AddHint(literal, a == assign_index)
+
+    return extract, pin
+
+
+def _add_objective(model, class_assignments, n_slots, days, options, x, teacher_slots):
+    """Minimise the weighted soft constraints of the boolean model."""
+    weights = options["OBJECTIVE_WEIGHTS"]
+    max_daily = int(options["MAX_DAILY_LESSONS_PER_ASSIGNMENT"])
+    terms = []
+
+    if weights["SUBJECT_REPEATS"]:
+        for class_id, assignments in class_assignments.items():
+            by_subject = {}
+            for assign_index, assignment in enumerate(assignments):
+                if not assignment["is_free"]:
+                    by_subject.setdefault(assignment["subject_id"], []).append(assign_index)
+            for subject_id, assign_indexes in by_subject.items():
+                if len(assign_indexes) * max_daily <= 1:
+                    continue  # The subject cannot appear twice on one day.
+                for day in days:
+                    count = sum(
+                        x[(class_id, day, s, a)] for a in assign_indexes for s in range(len(assignments))
+                    )
+                    repeats = model.NewIntVar(0, n_slots, f"repeats_cls{class_id}_{day}_sub{subject_id}")
+                    model.Add(repeats >= count - 1)
+                    terms.append(weights["SUBJECT_REPEATS"] * repeats)
+
+    teachers = sorted({teacher_id for teacher_id, _, _ in teacher_slots})
+    busy = {}
+    if weights["TEACHER_GAPS"] or (weights["TEACHER_LOAD_SPREAD"] and max_daily != 1):
+        for teacher_id in teachers:
+            for day in days:
+                for slot_index in range(n_slots):
+                    literals = teacher_slots.get((teacher_id, day, slot_index), [])
+                    if len(literals) == 1:
+                        busy[(teacher_id, day, slot_index)] = literals[0]
+                    elif literals:
+                        var = model.NewBoolVar(f"busy_t{teacher_id}_{day}_slot{slot_index}")
+                        model.Add(var == sum(literals))
+                        busy[(teacher_id, day, slot_index)] = var
+
+    if weights["TEACHER_GAPS"]:
+        for teacher_id in teachers:
+            for day in days:
+                slots = [busy.get((teacher_id, day, s)) for s in range(n_slots)]
+                # before[s]/after[s]: the teacher has a lesson earlier/later that day.
+                before = [None] * n_slots
+                after = [None] * n_slots
+                for s in range(1, n_slots):
+                    before[s] = _or_var(model, [before[s - 1], slots[s - 1]],
+                                        f"before_t{teacher_id}_{day}_slot{s}")
+                for s in range(n_slots - 2, -1, -1):
+                    after[s] = _or_var(model, [after[s + 1], slots[s + 1]],
+                                       f"after_t{teacher_id}_{day}_slot{s}")
+                for s in range(1, n_slots - 1):
+                    if before[s] is None or after[s] is None:
+                        continue
+                    gap = model.NewBoolVar(f"gap_t{teacher_id}_{day}_slot{s}")
+                    model.Add(gap >= before[s] + after[s] - 1 - (slots[s] if slots[s] is not None else 0))
+                    terms.append(weights["TEACHER_GAPS"] * gap)
+
+    # With one lesson per assignment per day every teacher's daily load is
+    # fixed, so the spread term only matters for the weekly-quota model.
+    if weights["TEACHER_LOAD_SPREAD"] and max_daily != 1:
+        for teacher_id in teachers:
+            loads = []
+            for day in days:
+                day_busy = [busy[(teacher_id, day, s)] for s in range(n_slots) if (teacher_id, day, s) in busy]
+                load = model.NewIntVar(0, n_slots, f"load_t{teacher_id}_{day}")
+                model.Add(load == sum(day_busy))
+                loads.append(load)
+            most = model.NewIntVar(0, n_slots, f"max_load_t{teacher_id}")
+            least = model.NewIntVar(0, n_slots, f"min_load_t{teacher_id}")
+            model.AddMaxEquality(most, loads)
+            model.AddMinEquality(least, loads)
+            terms.append(weights["TEACHER_LOAD_SPREAD"] * (most - least))
+
+    if terms:
+        model.Minimize(sum(terms))
+
+
+def _or_var(model, literals, name):
+    """Return a boolean equal to the OR of ``literals`` (``None`` entries are false)."""
+    literals = [literal for literal in literals if literal is not None]
+    if not literals:
+        return None
+    if len(literals) == 1:
+        return literals[0]
+    var = model.NewBoolVar(name)
+    model.AddMaxEquality(var, literals)
+    return var
+
+
+def solution_metrics(class_assignments, values, n_slots, days=DAYS):
+    """
+    Measure the soft constraints on a solved timetable, independent of the
+    engine that produced it.
+    """
+    teacher_days = {}
+    subject_days = {}
+    for (class_id, day, slot_index), assign_index in values.items():
+        assignment = class_assignments[class_id][assign_index]
+        if assignment["is_free"]:
+            continue
+        teacher_days.setdefault((assignment["teacher_id"], day), []).append(slot_index)
+        key = (class_id, day, assignment["subject_id"])
+        subject_days[key] = subject_days.get(key, 0) + 1
+
+    teacher_gaps = sum(
+        max(slots) - min(slots) + 1 - len(slots) for slots in teacher_days.values()
+    )
+    subject_repeats = sum(count - 1 for count in subject_days.values() if count > 1)
+    loads = {}
+    for (teacher_id, day), slots in teacher_days.items():
+        loads.setdefault(teacher_id, {d: 0 for d in days})[day] = len(slots)
+    teacher_load_spread = sum(max(day_loads.values()) - min(day_loads.values()) for day_loads in loads.values())
+    return {
+        "teacher_gaps": teacher_gaps,
+        "subject_repeats": subject_repeats,
+        "teacher_load_spread": teacher_load_spread,
+    }
+
+
+SOLVER_ENGINES = {
+    "element": _build_element_model,
+    "boolean": _build_boolean_model,
+}
+
+
+def solve_timetable(class_assignments, n_slots, days=DAYS, engine=None,
+                    max_time_in_seconds=None, num_search_workers=None,
+                    objective_weights=None, fixed=None, hints=None):
+    """
+    Solve the cross-class CP-SAT model for ``class_assignments``
+    (``{class_id: [assignment, ...]}``) over ``n_slots`` lesson slots a day.
+
+    ``fixed`` and ``hints`` map ``(class_id, day, slot_index)`` to an
+    assignment index; fixed cells are constraints, hinted cells only seed the
+    search.
+
+    Returns a dict with the solver ``status`` name, the ``wall_time`` in
+    seconds, the ``objective`` value and ``best_bound`` (``None`` for a pure
+    feasibility model), the ``metrics`` of ``solution_metrics`` and
+    ``values`` (``{(class_id, day, slot_index): assignment_index}``, or
+    ``None`` if no timetable was found).
+    """
+    options = solver_settings(
+        ENGINE=engine,
+        MAX_TIME_IN_SECONDS=max_time_in_seconds,
+        NUM_SEARCH_WORKERS=num_search_workers,
+        OBJECTIVE_WEIGHTS=objective_weights,
+    )
+    model = cp_model.CpModel()
+    extract, pin = SOLVER_ENGINES[options["ENGINE"]](model, class_assignments, n_slots, days, options)
+    for key, assign_index in (fixed or {}).items():
+        pin(key, assign_index, fixed=True)
+    for key, assign_index in (hints or {}).items():
+        pin(key, assign_index, fixed=False)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(options["MAX_TIME_IN_SECONDS"])
+    solver.parameters.num_search_workers = int(options["NUM_SEARCH_WORKERS"])
+    status = solver.Solve(model)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    has_objective = model.HasObjective()
+    values = extract(solver) if found else None
+    return {
+        "status": solver.StatusName(status),
+        "wall_time": solver.WallTime(),
+        "objective": solver.ObjectiveValue() if found and has_objective else None,
+        "best_bound": solver.BestObjectiveBound() if found and has_objective else None,
+        "metrics": solution_metrics(class_assignments, values, n_slots, days) if found else {},
+        "values": values,
+    }
+
+
+def load_stored_values(class_assignments, lesson_timeslots, days=DAYS):
+    """
+    Map each class's stored timetable back onto its current assignments.
+
+    Returns ``{class_id: {(class_id, day, slot_index): assignment_index}}`` for
+    classes whose stored rows still match their ``ClassTeacherSubject``
+    assignments. Classes that changed (or were never generated) are left out.
+    """
+    max_daily = int(solver_settings()["MAX_DAILY_LESSONS_PER_ASSIGNMENT"])
+    slot_index_by_id = {ts.id: index for index, ts in enumerate(lesson_timeslots)}
+    stored = {}
+    rows = Timetable.objects.filter(
+        class_model_id__in=list(class_assignments), time_slot_id__in=list(slot_index_by_id)
+    ).values_list("class_model_id", "day_of_week", "time_slot_id", "subject_id", "teacher_id")
+    for class_id, day, time_slot_id, subject_id, teacher_id in rows:
+        stored[(class_id, day, slot_index_by_id[time_slot_id])] = (subject_id, teacher_id)
+
+    stored_values = {}
+    for class_id, assignments in class_assignments.items():
+        index_by_pair = {
+            (a["subject_id"], a["teacher_id"]): index
+            for index, a in enumerate(assignments) if not a["is_free"]
+        }
+        free_indexes = [index for index, a in enumerate(assignments) if a["is_free"]]
+        values = {}
+        matches = True
+        for day in days:
+            free_for_day = iter(free_indexes)
+            for slot_index in range(len(assignments)):
+                pair = stored.get((class_id, day, slot_index))
+                if pair is None:
+                    matches = False
+                    break
+                if pair == (None, None):
+                    assign_index = next(free_for_day, None)
+                else:
+                    assign_index = index_by_pair.get(pair)
+                if assign_index is None:
+                    matches = False
+                    break
+                values[(class_id, day, slot_index)] = assign_index
+            if not matches:
+                break
+        if matches:
+            # The stored week must still meet every assignment's lesson quota.
+            matches = _meets_quota(values, class_id, len(assignments), days, max_daily)
+        if matches:
+            stored_values[class_id] = values
+    return stored_values
+
+
+def _meets_quota(values, class_id, n_assignments, days, max_daily):
+    weekly = [0] * n_assignments
+    for day in days:
+        daily = [0] * n_assignments
+        for slot_index in range(n_assignments):
+            daily[values[(class_id, day, slot_index)]] += 1
+        if max_daily == 1 and any(count != 1 for count in daily):
+            return False
+        if any(count > max_daily for count in daily):
+            return False
+        weekly = [total + count for total, count in zip(weekly, daily)]
+    return all(total == len(days) for total in weekly)
+
+
+def build_solution(classes, class_assignments, all_timeslots, values, days=DAYS):
+    """Turn solver values into ``{class_id: {day: {timeslot_id: cell}}}``."""
+    timetable_solution = {cls.id: {day: {} for day in days} for cls in classes}
+    for cls in classes:
+        lesson_counter = 0
+        for ts in all_timeslots:
+            if ts.is_break:
+                for day in days:
+                    timetable_solution[cls.id][day][ts.id] = {
+                        "is_break": True,
+                        "display": f"Break ({ts.start_time.strftime('%I:%M %p')} - {ts.end_time.strftime('%I:%M %p')})",
+                    }
+            else:
+                for day in days:
+                    assign_index = values[(cls.id, day, lesson_counter)]
+                    assignment = class_assignments[cls.id][assign_index]
+                    # Dummy assignments are stored as empty (free) periods.
+                    if assignment["is_free"]:
+                        timetable_solution[cls.id][day][ts.id] = {
+                            "is_break": False,
+                            "subject_id": None,
+                            "teacher_id": None,
+                            "subject": "",
+                            "teacher": "",
+                            "display": "Free Period",
+                        }
+                        continue
+                    timetable_solution[cls.id][day][ts.id] = {
+                        "is_break": False,
+                        "subject_id": assignment["subject_id"],
+                        "teacher_id": assignment["teacher_id"],
+                        "subject": assignment["subject_name"],
+                        "teacher": assignment["teacher_name"],
+                        "display": f"{assignment['subject_name']}<br/>{assignment['teacher_name']}",
+                    }
+                lesson_counter += 1
+    return timetable_solution
+
+
+def save_timetables(classes, timetable_solution, all_timeslots, days=DAYS):
+    """
+    Replace the stored timetables of ``classes`` with their rows from
+    ``timetable_solution`` in a single transaction and ``bulk_create``.
+
+    Cells carry subject and teacher primary keys, so no lookups are needed.
+    """
+    entries = []
+    for cls in classes:
+        class_solution = timetable_solution[cls.id]
+        for day in days:
+            for ts in all_timeslots:
+                cell = class_solution[day].get(ts.id)
+                if not cell:
+                    continue
+                entries.append(Timetable(
+                    class_model_id=cls.id,
+                    time_slot_id=ts.id,
+                    day_of_week=day,
+                    subject_id=cell.get("subject_id"),
+                    teacher_id=cell.get("teacher_id"),
+                ))
+
+    with transaction.atomic():
+        # Delete any existing timetable for the classes being replaced.
+        Timetable.objects.filter(class_model__in=classes).delete()
+        Timetable.objects.bulk_create(entries)
+        # bulk_create sends no post_save signals, so drop cached grids here.
+        transaction.on_commit(lambda: invalidate_class_grids([cls.id for cls in classes]))
+
+
+def _raise_for_result(result):
+    if result["status"] == "UNKNOWN":
+        raise TimetableGenerationError(
+            "The solver ran out of time before finding a timetable. "
+            "Increase TIMETABLE_SOLVER['MAX_TIME_IN_SECONDS'] or simplify class assignments."
+        )
+    raise TimetableGenerationError(
+        "No feasible timetable found. Please check class assignments and timeslot configurations."
+    )
+
+
+def generate_timetable(selected_class=None, progress=_noop_progress, incremental=False):
+    """
+    Solve the timetable for all classes once and save the result for
+    ``selected_class``, or for every class when it is ``None``.
+
+    When only ``selected_class`` is saved, the stored timetables of the other
+    classes are pinned so the new one cannot double-book their teachers.
+    With ``incremental`` the stored timetables of unchanged classes are pinned
+    and only classes whose assignments changed (plus ``selected_class``) are
+    re-solved and saved. Stored timetables are only replaced when they are
+    targeted: if the pinned ones leave no room, ``TimetableGenerationError``
+    is raised and a full generation of every class is needed instead.
+
+    ``progress(percent, message)`` is called between stages. Returns the
+    solver result with the ``solution`` and the ``classes`` that were saved.
+    """
+    progress(10, "Loading classes and assignments")
+    all_timeslots = list(TimeSlot.objects.all().order_by("start_time"))
+    lesson_timeslots = [ts for ts in all_timeslots if not ts.is_break]
+    # Build assignments for all classes (for conflict checking across classes).
+    classes = list(Class.objects.all())
+    class_assignments = load_class_assignments(classes, lesson_timeslots)
+    target_classes = [selected_class] if selected_class else classes
+
+    fixed = {}
+    if incremental or selected_class:
+        stored_values = load_stored_values(class_assignments, lesson_timeslots)
+        if selected_class:
+            stored_values.pop(selected_class.id, None)
+        if incremental:
+            target_classes = [cls for cls in classes if cls.id not in stored_values]
+        if not target_classes:
+            progress(100, "All timetables are up to date")
+            return {"status": "UNCHANGED", "wall_time": 0.0, "objective": None, "best_bound": None,
+                    "metrics": {}, "values": None, "solution": {}, "classes": []}
+        for values in stored_values.values():
+            fixed.update(values)
+
+    progress(30, f"Solving timetable model for {len(target_classes)} of {len(classes)} classes")
+    result = solve_timetable(class_assignments, len(lesson_timeslots), fixed=fixed)
+    if result["values"] is None and fixed and result["status"] == "INFEASIBLE":
+        raise TimetableGenerationError(
+            "Pinned timetables conflict: the stored timetables of the other classes leave no "
+            f"conflict-free timetable for {', '.join(cls.name for cls in target_classes)}. "
+            "Generate the timetables of all classes to re-solve them together."
+        )
+    if result["values"] is None:
+        _raise_for_result(result)
+
+    progress(80, "Saving timetable")
+    timetable_solution = build_solution(classes, class_assignments, all_timeslots, result["values"])
+    try:
+        save_timetables(target_classes, timetable_solution, all_timeslots)
+    except Exception as e:
+        raise TimetableGenerationError(f"An error occurred while saving the timetable: {e}") from e
+    result["solution"] = timetable_solution
+    result["classes"] = target_classes
+    return result
@@ -0,0 +1,34 @@
+# time_tables/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import CustomUser
+from subjects.models import Subject
+from teachers.models import Teacher
+from .cache import invalidate_all_grids, invalidate_class_grids
+from .models import Timetable, TimeSlot
+
+
+@receiver([post_save, post_delete], sender=Timetable)
+def invalidate_timetable_grid(sender, instance, **kwargs):
+    invalidate_class_grids([instance.class_model_id])
+
+
+@receiver([post_save, post_delete], sender=TimeSlot)
+@receiver([post_save, post_delete], sender=Subject)
+@receiver([post_save, post_delete], sender=Teacher)
+def invalidate_all_timetable_grids(sender, instance, **kwargs):
+    # Time slots, subject names and teacher names appear in every grid.
+    invalidate_all_grids()
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_grids_on_name_change(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Grids show teachers by name. post_save runs before the user re-snapshots
+    # its names, so saves that leave them unchanged keep the cache.
+    if raw or created:
+        return
+    if update_fields is not None and not set(update_fields) & set(CustomUser.TRACKED_NAME_FIELDS):
+        return
+    if instance.changed_name_fields() and hasattr(instance, "teacher_profile"):
+        invalidate_all_grids()
@@ -1,3 +1,236 @@
-from django.test import TestCase
+from datetime import time, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from school_class.models import Class
+from subjects.models import ClassTeacherSubject, Subject
+from teachers.models import Teacher
+from .cache import _cache, get_class_grid
+from .jobs import claim_next_job, enqueue_generation, fail_stale_jobs, run_job
+from .models import DAYS, Timetable, TimetableGenerationJob, TimeSlot
+from .pdf import timetable_flowables
+from .scheduler import TimetableGenerationError, generate_timetable
+
+
+class TimetableTestData(TestCase):
+    """
+    Two classes taught Maths by one teacher and English by another over two
+    lesson slots and a break; the only clash-free week alternates teachers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.slots = [
+            TimeSlot.objects.create(start_time=time(9), end_time=time(10)),
+            TimeSlot.objects.create(start_time=time(10), end_time=time(10, 30), is_break=True),
+            TimeSlot.objects.create(start_time=time(10, 30), end_time=time(11, 30)),
+        ]
+        cls.teachers = [
+            Teacher.objects.create(
+                user=CustomUser.objects.create(username=f"teacher{index}", first_name=f"First{index}",
+                                               last_name="Last", role="teacher"),
+                age=30, address="Address",
+            )
+            for index in range(2)
+        ]
+        cls.subjects = [Subject.objects.create(name="Maths"), Subject.objects.create(name="English")]
+        cls.classes = [Class.objects.create(name="Class A"), Class.objects.create(name="Class B")]
+        for school_class in cls.classes:
+            for subject, teacher in zip(cls.subjects, cls.teachers):
+                ClassTeacherSubject.objects.create(class_obj=school_class, subject=subject, teacher=teacher)
+
+    def setUp(self):
+        # Ids are reused between tests; start every test with an empty grid cache.
+        _cache().clear()
+
+    def store(self, school_class, first_teacher=0):
+        """Store a valid week for ``school_class``, ``first_teacher`` taking the first slot."""
+        order = [first_teacher, 1 - first_teacher]
+        Timetable.objects.bulk_create([
+            Timetable(class_model=school_class, time_slot=slot, day_of_week=day,
+                      subject=self.subjects[index], teacher=self.teachers[index])
+            for day in DAYS
+            for slot, index in zip([self.slots[0], self.slots[2]], order)
+        ])
+
+
+class GridCacheTests(TimetableTestData):
+    def grid_teacher(self, school_class):
+        return get_class_grid(school_class.pk, self.slots)["Monday"][self.slots[0].pk]["teacher"]
+
+    def test_teacher_rename_invalidates_cached_grids(self):
+        self.store(self.classes[0])
+        self.assertEqual(self.grid_teacher(self.classes[0]), "First0 Last")
+        user = CustomUser.objects.get(pk=self.teachers[0].user_id)
+        user.last_name = "Renamed"
+        user.save()
+        self.assertEqual(self.grid_teacher(self.classes[0]), "First0 Renamed")
+
+    def test_other_user_saves_keep_the_cache(self):
+        self.store(self.classes[0])
+        self.grid_teacher(self.classes[0])
+        user = CustomUser.objects.get(pk=self.teachers[0].user_id)
+        user.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            self.grid_teacher(self.classes[0])
+
+    def test_normalize_user_names_invalidates_cached_grids(self):
+        self.store(self.classes[0])
+        CustomUser.objects.filter(pk=self.teachers[0].user_id).update(last_name="  smith ")
+        self.assertEqual(self.grid_teacher(self.classes[0]), "First0   smith")
+        call_command("normalize_user_names", stdout=StringIO())
+        self.assertEqual(self.grid_teacher(self.classes[0]), "First0 Smith")
+
+
+class TimetableDownloadTests(TimetableTestData):
+    def setUp(self):
+        super().setUp()
+        admin = CustomUser.objects.create_superuser("admin", "admin@example.com", "password", role="admin")
+        self.client.force_login(admin)
+
+    def test_class_download_labels_teachers_by_username(self):
+        self.store(self.classes[0])
+        with mock.patch("time_tables.views.timetable_flowables", wraps=timetable_flowables) as flowables:
+            response = self.client.get(reverse("timetable_download"), {"class_name": "Class A"})
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(response.content.startswith(b"%PDF"))
+        schedule = flowables.call_args.args[1]
+        self.assertEqual(schedule[self.slots[0].pk]["Monday"], "<b>Maths</b><br/><i>teacher0</i>")
+
+
+class GenerateTimetableCommandTests(TimetableTestData):
+    def test_fills_every_slot_without_double_booking(self):
+        out = StringIO()
+        call_command("generate_timetable", "--skip-time-slots", stdout=out)
+        self.assertIn("Scheduled 24 of 24 lessons", out.getvalue())
+        lessons = Timetable.objects.filter(teacher__isnull=False)
+        self.assertEqual(lessons.count(), 24)
+        self.assertEqual(lessons.values("teacher", "day_of_week", "time_slot").distinct().count(), 24)
+
+
+@override_settings(TIMETABLE_SOLVER={"ENGINE": "boolean", "MAX_TIME_IN_SECONDS": 10, "NUM_SEARCH_WORKERS": 1})
+class GenerateTimetableTests(TimetableTestData):
+    def week(self, school_class):
+        return sorted(Timetable.objects.filter(class_model=school_class).values_list(
+            "day_of_week", "time_slot_id", "subject_id", "teacher_id"
+        ))
+
+    def assertNoDoubleBookings(self):
+        lessons = Timetable.objects.filter(teacher__isnull=False)
+        self.assertEqual(lessons.values("teacher", "day_of_week", "time_slot").distinct().count(), lessons.count())
+
+    def test_generate_all_saves_every_class_without_double_bookings(self):
+        result = generate_timetable()
+        self.assertEqual(result["classes"], self.classes)
+        for school_class in self.classes:
+            # Two lessons and a break on each of the six days.
+            self.assertEqual(Timetable.objects.filter(class_model=school_class).count(), 18)
+        self.assertNoDoubleBookings()
+
+    def test_incremental_saves_only_classes_without_a_stored_timetable(self):
+        self.store(self.classes[0])
+        stored = self.week(self.classes[0])
+        result = generate_timetable(incremental=True)
+        self.assertEqual(result["classes"], [self.classes[1]])
+        self.assertEqual(self.week(self.classes[0]), stored)
+        self.assertEqual(Timetable.objects.filter(class_model=self.classes[1]).count(), 18)
+        self.assertNoDoubleBookings()
+
+        self.assertEqual(generate_timetable(incremental=True)["classes"], [])
+
+    def test_single_class_respects_the_other_stored_timetables(self):
+        self.store(self.classes[1], first_teacher=1)
+        generate_timetable(self.classes[0])
+        self.assertNoDoubleBookings()
+
+    def test_conflicting_pinned_timetables_fail_without_saving(self):
+        third = Class.objects.create(name="Class C")
+        for subject, teacher in zip(self.subjects, self.teachers):
+            ClassTeacherSubject.objects.create(class_obj=third, subject=subject, teacher=teacher)
+        # Class B and C already keep both teachers busy in both slots.
+        self.store(self.classes[1], first_teacher=0)
+        self.store(third, first_teacher=1)
+        stored = self.week(self.classes[1]) + self.week(third)
+        with self.assertRaisesMessage(TimetableGenerationError, "Pinned timetables conflict"):
+            generate_timetable(self.classes[0])
+        self.assertEqual(self.week(self.classes[1]) + self.week(third), stored)
+        self.assertFalse(Timetable.objects.filter(class_model=self.classes[0]).exists())
+
+    def test_saving_a_generated_timetable_invalidates_cached_grids(self):
+        self.store(self.classes[0])
+        self.assertEqual(len(get_class_grid(self.classes[0].pk, self.slots)["Monday"]), 3)
+        self.assertEqual(get_class_grid(self.classes[1].pk, self.slots)["Monday"], {
+            self.slots[1].pk: mock.ANY,  # Breaks are always shown.
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_timetable()
+        self.assertEqual(len(get_class_grid(self.classes[1].pk, self.slots)["Monday"]), 3)
+
+    def test_timetable_edits_invalidate_the_class_grid(self):
+        self.store(self.classes[0])
+        self.assertEqual(get_class_grid(self.classes[0].pk, self.slots)["Monday"][self.slots[0].pk]["subject"],
+                         "Maths")
+        entry = Timetable.objects.get(class_model=self.classes[0], day_of_week="Monday", time_slot=self.slots[0])
+        entry.subject = self.subjects[1]
+        entry.save()
+        self.assertEqual(get_class_grid(self.classes[0].pk, self.slots)["Monday"][self.slots[0].pk]["subject"],
+                         "English")
+
+
+@override_settings(TIMETABLE_SOLVER={"ENGINE": "boolean", "MAX_TIME_IN_SECONDS": 10, "NUM_SEARCH_WORKERS": 1})
+class GenerationJobTests(TimetableTestData):
+    def test_enqueue_reuses_an_unfinished_job_for_the_same_target(self):
+        job = enqueue_generation(self.classes[0])
+        self.assertEqual(enqueue_generation(self.classes[0]), job)
+        self.assertNotEqual(enqueue_generation(self.classes[1]), job)
+        self.assertNotEqual(enqueue_generation(self.classes[0], mode=TimetableGenerationJob.MODE_INCREMENTAL), job)
+        TimetableGenerationJob.objects.filter(pk=job.pk).update(status=TimetableGenerationJob.STATUS_FAILED)
+        self.assertNotEqual(enqueue_generation(self.classes[0]), job)
+
+    def test_claimed_job_runs_to_success(self):
+        job = enqueue_generation()
+        self.assertEqual(job.status, TimetableGenerationJob.STATUS_PENDING)
+        claimed = claim_next_job()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, TimetableGenerationJob.STATUS_RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, TimetableGenerationJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.message, "Timetables generated and saved for 2 classes.")
+        self.assertEqual(job.solver_status, "OPTIMAL")
+        self.assertEqual(Timetable.objects.count(), 36)
+
+    def test_solver_errors_fail_the_job(self):
+        enqueue_generation(self.classes[0])
+        job = claim_next_job()
+        with mock.patch("time_tables.jobs.generate_timetable", side_effect=TimetableGenerationError("No luck")):
+            run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (TimetableGenerationJob.STATUS_FAILED, "No luck"))
+
+    def test_jobs_without_a_recent_heartbeat_are_failed(self):
+        enqueue_generation(self.classes[0])
+        enqueue_generation(self.classes[1])
+        stale, fresh = claim_next_job(), claim_next_job()
+        TimetableGenerationJob.objects.filter(pk=stale.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=601)
+        )
+        self.assertEqual(fail_stale_jobs(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, TimetableGenerationJob.STATUS_FAILED)
+        self.assertEqual(fresh.status, TimetableGenerationJob.STATUS_RUNNING)
+        # The worker finishing later does not overwrite the failure.
+        self.assertFalse(stale.mark_succeeded("Done"))
+        self.assertEqual(stale.status, TimetableGenerationJob.STATUS_FAILED)
+        # The target can be queued again.
+        self.assertNotEqual(enqueue_generation(self.classes[0]).pk, stale.pk)
@@ -16,6 +16,15 @@ urlpatterns = [
     path("timeslots/<int:pk>/delete/", views.TimeSlotDeleteView.as_view(), name="timeslot_delete"),
     # New scheduling view using OR-Tools (generates & saves timetable)
     path("generate/", views.TimetableGenerateView.as_view(), name="timetable_generate"),
+    path("generate/jobs/<int:pk>/", views.TimetableJobStatusView.as_view(), name="timetable_job_status"),
     # New download URL (CSV download example)
     path("download/", views.TimetableDownloadView.as_view(), name="timetable_download"),
+    path("download/all/", views.TimetableBulkDownloadView.as_view(), name="timetable_download_all"),
+    # Per-teacher week
+    path("teacher/<int:pk>/", views.TeacherTimetableView.as_view(), name="teacher_timetable"),
+    path(
+        "teacher/<int:pk>/download/",
+        views.TeacherTimetableDownloadView.as_view(),
+        name="teacher_timetable_download",
+    ),
 ]
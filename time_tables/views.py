@@ -1,9 +1,12 @@
 # Standard Library Imports
 import csv
+import tempfile
+from itertools import groupby
+from operator import attrgetter
 
 # Django Imports
 from django.shortcuts import render, get_object_or_404, redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import (
     ListView,
     DetailView,
@@ -14,25 +17,24 @@ from django.views.generic import (
     View,
 )
 from django.contrib import messages
-from django.db import transaction
-from django.http import HttpResponse
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.html import escape
+from django.utils.http import urlencode
 from django.utils.timezone import now
 
 # Third‑Party Imports
-from ortools.sat.python import cp_model
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.pdfgen import canvas
+from reportlab.platypus import PageBreak, Paragraph
 
 # Local App Imports
 from core.mixins import RoleRequiredMixin
-from .models import Timetable, TimeSlot
+from .models import DAYS, Timetable, TimeSlot, TimetableGenerationJob
 from .forms import TimetableForm, TimeSlotForm
-from teachers.models import Teacher
-from subjects.models import Subject, ClassTeacherSubject
+from .jobs import enqueue_generation
+from .cache import get_class_grid
+from .pdf import LazyFlowables, add_page_number, timetable_document, timetable_flowables, timetable_styles
 from school_class.models import Class
+from teachers.models import Teacher
 
 
 ###############################################
@@ -56,17 +58,13 @@ class TimetableListView(RoleRequiredMixin, ListView):
                 context["selected_class"] = Class.objects.get(name=selected_class_name)
             except Class.DoesNotExist:
                 messages.error(self.request, f"Class {selected_class_name} not found")
-        context["days"] = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-        context["timeslots"] = TimeSlot.objects.all().order_by("start_time")
+        context["days"] = DAYS
+        context["timeslots"] = list(TimeSlot.objects.all().order_by("start_time"))
 
         timetables = {}
         if context["selected_class"]:
-            entries = Timetable.objects.filter(class_model=context["selected_class"]).select_related("time_slot",
-                                                                                                     "subject",
-                                                                                                     "teacher")
-            for day in context["days"]:
-                day_entries = entries.filter(day_of_week=day)
-                timetables[day] = {entry.time_slot.id: entry for entry in day_entries}
+            # Cached day -> time slot -> cell grid, rebuilt from one query on a miss.
+            timetables = get_class_grid(context["selected_class"].id, context["timeslots"])
         context["timetables"] = timetables
         return context
 
@@ -141,8 +139,36 @@ class TimeSlotDeleteView(DeleteView):
 
 
 class TimetableGenerateView(RoleRequiredMixin, TemplateView):
+    """
+    Queues timetable generation and shows the result once the worker is done.
+
+    POST enqueues a ``TimetableGenerationJob``; the page then polls
+    ``TimetableJobStatusView`` instead of solving inside the request.
+    """
     template_name = "time_tables/timetable_generate.html"
 
+    def post(self, request, *args, **kwargs):
+        if "generate_all" in request.POST:
+            # Solve once and replace the timetable of every class.
+            job = enqueue_generation(None, request.user)
+            return redirect(f"{reverse('timetable_generate')}?{urlencode({'job': job.pk})}")
+        if "generate_changed" in request.POST:
+            # Keep unchanged classes pinned and re-solve only the changed ones.
+            job = enqueue_generation(None, request.user, mode=TimetableGenerationJob.MODE_INCREMENTAL)
+            return redirect(f"{reverse('timetable_generate')}?{urlencode({'job': job.pk})}")
+
+        target_class_name = request.POST.get("class_name")
+        try:
+            selected_class = Class.objects.get(name=target_class_name)
+        except Class.DoesNotExist:
+            messages.error(request, f"Class '{target_class_name}' not found.")
+            return redirect("timetable_generate")
+
+        job = enqueue_generation(selected_class, request.user)
+        return redirect(
+            f"{reverse('timetable_generate')}?{urlencode({'class_name': selected_class.name, 'job': job.pk})}"
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -150,6 +176,21 @@ class TimetableGenerateView(RoleRequiredMixin, TemplateView):
         available_classes = Class.objects.all()
         context["available_classes"] = available_classes
 
+        job_id = self.request.GET.get("job")
+        job = None
+        if job_id and job_id.isdigit():
+            job = TimetableGenerationJob.objects.select_related("class_model").filter(pk=job_id).first()
+        context["job"] = job
+        if job and not job.is_finished:
+            # The page polls the status endpoint until the worker finishes.
+            context["selected_class"] = job.class_model
+            return context
+        if job and job.status == TimetableGenerationJob.STATUS_FAILED:
+            context["error"] = job.error
+            return context
+        if job:
+            context["message"] = job.message
+
         # Get the target class from GET parameters (if submitted).
         target_class_name = self.request.GET.get("class_name")
         if not target_class_name:
@@ -162,159 +203,33 @@ class TimetableGenerateView(RoleRequiredMixin, TemplateView):
             context["error"] = f"Class '{target_class_name}' not found."
             return context
 
-        # Define days for a 6-day week.
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
         all_timeslots = list(TimeSlot.objects.all().order_by("start_time"))
-        lesson_timeslots = [ts for ts in all_timeslots if not ts.is_break]
-
-        # Build assignments for all classes (for conflict checking across classes).
-        classes = list(Class.objects.all())
-        class_assignments = {}
-        for cls in classes:
-            assignments_qs = ClassTeacherSubject.objects.filter(class_obj=cls)
-            assignments = []
-            for cts in assignments_qs:
-                assignments.append({
-                    "subject_id": cts.subject.id,
-                    "teacher_id": cts.teacher.id,
-                    "subject_name": cts.subject.name,
-                    "teacher_name": cts.teacher.user.username,
-                    # assuming teacher's display name comes from the related user
-                })
-            # If assignments are fewer than lesson slots, append dummy assignments.
-            if len(assignments) < len(lesson_timeslots):
-                dummy_count = len(lesson_timeslots) - len(assignments)
-                for i in range(dummy_count):
-                    assignments.append({
-                        "subject_id": 0,  # Dummy subject id
-                        "teacher_id": 1000000 + i,  # Dummy teacher id (ensure these don't conflict with real ones)
-                        "subject_name": "Free Period",
-                        "teacher_name": "N/A",
-                    })
-            # If there are extra assignments, slice them to match lesson slot count.
-            elif len(assignments) > len(lesson_timeslots):
-                assignments = assignments[:len(lesson_timeslots)]
-            class_assignments[cls.id] = assignments
-
-        # Build the CP‑SAT model.
-        model = cp_model.CpModel()
-        decision_vars = {}
-        teacher_vars = {}
-
-        for cls in classes:
-            assignments = class_assignments[cls.id]
-            n_assignments = len(assignments)
-            teacher_ids_list = [assignment["teacher_id"] for assignment in assignments]
-            for day in days:
-                day_vars = []
-                for slot_index in range(n_assignments):
-                    var = model.NewIntVar(0, n_assignments - 1, f"cls{cls.id}_{day}_slot{slot_index}")
-                    decision_vars[(cls.id, day, slot_index)] = var
-                    day_vars.append(var)
-                    t_var = model.NewIntVar(min(teacher_ids_list), max(teacher_ids_list),
-                                            f"cls{cls.id}_{day}_slot{slot_index}_teacher")
-                    teacher_vars[(cls.id, day, slot_index)] = t_var
-                    # Link the decision variable with the teacher ID from the assignment.
-                    model.AddElement(var, teacher_ids_list, t_var)
-                # Each lesson slot in a day gets a unique assignment.
-                model.AddAllDifferent(day_vars)
-
-        # Ensure that for each day and each lesson slot (across classes), teachers are not double-booked.
-        for day in days:
-            for slot_index in range(len(lesson_timeslots)):
-                teacher_vars_this_slot = []
-                for cls in classes:
-                    teacher_vars_this_slot.append(teacher_vars[(cls.id, day, slot_index)])
-                model.AddAllDifferent(teacher_vars_this_slot)
-
-        solver = cp_model.CpSolver()
-        status = solver.Solve(model)
-        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-            context[
-                "error"] = "No feasible timetable found. Please check class assignments and timeslot configurations."
-            return context
-
-        # Build the timetable solution structure.
-        timetable_solution = {cls.id: {day: {} for day in days} for cls in classes}
-        for cls in classes:
-            lesson_counter = 0
-            for ts in all_timeslots:
-                if ts.is_break:
-                    for day in days:
-                        timetable_solution[cls.id][day][ts.id] = {
-                            "is_break": True,
-                            "display": f"Break ({ts.start_time.strftime('%I:%M %p')} - {ts.end_time.strftime('%I:%M %p')})",
-                        }
-                else:
-                    for day in days:
-                        var = decision_vars[(cls.id, day, lesson_counter)]
-                        assign_index = solver.Value(var)
-                        assignment = class_assignments[cls.id][assign_index]
-                        # Check for a dummy assignment.
-                        if assignment["subject_name"] == "Free Period":
-                            display_text = "Free Period"
-                        else:
-                            display_text = f"{assignment['subject_name']}<br/>{assignment['teacher_name']}"
-                        timetable_solution[cls.id][day][ts.id] = {
-                            "is_break": False,
-                            "subject": assignment["subject_name"] if assignment[
-                                                                         "subject_name"] != "Free Period" else "",
-                            "teacher": assignment["teacher_name"] if assignment["teacher_name"] != "N/A" else "",
-                            "display": display_text,
-                        }
-                    lesson_counter += 1
-
-        # Save the generated timetable for the selected class.
-        try:
-            with transaction.atomic():
-                # Delete any existing timetable for the class.
-                Timetable.objects.filter(class_model=selected_class).delete()
-                for day in days:
-                    for ts in all_timeslots:
-                        cell = timetable_solution[selected_class.id][day].get(ts.id)
-                        if cell:
-                            if ts.is_break or cell.get("subject") == "":
-                                Timetable.objects.create(
-                                    class_model=selected_class,
-                                    time_slot=ts,
-                                    day_of_week=day,
-                                    subject=None,
-                                    teacher=None,
-                                )
-                            else:
-                                # Use the subject's name as usual.
-                                subject_obj = Subject.objects.filter(name=cell["subject"]).first()
-                                # For teacher, use the related user's username (change lookup field if needed).
-                                teacher_obj = None
-                                if cell["teacher"] and cell["teacher"] != "N/A":
-                                    teacher_obj = Teacher.objects.filter(user__username=cell["teacher"]).first()
-                                Timetable.objects.create(
-                                    class_model=selected_class,
-                                    time_slot=ts,
-                                    day_of_week=day,
-                                    subject=subject_obj,
-                                    teacher=teacher_obj,
-                                )
-        except Exception as e:
-            context["error"] = f"An error occurred while saving the timetable: {e}"
-            return context
-
         context["selected_class"] = selected_class
-        context["days"] = days
+        context["days"] = DAYS
         context["timeslots"] = all_timeslots
-        context["timetable"] = timetable_solution[selected_class.id]
-        context["message"] = "Timetable generated and saved successfully."
+        context["timetable"] = get_class_grid(selected_class.id, all_timeslots)
         return context
 
 
-def add_page_number(canvas_obj, doc):
-    """
-    Adds the page number at the bottom-right of each page.
-    """
-    page_num = canvas_obj.getPageNumber()
-    text = f"Page {page_num}"
-    canvas_obj.setFont("Helvetica", 9)
-    canvas_obj.drawRightString(doc.pagesize[0] - 40, 20, text)
+class TimetableJobStatusView(RoleRequiredMixin, View):
+    """JSON progress of a timetable generation job, polled by the generate page."""
+
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(TimetableGenerationJob.objects.select_related("class_model"), pk=pk)
+        return JsonResponse({
+            "id": job.pk,
+            "class_name": job.class_model.name if job.class_model else None,
+            "status": job.status,
+            "progress": job.progress,
+            "message": job.message,
+            "error": job.error,
+            "finished": job.is_finished,
+            "solver_status": job.solver_status,
+            "objective_value": job.objective_value,
+            "best_bound": job.best_bound,
+            "solve_time": job.solve_time,
+            "metrics": job.metrics,
+        })
 
 
 class TimetableDownloadView(RoleRequiredMixin, View):
@@ -325,9 +240,16 @@ class TimetableDownloadView(RoleRequiredMixin, View):
         except Class.DoesNotExist:
             return HttpResponse("Class not found.", status=404)
 
-        timetable_qs = Timetable.objects.filter(class_model=selected_class).order_by(
-            "day_of_week", "time_slot__start_time"
+        timetable_qs = Timetable.objects.filter(class_model=selected_class).select_related(
+            "subject", "teacher__user"
         )
+        schedule = {}
+        for entry in timetable_qs:
+            if entry.subject_id:
+                teacher_name = entry.teacher.user.username if entry.teacher else ""
+                schedule.setdefault(entry.time_slot_id, {})[entry.day_of_week] = (
+                    f"<b>{escape(entry.subject.name)}</b><br/><i>{escape(teacher_name)}</i>"
+                )
 
         # Create a PDF response.
         response = HttpResponse(content_type="application/pdf")
@@ -335,99 +257,177 @@ class TimetableDownloadView(RoleRequiredMixin, View):
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
         # Create a PDF document with landscape letter size.
-        doc = SimpleDocTemplate(
-            response,
-            pagesize=landscape(letter),
-            rightMargin=30, leftMargin=30,
-            topMargin=30, bottomMargin=40
+        doc = timetable_document(response)
+        elements = timetable_flowables(
+            f"{escape(selected_class.name)} Timetable",
+            schedule,
+            list(TimeSlot.objects.order_by("start_time")),
+            doc,
+            timetable_styles(),
+        )
+
+        # Build the PDF and add page numbers.
+        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
+
+        return response
+
+
+class TimetableBulkDownloadView(RoleRequiredMixin, View):
+    """
+    Whole-school PDF: one page per class followed by one page per teacher.
+
+    Entries are streamed from two ordered ``select_related`` queries (by class,
+    then by teacher) and each class or teacher is turned into flowables only
+    when ReportLab reaches its page, so memory does not grow with the number
+    of classes. The PDF is written to a temporary file and streamed back with
+    ``FileResponse``.
+    """
+    INCLUDE_CHOICES = ("all", "classes", "teachers")
+
+    def get(self, request, *args, **kwargs):
+        include = request.GET.get("include", "all")
+        if include not in self.INCLUDE_CHOICES:
+            return HttpResponseBadRequest(f"include must be one of: {', '.join(self.INCLUDE_CHOICES)}.")
+        timeslots = list(TimeSlot.objects.order_by("start_time"))
+
+        output = tempfile.TemporaryFile()
+        doc = timetable_document(output)
+        styles = timetable_styles()
+        doc.build(
+            LazyFlowables(self.pages(include, timeslots, doc, styles)),
+            onFirstPage=add_page_number, onLaterPages=add_page_number,
         )
-        elements = []
-
-        # Custom styles for a professional look.
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(
-            name='CellText',
-            parent=styles['Normal'],
-            fontSize=10,
-            leading=12,
-            alignment=1,  # Center aligned
-            textColor=colors.HexColor('#2C3E50'),
-        ))
-        title_style = ParagraphStyle(
-            name='Title',
-            fontSize=26,
-            leading=32,
-            spaceAfter=20,
-            alignment=1,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#2980B9')
+        output.seek(0)
+        filename = f"timetables_school_{now().strftime('%Y%m%d')}.pdf"
+        return FileResponse(output, as_attachment=True, filename=filename, content_type="application/pdf")
+
+    def schedules(self, include):
+        """Yield ``(title, schedule)`` for each class, then each teacher."""
+        entries = Timetable.objects.filter(subject__isnull=False).select_related(
+            "class_model", "subject", "teacher__user"
         )
-        elements.append(Paragraph(f"{selected_class.name} Timetable", title_style))
-        elements.append(Spacer(1, 12))
+        if include in ("all", "classes"):
+            by_class = entries.order_by("class_model__name", "class_model_id")
+            for _, group in groupby(by_class.iterator(chunk_size=2000), key=attrgetter("class_model_id")):
+                schedule = {}
+                for entry in group:
+                    # Same label as the single-class download.
+                    teacher_name = entry.teacher.user.username if entry.teacher else ""
+                    schedule.setdefault(entry.time_slot_id, {})[entry.day_of_week] = (
+                        f"<b>{escape(entry.subject.name)}</b><br/><i>{escape(teacher_name)}</i>"
+                    )
+                yield f"{escape(entry.class_model.name)} Timetable", schedule
+        if include in ("all", "teachers"):
+            # Grouped by id: teachers who share a name still get a page each.
+            by_teacher = entries.filter(teacher__isnull=False).order_by(
+                "teacher__user__last_name", "teacher__user__first_name", "teacher_id"
+            )
+            for _, group in groupby(by_teacher.iterator(chunk_size=2000), key=attrgetter("teacher_id")):
+                schedule = {}
+                for entry in group:
+                    schedule.setdefault(entry.time_slot_id, {})[entry.day_of_week] = (
+                        f"<b>{escape(entry.subject.name)}</b><br/><i>{escape(entry.class_model.name)}</i>"
+                    )
+                yield f"{escape(str(entry.teacher))} - Teacher Timetable", schedule
+
+    def pages(self, include, timeslots, doc, styles):
+        """Flowables for one page at a time, separated by page breaks."""
+        first = True
+        for title, schedule in self.schedules(include):
+            page = timetable_flowables(title, schedule, timeslots, doc, styles)
+            yield page if first else [PageBreak()] + page
+            first = False
+        if first:
+            yield [Paragraph("No timetables have been generated yet.", styles["TimetableTitle"])]
 
-        # Prepare the table header.
-        header = ["Time Slot", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-        data = [header]
 
-        # Map and sort time slots.
-        timeslot_ids = sorted({entry.time_slot.id for entry in timetable_qs})
-        timeslot_map = {}
-        for entry in timetable_qs:
-            ts = entry.time_slot
-            timeslot_map[ts.id] = f"{ts.start_time.strftime('%I:%M %p')} - {ts.end_time.strftime('%I:%M %p')}"
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-        schedule = {ts_id: {} for ts_id in timeslot_ids}
-        for entry in timetable_qs:
-            schedule[entry.time_slot.id][entry.day_of_week] = entry
-
-        # Build table rows for each time slot.
-        for ts_id in timeslot_ids:
-            time_slot = timeslot_map.get(ts_id, "")
-            row = [time_slot]
-            for day in days:
-                entry = schedule[ts_id].get(day)
-                if entry:
-                    subject = entry.subject.name if entry.subject else ''
-                    teacher = entry.teacher.user.username if entry.teacher and hasattr(entry.teacher, 'user') else ''
-                    cell_content = f"<b>{subject}</b><br/><i>{teacher}</i>"
-                    row.append(cell_content)
-                else:
-                    row.append("--")
-            data.append(row)
-
-        # Convert each cell to a Paragraph object.
-        for i, row in enumerate(data):
-            for j, cell in enumerate(row):
-                if i == 0:  # header row
-                    data[i][j] = Paragraph(f"<b>{cell}</b>", styles['Heading4'])
-                else:
-                    data[i][j] = Paragraph(cell, styles['CellText'])
-
-        # Define column widths for the table.
-        col_widths = [doc.width * 0.15] + [doc.width * 0.14] * 6
-        table = Table(data, colWidths=col_widths, repeatRows=1)
-
-        # Style the table with alternating row colors and padding.
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9F9F9')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#CCCCCC')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F8FF')]),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ])
-        table.setStyle(table_style)
-        elements.append(table)
+###############################################
+# Teacher Timetable
+###############################################
 
-        # Build the PDF and add page numbers.
-        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
+def teacher_schedule(teacher):
+    """
+    ``{timeslot_id: {day: entry}}`` for one teacher, from a single query.
+
+    The lookup is served by the ``(teacher, day_of_week, time_slot)`` index.
+    """
+    schedule = {}
+    entries = Timetable.objects.filter(teacher=teacher).select_related("class_model", "subject")
+    for entry in entries:
+        schedule.setdefault(entry.time_slot_id, {})[entry.day_of_week] = entry
+    return schedule
 
+
+class TeacherTimetableMixin(RoleRequiredMixin):
+    """Resolves the teacher; teachers may only see their own week."""
+    allowed_roles = ["admin", "teacher"]
+
+    def get_teacher(self):
+        teacher = get_object_or_404(Teacher.objects.select_related("user"), pk=self.kwargs["pk"])
+        user = self.request.user
+        if not (user.is_superuser or user.role == "admin") and teacher.user_id != user.pk:
+            raise PermissionDenied("You can only view your own timetable.")
+        return teacher
+
+
+class TeacherTimetableView(TeacherTimetableMixin, TemplateView):
+    template_name = "time_tables/teacher_timetable.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        teacher = self.get_teacher()
+        context["teacher"] = teacher
+        context["days"] = DAYS
+        context["timeslots"] = list(TimeSlot.objects.order_by("start_time"))
+        schedule = teacher_schedule(teacher)
+        context["rows"] = [
+            (ts, [schedule.get(ts.id, {}).get(day) for day in DAYS])
+            for ts in context["timeslots"]
+        ]
+        context["lesson_count"] = sum(len(days) for days in schedule.values())
+        return context
+
+
+class TeacherTimetableDownloadView(TeacherTimetableMixin, View):
+    """Teacher's week as PDF (default) or CSV (``?format=csv``)."""
+
+    def get(self, request, *args, **kwargs):
+        teacher = self.get_teacher()
+        timeslots = list(TimeSlot.objects.order_by("start_time"))
+        schedule = teacher_schedule(teacher)
+        basename = f"timetable_{teacher.user.username}_{now().strftime('%Y%m%d')}"
+
+        if request.GET.get("format") == "csv":
+            response = HttpResponse(content_type="text/csv")
+            response["Content-Disposition"] = f'attachment; filename="{basename}.csv"'
+            writer = csv.writer(response)
+            writer.writerow(["Day", "Start", "End", "Class", "Subject"])
+            for day in DAYS:
+                for ts in timeslots:
+                    entry = schedule.get(ts.id, {}).get(day)
+                    if entry:
+                        writer.writerow([
+                            day,
+                            ts.start_time.strftime("%H:%M"),
+                            ts.end_time.strftime("%H:%M"),
+                            entry.class_model.name,
+                            entry.subject.name if entry.subject else "",
+                        ])
+            return response
+
+        cells = {
+            ts_id: {
+                day: f"<b>{escape(entry.subject.name if entry.subject else '')}</b>"
+                     f"<br/><i>{escape(entry.class_model.name)}</i>"
+                for day, entry in days.items()
+            }
+            for ts_id, days in schedule.items()
+        }
+        response = HttpResponse(content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="{basename}.pdf"'
+        doc = timetable_document(response)
+        elements = timetable_flowables(
+            f"{escape(str(teacher))} - Teacher Timetable", cells, timeslots, doc, timetable_styles()
+        )
+        doc.build(elements, onFirstPage=add_page_number, onLaterPages=add_page_number)
         return response